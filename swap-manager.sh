@@ -0,0 +1,5 @@
+#!/bin/sh
+# Launcher tipis: jalankan swap_manager sebagai modul (-m) supaya bytecode-nya dipakai ulang dari
+# __pycache__; `python3 swap_manager.py` mengompilasi ulang seluruh skrip di setiap start.
+dir=$(dirname "$(readlink -f "$0")")
+PYTHONPATH="$dir${PYTHONPATH:+:$PYTHONPATH}" exec "${PYTHON:-python3}" -m swap_manager "$@"
@@ -1,20 +1,39 @@
 #!/usr/bin/env python3
 import os
+import sys
+import shlex
 import shutil
 import subprocess
+import contextlib
+import functools
 import re
+import threading
+import time
 
-# Bersihkan terminal saat start (opsional)
-os.system('clear')
-
-SUDO = "" if os.geteuid() == 0 else "sudo "
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# jalankan tool ini lagi di proses baru (helper sudo, unit systemd) lewat import, bukan sebagai skrip:
+# bytecode modul di-cache di __pycache__, sedangkan skrip __main__ dikompilasi ulang tiap start
+SELF_ARGV = [sys.executable, "-c", "import sys; sys.path.insert(0, sys.argv.pop(1)); import swap_manager; "
+                                   "sys.exit(swap_manager.run_main())", os.path.dirname(os.path.abspath(__file__))]
 
 # -------------------- Util --------------------
 def run(cmd):
-    p = subprocess.run(cmd, shell=True, text=True,
-                       stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    """Jalankan perintah tanpa shell (argv list; string dipecah dengan shlex)."""
+    if isinstance(cmd, str):
+        cmd = shlex.split(cmd)
+    with span(" ".join(shlex.quote(str(a)) for a in cmd), "cmd") as sp:
+        try:
+            p = subprocess.run(cmd, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            if sp:
+                sp["status"], sp["error"] = 127, str(e)
+            return 127, "", str(e)
+        if sp:
+            sp["status"] = p.returncode
+            sp["error"] = (p.stderr.strip() or None) if p.returncode else None
     return p.returncode, p.stdout.strip(), p.stderr.strip()
 
+@functools.lru_cache(maxsize=None)
 def find_cmd(name: str):
     path = shutil.which(name)
     if path:
@@ -45,601 +64,6326 @@ def parse_size_to_mib(s: str):
     b = parse_size_to_bytes(s)
     return int(round(b / (1024 * 1024))) if b is not None else None
 
+# -------------------- Tracing (span) --------------------
+TRACE_HOOKS = []  # fungsi(span: dict) yang dipanggil untuk tiap span selesai (lihat add_trace_hook)
+_TRACE = None     # list span selama tracing aktif (start_trace / --trace)
+_TRACE_LOCK = threading.Lock()
+_TRACE_LOCAL = threading.local()
+_TRACE_IDS = iter(range(1, 1 << 62))
+
+def add_trace_hook(fn):
+    """Daftarkan fn(span) untuk meneruskan span ke telemetry sendiri; span berupa dict
+    {id, parent, name, cat, ts, wall_ms, cpu_ms, bytes_written, status, error, pid, tid, args}."""
+    TRACE_HOOKS.append(fn)
+    return fn
+
+def remove_trace_hook(fn):
+    if fn in TRACE_HOOKS:
+        TRACE_HOOKS.remove(fn)
+
+def start_trace():
+    global _TRACE
+    _TRACE = []
+
+def stop_trace():
+    """Hentikan tracing dan kembalikan span yang terkumpul."""
+    global _TRACE
+    spans, _TRACE = _TRACE or [], None
+    return spans
+
+def tracing():
+    return _TRACE is not None or bool(TRACE_HOOKS)
+
+def _thread_wchar():
+    """Byte yang ditulis thread ini lewat write(2) & sejenisnya (/proc/thread-self/io)."""
+    try:
+        with open("/proc/thread-self/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def current_span_id():
+    stack = getattr(_TRACE_LOCAL, "stack", None)
+    return stack[-1] if stack else None
+
+def emit_span(rec):
+    """Simpan span ke trace aktif lalu teruskan ke hook (hook yang error tidak menggagalkan operasi)."""
+    if _TRACE is not None:
+        with _TRACE_LOCK:
+            _TRACE.append(rec)
+    for fn in list(TRACE_HOOKS):
+        try:
+            fn(rec)
+        except Exception as e:
+            print(f"⚠ Trace hook {getattr(fn, '__name__', fn)} gagal: {e}", file=sys.stderr)
+
+@contextlib.contextmanager
+def span(name: str, cat: str = "op", parent=None, **args):
+    """Ukur satu langkah: wall time, CPU (thread ini + child yang selesai), byte ditulis, status.
+
+    Tanpa trace/hook aktif hanya yield None (nyaris tanpa biaya). Pemanggil boleh mengisi
+    rec["status"] (mis. exit code) atau rec["error"]; exception yang lolos ditandai "error".
+    """
+    if not tracing():
+        yield None
+        return
+    import resource
+    stack = _TRACE_LOCAL.__dict__.setdefault("stack", [])
+    rec = {"id": f"{os.getpid()}:{next(_TRACE_IDS)}", "parent": parent or current_span_id(), "name": name,
+           "cat": cat, "status": "ok", "error": None, "args": args}
+    ru0 = resource.getrusage(resource.RUSAGE_CHILDREN)
+    t0, perf0, cpu0, w0 = time.time(), time.perf_counter(), time.thread_time(), _thread_wchar()
+    stack.append(rec["id"])
+    try:
+        yield rec
+    except BaseException as e:
+        rec["status"], rec["error"] = "error", rec["error"] or f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        stack.pop()
+        ru1 = resource.getrusage(resource.RUSAGE_CHILDREN)
+        w1 = _thread_wchar()
+        child = (ru1.ru_utime + ru1.ru_stime) - (ru0.ru_utime + ru0.ru_stime)
+        if rec.get("bytes_written") is None:  # pemanggil boleh mengisi sendiri (mis. I/O dari thread lain)
+            rec["bytes_written"] = w1 - w0 if w0 is not None and w1 is not None else None
+        rec.update(ts=t0, wall_ms=round((time.perf_counter() - perf0) * 1000, 3),
+                   cpu_ms=round((time.thread_time() - cpu0 + child) * 1000, 3),
+                   pid=os.getpid(), tid=threading.get_native_id())
+        emit_span(rec)
+
+def chrome_trace(spans):
+    """Span -> format Chrome trace (chrome://tracing, Perfetto): event 'X' dengan ts/dur dalam mikrodetik."""
+    events = []
+    for s in spans:
+        extra = {k: s[k] for k in ("id", "parent", "cpu_ms", "bytes_written", "status", "error")}
+        events.append({"name": s["name"], "cat": s["cat"], "ph": "X", "ts": round(s["ts"] * 1e6),
+                       "dur": round(s["wall_ms"] * 1000), "pid": s["pid"], "tid": s["tid"],
+                       "args": {**s["args"], **extra}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+def write_trace(path: str, spans):
+    import json
+    try:
+        with open(path, "w") as f:
+            json.dump(chrome_trace(spans), f, default=str)
+    except OSError as e:
+        print(f"⚠ Gagal menulis trace {path}: {e}", file=sys.stderr)
+        return False
+    return True
+
+def print_trace_summary(spans, n: int = 10, out=None):
+    """Tabel langkah paling lambat (root span CLI tidak ikut)."""
+    out = out or sys.stderr
+    steps = sorted((s for s in spans if s["cat"] != "cli"), key=lambda s: s["wall_ms"], reverse=True)[:n]
+    if not steps:
+        return
+    print(f"\n⏱ {min(n, len(steps))} langkah paling lambat:", file=out)
+    print(f"{'wall ms':>9} {'cpu ms':>8} {'ditulis':>10} {'status':>6}  {'kategori':8} langkah", file=out)
+    for s in steps:
+        b = s["bytes_written"]
+        wrote = "-" if not b else _fmt_mib(b) if b >= 1024 * 1024 else f"{b / 1024:.1f}KiB"
+        print(f"{s['wall_ms']:9.1f} {s['cpu_ms']:8.1f} {wrote:>10} {str(s['status']):>6}  {s['cat']:8} "
+              f"{s['name'][:70]}", file=out)
+
+
+# -------------------- Privileged executor (operation plan) --------------------
+DRY_RUN = False
+FSTAB = "/etc/fstab"
+SWAP_FLAG_PREFER = 0x8000
+SWAP_FLAG_PRIO_MASK = 0x7fff
+
+def _libc():
+    import ctypes
+    return ctypes.CDLL(None, use_errno=True)
+
+def _check_syscall(ret: int, path: str):
+    if ret != 0:
+        import ctypes
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+
+def sys_swapon(path: str, prio=None):
+    """swapon(2) langsung; prio None/negatif -> prioritas otomatis kernel (sama seperti swapon(8))."""
+    flags = 0
+    if prio is not None and int(prio) >= 0:
+        flags = SWAP_FLAG_PREFER | (int(prio) & SWAP_FLAG_PRIO_MASK)
+    _check_syscall(_libc().swapon(os.fsencode(path), flags), path)
+
+def sys_swapoff(path: str):
+    _check_syscall(_libc().swapoff(os.fsencode(path)), path)
+
+def atomic_write(path: str, content: str, mode=None, backup: bool = False):
+    """Tulis file via tmp + fsync + rename (tidak pernah setengah tertulis); opsional simpan .bak."""
+    d = os.path.dirname(path) or "."
+    if mode is None:
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o644
+    tmp = os.path.join(d, f".{os.path.basename(path)}.swapi-tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), mode)
+    try:
+        data = content.encode()
+        while data:
+            data = data[os.write(fd, data):]
+        os.fchmod(fd, mode)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    if backup and os.path.exists(path):
+        shutil.copy2(path, f"{path}.bak")
+    os.replace(tmp, path)
+    dfd = os.open(d, os.O_RDONLY)
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+def zram_find_free():
+    """Nama device zram yang belum terinisialisasi (mis. 'zram1'); hot_add bila semua terpakai."""
+    for dev in list_zram_devices():
+        if _read_sysfs(f"{zram_sysfs(dev)}/disksize") == "0":
+            return os.path.basename(dev)
+    n = _read_sysfs("/sys/class/zram-control/hot_add")
+    if n is None:
+        raise OSError("tidak ada device zram bebas (modul zram belum dimuat?)")
+    return f"zram{n}"
+
+def _op_exec(op):
+    p = subprocess.run(op["argv"], text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if p.returncode != 0:
+        err = RuntimeError(p.stderr.strip() or f"exit {p.returncode}")
+        err.exit_status = p.returncode  # dicatat span op
+        raise err
+    return p.stdout.strip()
+
+def _op_unlink(op):
+    try:
+        os.unlink(op["path"])
+    except FileNotFoundError:
+        pass
+
+def _op_mkswap(op):
+    uuid_bytes, label = (bytes.fromhex(op["uuid"]) if op.get("uuid") else None), op.get("label")
+    if op.get("ids_from"):
+        # UUID & label disalin dari area lama (staged resize) supaya entri UUID=/LABEL= tetap cocok
+        hdr = read_swap_header(op["ids_from"])
+        if hdr and hdr.get("uuid"):
+            uuid_bytes, label = hdr["uuid_bytes"], label or hdr["label"] or None
+    if not make_swap(op["path"], label, op.get("keep_ids", False), uuid_bytes):
+        raise RuntimeError("gagal menulis signature swap")
+
+def _op_verify(op):
+    if not check_swap_header(op["path"]):
+        raise RuntimeError("header swap tidak valid")
+
+def _op_write_sysfs(op):
+    with open(op["path"], "w") as f:
+        f.write(str(op["value"]))
+
+OP_HANDLERS = {
+    "note": lambda op: None,
+    "chmod": lambda op: os.chmod(op["path"], op["mode"]),
+    "swapon": lambda op: sys_swapon(op["path"], op.get("prio")),
+    "swapoff": lambda op: swapoff_with_progress(op["path"]) if op.get("progress") else sys_swapoff(op["path"]),
+    "write_sysfs": _op_write_sysfs,
+    "write_file": lambda op: atomic_write(op["path"], op["content"], op.get("mode"), op.get("backup", False)),
+    "unlink": _op_unlink,
+    "rename": lambda op: os.replace(op["src"], op["dst"]),
+    "mkdir": lambda op: os.makedirs(op["path"], exist_ok=True),
+    "allocate": lambda op: allocate_swapfile(op["path"], op["size"], grow=op.get("grow", False)),
+    "mkswap": _op_mkswap,
+    "verify_swap": _op_verify,
+    "check_extents": lambda op: warn_fragmentation(op["path"]),
+    "inspect": lambda op: inspect_swapfile(op["path"]),
+    "reallocate": lambda op: reallocate_swapfile(op["path"]),
+    "zram_find": lambda op: zram_find_free(),
+    "zram_recomp": lambda op: set_zram_recomp(op["device"], op["algorithms"]),
+    "zram_writeback": lambda op: zram_writeback_cycle(op["device"], op.get("idle_age"), op.get("huge", True),
+                                                      op.get("budget_pages"), op.get("period", 86400)),
+    "exec": _op_exec,
+    "fstab": lambda op: apply_fstab_edits(op["path"], op["edits"]),
+    "swap_ids": lambda op: ",".join(Fstab._swap_ids(op["path"])),
+}
+
+def _subst(obj, variables):
+    """Ganti ${nama} di argumen op dengan hasil op sebelumnya (mis. device zram yang ditemukan)."""
+    if not variables:
+        return obj
+    if isinstance(obj, str):
+        for k, v in variables.items():
+            obj = obj.replace("${" + k + "}", str(v))
+        return obj
+    if isinstance(obj, list):
+        return [_subst(v, variables) for v in obj]
+    if isinstance(obj, dict):
+        return {k: _subst(v, variables) for k, v in obj.items()}
+    return obj
+
+def describe_op(op):
+    """Deskripsi satu baris untuk dry-run & pesan error."""
+    kind = op["op"]
+    if kind == "exec":
+        return "exec " + " ".join(shlex.quote(str(a)) for a in op["argv"])
+    if kind == "swapoff" and op.get("progress"):
+        return f"drain & swapoff {op['path']}"
+    if kind == "swapon":
+        return f"swapon {op['path']}" + (f" (pri={op['prio']})" if op.get("prio") is not None else "")
+    if kind == "chmod":
+        return f"chmod {op['mode']:o} {op['path']}"
+    if kind == "write_sysfs":
+        return f"tulis {op['path']} <- {op['value']}"
+    if kind == "write_file":
+        return f"tulis atomik {op['path']} ({len(op['content'])} byte{', backup .bak' if op.get('backup') else ''})"
+    if kind == "allocate":
+        return f"alokasi {op['path']} {_fmt_mib(op['size'])}" + (" (grow)" if op.get("grow") else "")
+    if kind == "fstab":
+        return f"edit {op['path']}: " + ", ".join(
+            f"{e['action']} {e['path']}" + (f" pri={e['pri']}" if e.get("pri") is not None else "")
+            for e in op["edits"]) + " (tulis atomik, backup .bak)"
+    if kind == "rename":
+        return f"rename {op['src']} -> {op['dst']}"
+    if kind == "zram_find":
+        return f"cari device zram bebas -> ${{{op.get('save', 'zram')}}}"
+    if kind == "swap_ids":
+        return f"baca UUID/LABEL {op['path']} -> ${{{op.get('save')}}}"
+    if kind == "zram_recomp":
+        return f"rekompresi {op['device']}: {', '.join(op['algorithms'])}"
+    if kind == "note":
+        return f"({op.get('msg', '')})"
+    return f"{kind} {op.get('path', '')}".strip()
+
+OP_WORKERS = 8       # op paralel maksimal (lane berbeda)
+SWAPOFF_PARALLEL = 2  # swapoff paralel maksimal; isi area yang di-drain juga harus muat di MemAvailable
+
+class _SwapoffGate:
+    """Batasi swapoff paralel: maks `limit` sekaligus dan total isi yang sedang di-drain kembali ke RAM
+    harus muat di MemAvailable dikurangi DRAIN_RESERVE. Swapoff pertama selalu boleh jalan."""
+
+    def __init__(self, limit: int = SWAPOFF_PARALLEL):
+        self.cond = threading.Condition()
+        self.limit, self.active, self.inflight = limit, 0, 0
+
+    @staticmethod
+    def _used(path: str):
+        real = os.path.realpath(path)
+        return next((s["used_kib"] * 1024 for s in get_swaps_from_proc() if os.path.realpath(s["name"]) == real), 0)
+
+    def acquire(self, path: str):
+        need = self._used(path)
+        with self.cond:
+            while self.active and (self.active >= self.limit or self.inflight + need >
+                                   _mem_available() - DRAIN_RESERVE):
+                self.cond.wait(0.5)  # MemAvailable berubah tanpa notifikasi
+            self.active += 1
+            self.inflight += need
+        return need
+
+    def release(self, need: int):
+        with self.cond:
+            self.active -= 1
+            self.inflight -= need
+            self.cond.notify_all()
+
+def _mem_available():
+    try:
+        with open("/proc/meminfo") as f:
+            return parse_meminfo(f.read(), ("MemAvailable",)).get("MemAvailable", 0) * 1024
+    except OSError:
+        return 0
+
+def op_dependencies(ops):
+    """Dependensi tiap op (set indeks) dari lane-nya.
+
+    Op ber-lane sama berurutan, lane berbeda independen. Op tanpa lane adalah barrier: menunggu
+    semua op sebelumnya dan ditunggu semua op sesudahnya (plan tanpa lane = rantai berurutan).
+    Note tanpa lane hanya menempel pada op tepat sebelumnya.
+    """
+    deps, last, barrier = [], {}, None
+    for i, op in enumerate(ops):
+        lane = op.get("lane")
+        if lane is None and op["op"] == "note":
+            deps.append({i - 1} if i else set())
+        elif lane is None:
+            deps.append(set(range(barrier if barrier is not None else 0, i)))
+            barrier, last = i, {}
+        else:
+            deps.append({last[lane]} if lane in last else ({barrier} if barrier is not None else set()))
+            last[lane] = i
+    return deps
+
+def execute_ops(ops, workers: int = OP_WORKERS):
+    """Jalankan op di proses ini (harus root) sesuai dependensi lane (lihat op_dependencies).
+
+    Op check=True yang gagal membatalkan op yang belum mulai; op yang sedang jalan di lane lain
+    diselesaikan dan kegagalannya ikut dilaporkan. Tiap hasil memuat durasi (ms) dan lane.
+    """
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+    deps = op_dependencies(ops)
+    variables, results = {}, [None] * len(ops)
+    lock, gate = threading.Lock(), _SwapoffGate()
+    parent = current_span_id()  # op di thread worker tetap anak span pemanggil
+
+    def run_one(i):
+        with lock:
+            op = _subst(ops[i], variables)
+        t0 = time.perf_counter()
+        with span(describe_op(op), "op", parent, op=op["op"], lane=op.get("lane")) as sp:
+            try:
+                need = gate.acquire(op["path"]) if op["op"] == "swapoff" else None
+                try:
+                    out = OP_HANDLERS[op["op"]](op)
+                finally:
+                    if need is not None:
+                        gate.release(need)
+                res, status = {"ok": True, "out": out}, 0 if op["op"] == "exec" else "ok"
+                if op.get("save"):
+                    with lock:
+                        variables[op["save"]] = out
+            except (OSError, RuntimeError, ValueError, KeyError, subprocess.SubprocessError) as e:
+                res, status = {"ok": False, "error": str(e)}, getattr(e, "exit_status", "error")
+            if sp:
+                sp["status"], sp["error"] = status, res.get("error")
+        res["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        if op.get("lane"):
+            res["lane"] = op["lane"]
+        return res
+
+    start = time.perf_counter()
+    pending, running, failed = list(range(len(ops))), {}, False
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while pending or running:
+            if not failed:
+                ready = [i for i in pending if all(results[d] is not None for d in deps[i])]
+                for i in ready:
+                    pending.remove(i)
+                    running[pool.submit(run_one, i)] = i
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i = running.pop(fut)
+                results[i] = fut.result()
+                failed = failed or (not results[i]["ok"] and ops[i].get("check", True))
+    for i in pending:
+        results[i] = {"ok": False, "skipped": True, "error": "dilewati"}
+    return {"results": results, "vars": variables, "wall_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+def _run_helper(ops):
+    """Eksekusi plan di satu proses helper via sudo (stdin/stdout JSON, progress lewat stderr)."""
+    import json
+    argv = ["sudo", *SELF_ARGV, "--exec-plan"]
+    with span("sudo helper", "sudo", ops=len(ops)) as sp:
+        try:
+            p = subprocess.run(argv, input=json.dumps({"ops": ops, "trace": tracing()}), text=True,
+                               stdout=subprocess.PIPE)
+            out = json.loads(p.stdout)
+        except (OSError, ValueError) as e:
+            err = {"ok": False, "error": f"helper privileged gagal: {e}"}
+            if sp:
+                sp["status"], sp["error"] = "error", err["error"]
+            return {"results": [err] + [{"ok": False, "skipped": True}] * (len(ops) - 1), "vars": {}}
+        if sp:
+            sp["status"] = p.returncode
+    # span dari proses helper digabung ke trace ini, digantung di bawah span sudo
+    for s in out.pop("spans", []):
+        s["parent"] = s["parent"] or (sp and sp["id"])
+        emit_span(s)
+    return out
+
+def plan_helper_main():
+    """Entry point helper: baca plan JSON dari stdin, tulis hasil JSON ke stdout."""
+    import json
+    req = json.load(sys.stdin)
+    out = sys.stdout
+    sys.stdout = sys.stderr  # print dari op (progress dll.) tidak boleh mengotori JSON
+    if req.get("trace"):
+        start_trace()
+    res = execute_ops(req["ops"])
+    if req.get("trace"):
+        res["spans"] = stop_trace()
+    out.write(json.dumps(res, default=str))
+    out.flush()
+    return 0
+
+
+class Plan:
+    """Rencana operasi privileged bertipe (chmod, swapon, tulis sysfs/file, exec argv, ...).
+
+    Semua op dieksekusi sekaligus: in-process bila root, selain itu di satu helper sudo.
+    Dengan DRY_RUN, plan hanya dicetak. Plan readonly (mis. inspeksi) tetap dijalankan saat dry-run.
+    """
+
+    def __init__(self, readonly: bool = False):
+        self.ops = []
+        self.results = []
+        self.vars = {}
+        self.readonly = readonly
+        self.wall_ms = None
+        self._fstab_op = None
+        self._lane = None
+
+    def add(self, op, msg=None, check=True, save=None, **args):
+        args.update(op=op, check=check)
+        if msg:
+            args["msg"] = msg
+        if save:
+            args["save"] = save
+        if self._lane and "lane" not in args:
+            args["lane"] = self._lane
+        self.ops.append(args)
+        return self
+
+    @contextlib.contextmanager
+    def lane(self, name):
+        """Op yang ditambahkan di dalam blok masuk lane `name`: berurutan di lane itu, paralel
+        terhadap lane lain (mis. satu lane per disk, satu lane untuk zram)."""
+        prev, self._lane = self._lane, name
+        try:
+            yield self
+        finally:
+            self._lane = prev
+
+    def note(self, msg):
+        return self.add("note", msg=msg)
+
+    def chmod(self, path, mode=0o600, **kw):
+        return self.add("chmod", path=path, mode=mode, **kw)
+
+    def swapon(self, path, prio=None, **kw):
+        prio = int(prio) if prio not in (None, "") else None
+        return self.add("swapon", path=path, prio=prio, **kw)
+
+    def swapoff(self, path, progress=False, **kw):
+        return self.add("swapoff", path=path, progress=progress, **kw)
+
+    def write_sysfs(self, path, value, **kw):
+        return self.add("write_sysfs", path=path, value=str(value), **kw)
+
+    def write_file(self, path, content, mode=None, backup=False, **kw):
+        return self.add("write_file", path=path, content=content, mode=mode, backup=backup, **kw)
+
+    def unlink(self, path, **kw):
+        return self.add("unlink", path=path, **kw)
+
+    def rename(self, src, dst, **kw):
+        return self.add("rename", src=src, dst=dst, **kw)
+
+    def mkdir(self, path, **kw):
+        return self.add("mkdir", path=path, **kw)
+
+    def allocate(self, path, size, grow=False, **kw):
+        return self.add("allocate", path=path, size=int(size), grow=grow, **kw)
+
+    def mkswap(self, path, label=None, keep_ids=False, uuid_bytes=None, ids_from=None, **kw):
+        return self.add("mkswap", path=path, label=label, keep_ids=keep_ids,
+                        uuid=uuid_bytes.hex() if uuid_bytes else None, ids_from=ids_from, **kw)
+
+    def verify_swap(self, path, **kw):
+        return self.add("verify_swap", path=path, **kw)
+
+    def exec(self, argv, **kw):
+        return self.add("exec", argv=[str(a) for a in argv], **kw)
+
+    def fstab(self, action, path, pri=None, msg=None, **kw):
+        """Edit fstab dikumpulkan jadi satu op (satu baca + satu tulis atomik) di posisi edit terakhir."""
+        op = self._fstab_op
+        if op is None:
+            op = self._fstab_op = {"op": "fstab", "path": FSTAB, "edits": [], "check": True}
+        self.ops = [o for o in self.ops if o is not op]
+        edit = {"action": action, "path": path, "pri": int(pri) if pri not in (None, "") else None}
+        if action == "remove" and kw.pop("resolve_ids", True):
+            # op fstab berjalan paling akhir, bisa setelah file di-unlink: UUID=/LABEL= dibaca di posisi ini
+            var = f"swap_ids_{len(op['edits'])}"
+            self.add("swap_ids", path=path, save=var, check=False)
+            edit["ids"] = "${" + var + "}"
+        op["edits"].append(edit)
+        op.update(kw)
+        if msg:
+            op["msg"] = msg
+        self.ops.append(op)
+        return self
+
+    def describe(self):
+        return [describe_op(op) for op in self.ops]
+
+    def execute(self):
+        """Jalankan plan; cetak pesan op yang sukses & error. Kembalikan True bila semua op wajib sukses."""
+        if not self.ops:
+            return True
+        if DRY_RUN and not self.readonly:
+            print("\n[dry-run] Rencana operasi:")
+            for i, (op, line) in enumerate(zip(self.ops, self.describe()), 1):
+                print(f"  {i:2}. {line}" + (f"  [{op['lane']}]" if op.get("lane") else ""))
+            self.results = [{"ok": True, "dry_run": True} for _ in self.ops]
+            return True
+        with span(f"plan ({len(self.ops)} op)", "plan"):
+            out = execute_ops(self.ops) if os.geteuid() == 0 else _run_helper(self.ops)
+        self.results, self.vars, self.wall_ms = out["results"], out["vars"], out.get("wall_ms")
+        if not self.readonly:
+            invalidate_snapshot()
+        ok = True
+        for op, res in zip(self.ops, self.results):
+            if res.get("skipped"):
+                continue
+            if res["ok"]:
+                if op.get("msg"):
+                    print(_subst(op["msg"], self.vars))
+            elif op.get("check", True):
+                print(f"❌ {_subst(describe_op(op), self.vars)}: {res.get('error')}")
+                ok = False
+            else:
+                print(f"⚠ {_subst(describe_op(op), self.vars)}: {res.get('error')}")
+        if len(self.timings()["lanes"]) > 1:
+            print_plan_timings(self)
+        return ok
+
+    def timings(self):
+        """Ringkasan durasi setelah execute(): wall clock, jumlah durasi op, total per lane, kegagalan."""
+        lanes, failed, warnings = {}, [], []
+        for op, res in zip(self.ops, self.results):
+            if res.get("lane"):
+                lanes[res["lane"]] = lanes.get(res["lane"], 0.0) + res.get("ms", 0.0)
+            if not res["ok"] and not res.get("skipped"):
+                (failed if op.get("check", True) else warnings).append(_subst(describe_op(op), self.vars))
+        return {"wall_ms": self.wall_ms, "ops_ms": round(sum(r.get("ms", 0.0) for r in self.results), 1),
+                "lanes": {k: round(v, 1) for k, v in lanes.items()}, "failed": failed, "warnings": warnings}
+
+
+
+def print_plan_timings(plan: Plan):
+    t = plan.timings()
+    slow = max(t["lanes"].items(), key=lambda kv: kv[1])
+    print(f"⏱ {len(plan.ops)} op di {len(t['lanes'])} lane: {t['wall_ms'] / 1000:.1f}s wall, "
+          f"{t['ops_ms'] / 1000:.1f}s total durasi op (lane terlama {slow[0]} {slow[1] / 1000:.1f}s)"
+          + (f"; {len(t['failed'])} op gagal" if t["failed"] else "")
+          + (f"; {len(t['warnings'])} peringatan" if t["warnings"] else ""))
+
+def swap_lane(path: str):
+    """Lane eksekusi untuk area swap: satu lane per block device (file di disk yang sama berurutan,
+    disk berbeda paralel); semua device zram satu lane karena berbagi zram-control & modul."""
+    if os.path.basename(path).startswith("zram"):
+        return "zram"
+    d = path
+    while d and not os.path.exists(d):
+        d = os.path.dirname(d)
+    try:
+        st = os.stat(d or "/")
+    except OSError:
+        return f"file:{path}"
+    import stat as _stat
+    dev = st.st_rdev if _stat.S_ISBLK(st.st_mode) else st.st_dev
+    return f"dev:{os.major(dev)}:{os.minor(dev)}"
+
+
+# -------------------- fstab (model terstruktur) --------------------
+FSTAB_TAGS = ("UUID=", "LABEL=", "PARTUUID=", "PARTLABEL=")
+
+def _escape_fstab(s: str):
+    return re.sub(r'[ \t\n\\]', lambda m: f"\\{ord(m.group()):03o}", s)
+
+def parse_fstab_line(line: str):
+    """Satu baris fstab -> dict entri, atau None untuk komentar/baris kosong."""
+    body = line.strip()
+    if not body or body.startswith("#"):
+        return None
+    parts = body.split()
+    if len(parts) < 3:
+        return None
+    parts += ["defaults", "0", "0"][len(parts) - 3:]
+    return {
+        "spec": _unescape_mount(parts[0]),
+        "file": _unescape_mount(parts[1]),
+        "vfstype": parts[2],
+        "options": parts[3].split(","),
+        "freq": parts[4],
+        "passno": parts[5],
+    }
+
+def render_fstab_entry(e) -> str:
+    return "\t".join([_escape_fstab(e["spec"]), _escape_fstab(e["file"]), e["vfstype"],
+                      ",".join(e["options"]) or "defaults", e["freq"], e["passno"]])
+
+def fstab_entry_pri(e):
+    for o in e["options"]:
+        if o.startswith("pri="):
+            try:
+                return int(o[4:])
+            except ValueError:
+                return None
+    return None
+
+
+class Fstab:
+    """Isi /etc/fstab: dibaca sekali, diedit di memori, di-commit atomik (tmp + fsync + rename).
+
+    Baris disimpan berurutan; komentar & baris yang tidak diubah ditulis ulang apa adanya.
+    Entri diindeks per device/path (realpath) dan per tag (UUID=, LABEL=, ...).
+    """
+
+    def __init__(self, text: str = "", path=None):
+        self.path = path or FSTAB
+        self.lines = []  # tiap item: {"raw": str, "entry": dict|None}
+        self.dirty = False
+        for line in text.splitlines():
+            self.lines.append({"raw": line, "entry": parse_fstab_line(line)})
+        self._reindex()
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or FSTAB
+        try:
+            with open(path) as f:
+                return cls(f.read(), path)
+        except FileNotFoundError:
+            return cls("", path)
+
+    def _reindex(self):
+        self.by_path, self.by_tag = {}, {}
+        for item in self.lines:
+            e = item["entry"]
+            if e is None:
+                continue
+            if e["spec"].startswith(FSTAB_TAGS):
+                self.by_tag.setdefault(e["spec"], []).append(item)
+            else:
+                self.by_path.setdefault(os.path.realpath(e["spec"]), []).append(item)
+
+    @staticmethod
+    def _swap_ids(path: str):
+        """Tag UUID=/LABEL= milik area swap di path (dari header), untuk mencocokkan entri bertag."""
+        try:
+            hdr = read_swap_header(path)
+        except OSError:
+            return []
+        tags = []
+        if hdr and hdr.get("uuid"):
+            tags.append(f"UUID={hdr['uuid']}")
+        if hdr and hdr.get("label"):
+            tags.append(f"LABEL={hdr['label']}")
+        return tags
+
+    def find(self, key: str):
+        """Entri (item baris) untuk path/device, UUID=..., atau LABEL=...; kosong bila tidak ada."""
+        if key.startswith(FSTAB_TAGS):
+            return list(self.by_tag.get(key, []))
+        found = list(self.by_path.get(os.path.realpath(key), []))
+        if self.by_tag:
+            for tag in self._swap_ids(key):
+                found += [i for i in self.by_tag.get(tag, []) if i not in found]
+        return found
+
+    def find_swap(self, key: str):
+        return [i for i in self.find(key) if i["entry"]["vfstype"] == "swap"]
+
+    def get_pri(self, key: str):
+        for item in self.find_swap(key):
+            return fstab_entry_pri(item["entry"])
+        return None
+
+    def remove(self, key: str):
+        """Hapus semua entri swap untuk key. Kembalikan jumlah entri yang dihapus."""
+        drop = self.find_swap(key)
+        if drop:
+            self.lines = [i for i in self.lines if not any(i is d for d in drop)]
+            self.dirty = True
+            self._reindex()
+        return len(drop)
+
+    def set_swap(self, path: str, pri=None):
+        """Tambah entri swap, atau perbarui pri= entri yang ada (opsi lain & format spec dipertahankan)."""
+        items = self.find_swap(path)
+        if not items:
+            opts = ["defaults"] + ([f"pri={int(pri)}"] if pri not in (None, "") else [])
+            e = {"spec": path, "file": "none", "vfstype": "swap", "options": opts, "freq": "0", "passno": "0"}
+            self.lines.append({"raw": render_fstab_entry(e), "entry": e})
+            self.dirty = True
+            self._reindex()
+            return
+        for extra in items[1:]:  # entri ganda untuk area yang sama dirapikan
+            self.lines = [i for i in self.lines if i is not extra]
+        item = items[0]
+        e = item["entry"]
+        opts = [o for o in e["options"] if not o.startswith("pri=")]
+        if pri not in (None, ""):
+            opts.append(f"pri={int(pri)}")
+        if opts != e["options"] or len(items) > 1:
+            e["options"] = opts or ["defaults"]
+            item["raw"] = render_fstab_entry(e)
+            self.dirty = True
+            self._reindex()
+
+    def apply(self, edits):
+        """Terapkan batch edit [{"action": "set_swap"|"remove", "path": ..., "pri": ...}]."""
+        for ed in edits:
+            if ed["action"] == "remove":
+                self.remove(ed["path"])
+                # tag yang dibaca sebelum unlink; "${...}" tersisa bila pembacaan gagal
+                for tag in (ed.get("ids") or "").split(","):
+                    if tag.startswith(FSTAB_TAGS):
+                        self.remove(tag)
+            elif ed["action"] == "set_swap":
+                self.set_swap(ed["path"], ed.get("pri"))
+            else:
+                raise ValueError(f"aksi fstab tidak dikenal: {ed['action']}")
+        return self
+
+    def render(self) -> str:
+        return "\n".join(i["raw"] for i in self.lines) + "\n"
+
+    def commit(self, backup: bool = True):
+        """Satu tulis atomik (tmp + fsync + rename), backup .bak. No-op bila tidak ada perubahan."""
+        if not self.dirty:
+            return False
+        atomic_write(self.path, self.render(), backup=backup)
+        self.dirty = False
+        return True
+
+
+def apply_fstab_edits(path: str, edits):
+    fs = Fstab.load(path).apply(edits)
+    return fs.commit()
+
+def fstab_remove(plan: Plan, path: str, **kw):
+    """Hapus entri swap path (juga entri UUID=/LABEL= yang menunjuk area yang sama)."""
+    return plan.fstab("remove", path, **kw)
+
+def fstab_set_swap(plan: Plan, path: str, pri=None, **kw):
+    """Tambah/perbarui entri swap path dengan pri."""
+    return plan.fstab("set_swap", path, pri, **kw)
+
+
 # -------------------- Swap Info --------------------
-def get_swaps_from_proc():
+def parse_proc_swaps(text: str):
+    """Parse isi /proc/swaps menjadi list dict (name, type, size_kib, used_kib, prio)."""
     swaps = []
+    for i, line in enumerate(text.strip().splitlines()):
+        if i == 0:  # header
+            continue
+        parts = line.split()
+        if len(parts) >= 5:
+            swaps.append({
+                "name": parts[0],
+                "type": parts[1],
+                "size_kib": int(parts[2]),
+                "used_kib": int(parts[3]),
+                "prio": int(parts[4]),
+            })
+    return swaps
+
+def get_swaps_from_proc():
     try:
         with open("/proc/swaps") as f:
-            lines = f.read().strip().splitlines()
-        for i, line in enumerate(lines):
-            if i == 0:  # header
-                continue
-            parts = line.split()
-            if len(parts) >= 5:
-                swaps.append({
-                    "name": parts[0],
-                    "type": parts[1],
-                    "size_kib": int(parts[2]),
-                    "used_kib": int(parts[3]),
-                    "prio": int(parts[4]),
-                })
+            return parse_proc_swaps(f.read())
     except Exception:
-        pass
-    return swaps
+        return []
 
 def get_priority_for(path: str):
-    # 1) coba dari /proc/swaps runtime
-    for s in get_swaps_from_proc():
-        if s['name'] == path:
-            return s['prio']
-    # 2) coba dari /etc/fstab persist
+    # runtime dari /proc/swaps, fallback pri= di /etc/fstab (snapshot ter-cache)
+    return system_snapshot().priority(path)
+
+# ---------- Helpers untuk deteksi swap yang ada ----------
+def classify_existing_swaps():
+    """Kembalikan dict: {'zram': [paths], 'files': [paths], 'parts': [paths]} dari /proc/swaps"""
+    return system_snapshot().classify()
+
+def pick_from_list(title, items):
+    """Pilih satu item dari list, return path terpilih atau None kalau batal."""
+    if not items:
+        return None
+    print(f"\n{title}")
+    for i, v in enumerate(items, 1):
+        print(f"{i}. {v}")
+    print("0. Batal")
+    sel = input("Pilih: ").strip()
+    if sel == "0":
+        return None
+    if sel.isdigit() and 1 <= int(sel) <= len(items):
+        return items[int(sel) - 1]
+    print("❌ Pilihan tidak valid.")
+    return None
+
+
+# -------------------- System snapshot --------------------
+SNAPSHOT_SYSCTLS = ("swappiness", "page-cluster", "vfs_cache_pressure", "watermark_scale_factor", "min_free_kbytes")
+SNAPSHOT_TTL = 2.0  # detik; pemakaian swap & sysctl tidak punya notifikasi perubahan
+
+def _file_sig(path: str):
     try:
-        with open('/etc/fstab') as f:
-            for line in f:
-                if line.strip().startswith('#'):
-                    continue
-                if path in line:
-                    # cari pri=NUMBER dalam opsi
-                    m = re.search(r'pri=(-?\d+)', line)
-                    if m:
-                        return int(m.group(1))
-    except Exception:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_ino, st.st_size
+
+def _swap_identity(name: str):
+    """(realpath, 'major:minor' untuk block device / 'dev:inode' untuk file, UUID atau None)."""
+    real = os.path.realpath(name)
+    try:
+        st = os.stat(real)
+    except OSError:
+        return real, None, None
+    import stat as _stat
+    if _stat.S_ISBLK(st.st_mode):
+        ident = f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+    else:
+        ident = f"{st.st_dev}:{st.st_ino}"
+    uuid = None
+    try:
+        hdr = read_swap_header(real)
+        uuid = hdr.get("uuid") if hdr else None
+    except OSError:
         pass
+    return real, ident, uuid
+
+
+class SystemSnapshot:
+    """State swap yang dibaca sekali: /proc/swaps, fstab, sysfs zram, dan sysctl vm.
+
+    Swap aktif diindeks per identitas kanonik (realpath, major:minor atau dev:inode, UUID) jadi
+    lookup O(1) dan konsisten dalam satu operasi. refresh() hanya memuat ulang sumber yang
+    berubah: /proc/swaps lewat poll() (kernel memberi POLLPRI saat swapon/swapoff), fstab lewat
+    mtime/inode/size, daftar zram lewat isi /sys/block. Pemakaian & sysctl memakai TTL.
+    """
+
+    def __init__(self, ttl: float = SNAPSHOT_TTL):
+        import select
+        self.ttl = ttl
+        self._swaps_file = ProcFile("/proc/swaps")
+        self._poll = select.poll()
+        if self._swaps_file.fd is not None:
+            self._poll.register(self._swaps_file.fd, select.POLLPRI | select.POLLERR)
+        self.swaps, self.index = [], {}
+        self.fstab, self.zram, self.sysctl = None, {}, {}
+        self._fstab_sig = self._zram_sig = None
+        self._swaps_at = self._sysctl_at = 0.0
+        self.generation = 0
+        self.stale = False  # diset invalidate_snapshot(): muat ulang penuh di refresh berikutnya
+        self.load()
+
+    # --- pemuatan per sumber ---
+    def _load_swaps(self):
+        swaps = parse_proc_swaps(self._swaps_file.read())
+        self._swaps_at = time.monotonic()
+        old = {s["name"]: s for s in self.swaps}
+        index = {}
+        for s in swaps:
+            prev = old.get(s["name"])
+            if prev and prev["size_kib"] == s["size_kib"]:
+                s.update(realpath=prev["realpath"], ident=prev["ident"], uuid=prev["uuid"])
+            else:
+                s["realpath"], s["ident"], s["uuid"] = _swap_identity(s["name"])
+            for key in (s["name"], s["realpath"], s["ident"], s["uuid"] and f"UUID={s['uuid']}"):
+                if key:
+                    index[key] = s
+        self.swaps, self.index = swaps, index
+
+    def _load_fstab(self, sig):
+        self.fstab = Fstab.load(FSTAB)
+        self._fstab_sig = sig
+
+    def _load_zram(self, sig):
+        zram = {}
+        for dev in list_zram_devices():
+            base = zram_sysfs(dev)
+            zram[dev] = {
+                "disksize": int(_read_sysfs(f"{base}/disksize") or 0),
+                "algorithm": parse_comp_algorithm(_read_sysfs(f"{base}/comp_algorithm"))[1],
+                "mem_limit": int(_read_sysfs(f"{base}/mem_limit") or 0),
+            }
+        self.zram, self._zram_sig = zram, sig
+
+    def _load_sysctl(self):
+        vals = {}
+        for name in SNAPSHOT_SYSCTLS:
+            v = _read_sysfs(f"/proc/sys/vm/{name}")
+            if v is not None and v.lstrip("-").isdigit():
+                vals[name] = int(v)
+        self.sysctl, self._sysctl_at = vals, time.monotonic()
+
+    @staticmethod
+    def _zram_listing():
+        try:
+            return tuple(sorted(n for n in os.listdir("/sys/block") if n.startswith("zram")))
+        except OSError:
+            return ()
+
+    def load(self):
+        """Muat ulang semua sumber tanpa syarat."""
+        self._poll.poll(0)  # buang event lama; isi dibaca setelahnya
+        self._load_swaps()
+        self._load_fstab(_file_sig(FSTAB))
+        self._load_zram(self._zram_listing())
+        self._load_sysctl()
+        self.stale = False
+        self.generation += 1
+        return self
+
+    def refresh(self):
+        """Muat ulang hanya sumber yang berubah. Kembalikan True bila ada yang dimuat ulang."""
+        if self.stale:
+            self.load()
+            return True
+        changed = False
+        now = time.monotonic()
+        swaps_event = bool(self._poll.poll(0))
+        if swaps_event or now - self._swaps_at > self.ttl:
+            self._load_swaps()
+            changed = True
+        sig = _file_sig(FSTAB)
+        if sig != self._fstab_sig:
+            self._load_fstab(sig)
+            changed = True
+        listing = self._zram_listing()
+        if swaps_event or listing != self._zram_sig:
+            self._load_zram(listing)
+            changed = True
+        if now - self._sysctl_at > self.ttl:
+            self._load_sysctl()
+            changed = True
+        if changed:
+            self.generation += 1
+        return changed
+
+    # --- lookup ---
+    def get(self, key: str):
+        """Record /proc/swaps untuk path, realpath, 'major:minor', atau 'UUID=...'; None bila tidak aktif."""
+        s = self.index.get(key)
+        if s is None and not key.startswith(FSTAB_TAGS):
+            s = self.index.get(os.path.realpath(key))
+        return s
+
+    def priority(self, key: str):
+        """Prioritas runtime, fallback ke pri= di fstab."""
+        s = self.get(key)
+        if s is not None:
+            return s["prio"]
+        return self.fstab.get_pri(key) if self.fstab else None
+
+    def classify(self):
+        zram, files, parts = [], [], []
+        for s in self.swaps:
+            if 'zram' in s["name"]:
+                zram.append(s["name"])
+            elif s["type"].lower() == 'file':
+                files.append(s["name"])
+            else:
+                parts.append(s["name"])
+        return {'zram': zram, 'files': files, 'parts': parts}
+
+    def close(self):
+        self._swaps_file.close()
+
+
+_SNAPSHOT = None
+
+def system_snapshot(refresh: bool = True) -> SystemSnapshot:
+    """Snapshot bersama proses ini; dibuat sekali lalu hanya di-refresh bila sumbernya berubah."""
+    global _SNAPSHOT
+    if _SNAPSHOT is None:
+        _SNAPSHOT = SystemSnapshot()
+    elif refresh or _SNAPSHOT.stale:
+        _SNAPSHOT.refresh()
+    return _SNAPSHOT
+
+def invalidate_snapshot():
+    """Tandai snapshot basi (dipanggil setelah plan mengubah state); dimuat ulang penuh saat diakses lagi."""
+    if _SNAPSHOT is not None:
+        _SNAPSHOT.stale = True
+
+
+# -------------------- Swapfile allocator --------------------
+# filesystem yang menerima swapfile hasil fallocate (lainnya wajib ditulisi nol)
+FALLOCATE_SWAP_FS = {"ext4", "xfs", "btrfs"}
+ALLOC_CHUNK = 16 * 1024 * 1024
+FS_IOC_GETFLAGS = 0x80086601
+FS_IOC_SETFLAGS = 0x40086602
+FS_COMPR_FL = 0x00000004
+FS_NOCOMP_FL = 0x00000400
+FS_NOCOW_FL = 0x00800000
+
+def _unescape_mount(s: str):
+    # mountinfo meng-escape spasi/tab/newline/backslash sebagai oktal (\040 dst.)
+    return re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), s)
+
+def parse_mountinfo(text: str):
+    """Parse /proc/self/mountinfo -> list dict (majmin, root, mountpoint, options, fstype, source)."""
+    mounts = []
+    for line in text.splitlines():
+        left, sep, right = line.partition(" - ")
+        if not sep:
+            continue
+        a, b = left.split(), right.split()
+        if len(a) < 6 or len(b) < 2:
+            continue
+        mounts.append({
+            "majmin": a[2],
+            "root": _unescape_mount(a[3]),
+            "mountpoint": _unescape_mount(a[4]),
+            "options": a[5],
+            "fstype": b[0],
+            "source": _unescape_mount(b[1]),
+        })
+    return mounts
+
+def mount_for_path(path: str):
+    """Mount (dict parse_mountinfo) yang memuat path — mountpoint dengan prefix terpanjang."""
+    try:
+        with open("/proc/self/mountinfo") as f:
+            mounts = parse_mountinfo(f.read())
+    except OSError:
+        return None
+    real = os.path.realpath(path)
+    best = None
+    for m in mounts:
+        mp = m["mountpoint"]
+        if real == mp or real.startswith(mp.rstrip("/") + "/"):
+            # mount belakangan menutupi yang sebelumnya pada mountpoint sama
+            if best is None or len(mp) >= len(best["mountpoint"]):
+                best = m
+    return best
+
+def set_nocow(fd: int):
+    """chattr +C (dan tanpa kompresi) — btrfs mewajibkannya selagi file masih kosong."""
+    import fcntl
+    import struct
+    flags = struct.unpack("i", fcntl.ioctl(fd, FS_IOC_GETFLAGS, struct.pack("i", 0)))[0]
+    flags = (flags | FS_NOCOW_FL) & ~FS_COMPR_FL
+    fcntl.ioctl(fd, FS_IOC_SETFLAGS, struct.pack("i", flags))
+    try:
+        fcntl.ioctl(fd, FS_IOC_SETFLAGS, struct.pack("i", flags | FS_NOCOMP_FL))
+    except OSError:
+        pass  # kernel lama: NOCOW sendiri sudah mematikan kompresi
+
+def _ensure_btrfs_dir(path: str):
+    """Direktori swapfile btrfs yang belum ada dibuat sebagai subvolume khusus (tidak ikut snapshot)."""
+    d = os.path.dirname(os.path.abspath(path))
+    if os.path.isdir(d):
+        return
+    btrfs = find_cmd("btrfs")
+    if btrfs:
+        code, _, err = run([btrfs, "subvolume", "create", d])
+        if code == 0:
+            print(f"ℹ Subvolume btrfs {d} dibuat untuk swapfile.")
+            return
+        print(f"⚠ Gagal membuat subvolume {d}: {err}")
+    os.makedirs(d, exist_ok=True)
+
+def _zero_fill(path: str, start: int, end: int, threads: int, progress: bool):
+    """Tulis nol [start, end) dengan pwrite paralel; O_DIRECT bila filesystem mendukung."""
+    import mmap
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    direct = getattr(os, "O_DIRECT", 0)
+    try:
+        fd = os.open(path, os.O_WRONLY | direct)
+    except OSError:
+        fd, direct = os.open(path, os.O_WRONLY), 0
+    buf = mmap.mmap(-1, ALLOC_CHUNK)  # anonim = nol & ter-align page (syarat O_DIRECT)
+    view = memoryview(buf)
+    done = [0]
+    lock = threading.Lock()
+
+    def write_chunk(off):
+        n = min(ALLOC_CHUNK, end - off)
+        pos = 0
+        while pos < n:
+            pos += os.pwrite(fd, view[pos:n], off + pos)
+        with lock:
+            done[0] += n
+
+    total = end - start
+    t0 = last = time.monotonic()
+    with span(f"zero-fill {path}", "io", threads=threads) as sp:
+        try:
+            try:
+                write_chunk(start)  # chunk pertama serial: deteksi O_DIRECT yang ditolak (EINVAL)
+            except OSError:
+                if not direct:
+                    raise
+                os.close(fd)
+                fd, direct = os.open(path, os.O_WRONLY), 0
+                write_chunk(start)
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                futures = [pool.submit(write_chunk, off) for off in range(start + ALLOC_CHUNK, end, ALLOC_CHUNK)]
+                for fut in as_completed(futures):
+                    fut.result()
+                    now = time.monotonic()
+                    if progress and now - last >= 1.0:
+                        mib = done[0] / 1024 / 1024
+                        print(f"  {done[0] * 100 // total}%  {mib:.0f}MiB  {mib / (now - t0):.0f}MiB/s", flush=True)
+                        last = now
+            os.fsync(fd)
+        finally:
+            if sp:
+                sp["bytes_written"] = done[0]  # ditulis thread pool, bukan thread span
+            view.release()
+            buf.close()
+            os.close(fd)
+    return "pwrite+O_DIRECT" if direct else "pwrite"
+
+def allocate_swapfile(path: str, size_bytes: int, grow: bool = False, threads=None, progress: bool = True):
+    """Alokasikan swapfile in-process.
+
+    fallocate di filesystem yang mendukung swapfile fallocate, selain itu tulis nol paralel.
+    grow=True: file yang ada diperpanjang/dipotong, bukan ditulis ulang dari nol.
+    Kembalikan dict {method, bytes, seconds}.
+    """
+    size = size_bytes // PAGE_SIZE * PAGE_SIZE
+    mnt = mount_for_path(os.path.dirname(os.path.abspath(path)) or "/")
+    fstype = mnt["fstype"] if mnt else ""
+    if fstype == "btrfs":
+        _ensure_btrfs_dir(path)
+
+    t0 = time.monotonic()
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_CLOEXEC", 0)
+    if not grow:
+        flags |= os.O_TRUNC
+    fd = os.open(path, flags, 0o600)
+    method = None
+    try:
+        os.fchmod(fd, 0o600)
+        old = os.fstat(fd).st_size // PAGE_SIZE * PAGE_SIZE
+        if fstype == "btrfs" and old == 0:
+            set_nocow(fd)
+        if size <= old:
+            os.ftruncate(fd, size)
+            method = "truncate"
+        elif fstype in FALLOCATE_SWAP_FS:
+            try:
+                os.posix_fallocate(fd, old, size - old)
+                method = "fallocate"
+            except OSError:
+                method = None
+        if method is None:
+            os.ftruncate(fd, old)  # buang ekor page parsial sebelum diisi
+    finally:
+        os.close(fd)
+    if method is None:
+        method = _zero_fill(path, old, size, threads or min(4, os.cpu_count() or 1), progress)
+
+    secs = time.monotonic() - t0
+    written = size - old if size > old else 0
+    rate = f", {written / 1024 / 1024 / secs:.0f}MiB/s" if method.startswith("pwrite") and secs > 0 else ""
+    print(f"ℹ {path}: {_fmt_mib(size)} via {method} ({fstype or '?'}) dalam {secs:.1f}s{rate}")
+    return {"method": method, "bytes": size, "seconds": secs}
+
+# -------------------- Swap signature (mkswap native) --------------------
+# Layout header swap v1 (linux/swap.h): bootbits[1024], version, last_page, nr_badpages,
+# uuid[16], volume_name[16], padding[117], badpages[] ... magic "SWAPSPACE2" di akhir page 0.
+SWAP_MAGIC = b"SWAPSPACE2"
+SWAP_MAGIC_V0 = b"SWAP-SPACE"
+SWAP_HEADER_VERSION = 1
+SWAP_MIN_PAGES = 10
+SWAP_LABEL_LEN = 16
+_SWAP_INFO_OFF = 1024
+_SWAP_UUID_OFF = 1036
+_SWAP_LABEL_OFF = 1052
+_SWAP_BADPAGES_OFF = 1536
+
+def _format_uuid(b: bytes):
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+def build_swap_header(size_bytes: int, label=None, uuid_bytes=None, badpages=(), pagesize: int = PAGE_SIZE):
+    """Bangun page 0 area swap (SWAPSPACE2) untuk area sebesar size_bytes."""
+    import struct
+    import uuid
+    pages = size_bytes // pagesize
+    if pages < SWAP_MIN_PAGES:
+        raise ValueError(f"area swap terlalu kecil ({pages} page, minimal {SWAP_MIN_PAGES})")
+    if len(badpages) > (pagesize - 10 - _SWAP_BADPAGES_OFF) // 4:
+        raise ValueError("daftar bad page terlalu panjang")
+    lbl = (label or "").encode()
+    if len(lbl) > SWAP_LABEL_LEN:
+        raise ValueError(f"label maksimal {SWAP_LABEL_LEN} byte")
+    hdr = bytearray(pagesize)
+    # endianness native, sama seperti mkswap & kernel
+    struct.pack_into("=III", hdr, _SWAP_INFO_OFF, SWAP_HEADER_VERSION, pages - 1, len(badpages))
+    hdr[_SWAP_UUID_OFF:_SWAP_UUID_OFF + 16] = uuid_bytes or uuid.uuid4().bytes
+    hdr[_SWAP_LABEL_OFF:_SWAP_LABEL_OFF + len(lbl)] = lbl
+    for i, bp in enumerate(badpages):
+        struct.pack_into("=I", hdr, _SWAP_BADPAGES_OFF + 4 * i, bp)
+    hdr[pagesize - len(SWAP_MAGIC):] = SWAP_MAGIC
+    return bytes(hdr)
+
+def parse_swap_header(page: bytes):
+    """Parse page 0 area swap; kembalikan dict header atau None bila tidak ada signature."""
+    import struct
+    pagesize = len(page)
+    if page[-10:] == SWAP_MAGIC_V0:
+        return {"magic": SWAP_MAGIC_V0.decode(), "pagesize": pagesize}
+    if page[-10:] != SWAP_MAGIC:
+        return None
+    version, last_page, nr_bad = struct.unpack_from("=III", page, _SWAP_INFO_OFF)
+    nr_read = min(nr_bad, (pagesize - 10 - _SWAP_BADPAGES_OFF) // 4)
+    raw_uuid = page[_SWAP_UUID_OFF:_SWAP_UUID_OFF + 16]
+    return {
+        "magic": SWAP_MAGIC.decode(),
+        "pagesize": pagesize,
+        "version": version,
+        "last_page": last_page,
+        "nr_badpages": nr_bad,
+        "badpages": list(struct.unpack_from(f"={nr_read}I", page, _SWAP_BADPAGES_OFF)),
+        "uuid": _format_uuid(raw_uuid) if any(raw_uuid) else None,
+        "uuid_bytes": raw_uuid,
+        "label": page[_SWAP_LABEL_OFF:_SWAP_LABEL_OFF + SWAP_LABEL_LEN].rstrip(b"\0").decode(errors="replace"),
+    }
+
+def _area_size(fd: int):
+    # lseek SEEK_END berlaku untuk file biasa maupun block device (zram, partisi)
+    return os.lseek(fd, 0, os.SEEK_END)
+
+def read_swap_header(path: str):
+    """Baca header swap dari file/device; coba page size sistem lalu page size umum lain."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        size = _area_size(fd)
+        for ps in dict.fromkeys((PAGE_SIZE, 4096, 8192, 16384, 65536)):
+            page = os.pread(fd, ps, 0)
+            if len(page) == ps:
+                hdr = parse_swap_header(page)
+                if hdr:
+                    hdr["area_bytes"] = size
+                    return hdr
+    finally:
+        os.close(fd)
     return None
 
-# ---------- Helpers untuk deteksi swap yang ada ----------
-def classify_existing_swaps():
-    """Kembalikan dict: {'zram': [paths], 'files': [paths], 'parts': [paths]} dari /proc/swaps"""
-    zram, files, parts = [], [], []
-    for s in get_swaps_from_proc():
-        name = s['name']
-        typ = s['type'].lower()
-        if 'zram' in name:
-            zram.append(name)
-        elif typ == 'file':
-            files.append(name)
+def write_swap_header(path: str, label=None, uuid_bytes=None, badpages=()):
+    """Pengganti mkswap: tulis signature SWAPSPACE2 ke file/device dan fsync."""
+    fd = os.open(path, os.O_RDWR | getattr(os, "O_CLOEXEC", 0))
+    try:
+        hdr = build_swap_header(_area_size(fd), label, uuid_bytes, badpages)
+        os.pwrite(fd, hdr, 0)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    return parse_swap_header(hdr)
+
+def validate_swap_header(path: str):
+    """Cek header swap terhadap ukuran file & page size sebelum swapon.
+
+    Kembalikan dict {ok, errors, warnings, header}; errors = swapon akan gagal/berbahaya.
+    """
+    errors, warnings = [], []
+    try:
+        hdr = read_swap_header(path)
+    except OSError as e:
+        return {"ok": False, "errors": [f"tidak bisa dibaca: {e}"], "warnings": [], "header": None}
+    if hdr is None:
+        errors.append("signature swap tidak ditemukan")
+    elif hdr["magic"] == SWAP_MAGIC_V0.decode():
+        errors.append("format swap v0 (SWAP-SPACE) tidak didukung kernel modern")
+    else:
+        pages = hdr["area_bytes"] // PAGE_SIZE
+        if hdr["pagesize"] != PAGE_SIZE:
+            errors.append(f"page size header {hdr['pagesize']} != page size sistem {PAGE_SIZE}")
+        if hdr["version"] != SWAP_HEADER_VERSION:
+            errors.append(f"versi header {hdr['version']} tidak dikenal")
+        if hdr["last_page"] + 1 > pages:
+            errors.append(f"header basi/terpotong: last_page={hdr['last_page']} tapi area hanya {pages} page")
+        elif hdr["last_page"] + 1 < pages:
+            warnings.append(f"header hanya memakai {hdr['last_page'] + 1} dari {pages} page (mkswap ulang setelah resize?)")
+        if hdr["last_page"] + 1 < SWAP_MIN_PAGES:
+            errors.append("area swap terlalu kecil")
+        if hdr["nr_badpages"] > len(hdr["badpages"]):
+            errors.append(f"nr_badpages={hdr['nr_badpages']} melebihi kapasitas header")
+        if any(bp == 0 or bp > hdr["last_page"] for bp in hdr["badpages"]):
+            errors.append("daftar bad page di luar jangkauan area")
+        if hdr["area_bytes"] % PAGE_SIZE:
+            warnings.append("ukuran area bukan kelipatan page size")
+    return {"ok": not errors, "errors": errors, "warnings": warnings, "header": hdr}
+
+def make_swap(path: str, label=None, keep_ids: bool = False, uuid_bytes=None):
+    """Tulis signature swap secara native (pengganti mkswap).
+
+    keep_ids=True: UUID & label lama dipertahankan (mis. setelah resize, supaya entri UUID= tetap valid).
+    """
+    if keep_ids:
+        try:
+            old = read_swap_header(path)
+        except OSError:
+            old = None
+        if old and old.get("uuid"):
+            uuid_bytes, label = old["uuid_bytes"], label or old["label"] or None
+    try:
+        write_swap_header(path, label, uuid_bytes)
+        return True
+    except (OSError, ValueError) as e:
+        print(f"❌ Gagal menulis signature swap {path}: {e}")
+        return False
+
+def check_swap_header(path: str):
+    """Validasi header sebelum swapon; cetak masalah, kembalikan False bila tidak aman."""
+    try:
+        res = validate_swap_header(path)
+    except PermissionError:
+        return True  # tidak bisa dibaca tanpa root; biarkan swapon yang memutuskan
+    for w in res["warnings"]:
+        print(f"⚠ {path}: {w}")
+    for e in res["errors"]:
+        print(f"❌ {path}: {e}")
+    return res["ok"]
+
+
+# -------------------- Swapfile extent inspector (FIEMAP) --------------------
+FS_IOC_FIEMAP = 0xC020660B
+FIEMAP_FLAG_SYNC = 0x1
+FIEMAP_EXTENT_LAST = 0x1
+FIEMAP_EXTENT_UNKNOWN = 0x2
+FIEMAP_EXTENT_DELALLOC = 0x4
+FIEMAP_EXTENT_ENCODED = 0x8
+FIEMAP_EXTENT_DATA_INLINE = 0x200
+FIEMAP_EXTENT_DATA_TAIL = 0x400
+FIEMAP_EXTENT_UNWRITTEN = 0x800
+FIEMAP_EXTENT_SHARED = 0x2000
+# extent yang membuat swapon menolak file (lihat iomap_swapfile_activate)
+FIEMAP_SWAP_UNSAFE = (FIEMAP_EXTENT_UNKNOWN | FIEMAP_EXTENT_DELALLOC | FIEMAP_EXTENT_ENCODED |
+                      FIEMAP_EXTENT_DATA_INLINE | FIEMAP_EXTENT_DATA_TAIL | FIEMAP_EXTENT_SHARED)
+_FIEMAP_HDR = "=QQIIII"
+_FIEMAP_EXTENT = "=QQQQQI12x"
+FRAG_MAX_RUNS_PER_GIB = 8
+
+def get_file_extents(path: str, batch: int = 512):
+    """Daftar extent file via ioctl FIEMAP: list dict (logical, physical, length, flags)."""
+    import fcntl
+    import struct
+    hdr_len, ext_len = struct.calcsize(_FIEMAP_HDR), struct.calcsize(_FIEMAP_EXTENT)
+    extents = []
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        start = 0
+        while True:
+            buf = bytearray(struct.pack(_FIEMAP_HDR, start, (1 << 64) - 1 - start, FIEMAP_FLAG_SYNC, 0, batch, 0))
+            buf += bytes(ext_len * batch)
+            fcntl.ioctl(fd, FS_IOC_FIEMAP, buf, True)
+            mapped = struct.unpack_from(_FIEMAP_HDR, buf)[3]
+            if not mapped:
+                break
+            for i in range(mapped):
+                logical, physical, length, _, _, flags = struct.unpack_from(_FIEMAP_EXTENT, buf, hdr_len + i * ext_len)
+                extents.append({"logical": logical, "physical": physical, "length": length, "flags": flags})
+            last = extents[-1]
+            if last["flags"] & FIEMAP_EXTENT_LAST:
+                break
+            start = last["logical"] + last["length"]
+    finally:
+        os.close(fd)
+    return extents
+
+def analyze_extents(extents, size: int):
+    """Ringkas extent: jumlah, run fisik kontigu, hole, unwritten/shared, dan kelayakan swap."""
+    runs, holes = [], 0
+    expect = 0
+    unwritten = shared = unsafe = 0
+    for e in extents:
+        if e["logical"] > expect:
+            holes += e["logical"] - expect
+        expect = max(expect, e["logical"] + e["length"])
+        if e["flags"] & FIEMAP_EXTENT_UNWRITTEN:
+            unwritten += 1
+        if e["flags"] & FIEMAP_EXTENT_SHARED:
+            shared += 1
+        if e["flags"] & FIEMAP_SWAP_UNSAFE:
+            unsafe += 1
+        # gabungkan extent yang bersambung secara logis & fisik menjadi satu run
+        if runs and runs[-1]["physical_end"] == e["physical"] and runs[-1]["logical_end"] == e["logical"]:
+            runs[-1]["length"] += e["length"]
+            runs[-1]["physical_end"] += e["length"]
+            runs[-1]["logical_end"] += e["length"]
+        else:
+            runs.append({"length": e["length"], "physical_end": e["physical"] + e["length"],
+                         "logical_end": e["logical"] + e["length"]})
+    if size > expect:
+        holes += size - expect
+    largest = max((r["length"] for r in runs), default=0)
+    gib = max(1, size / (1 << 30))
+    problems = []
+    if holes:
+        problems.append(f"file punya hole {_fmt_mib(holes)} (swapon akan menolak)")
+    if shared:
+        problems.append(f"{shared} extent shared/reflink (swapon akan menolak)")
+    if unsafe - shared > 0:
+        problems.append(f"{unsafe - shared} extent inline/delalloc/encoded/unknown")
+    return {
+        "size": size,
+        "extents": len(extents),
+        "runs": len(runs),
+        "largest_run": largest,
+        "holes": holes,
+        "unwritten": unwritten,
+        "shared": shared,
+        "swap_safe": not problems,
+        "fragmented": len(runs) > FRAG_MAX_RUNS_PER_GIB * gib,
+        "problems": problems,
+    }
+
+def inspect_swapfile(path: str):
+    """Laporan extent/fragmentasi satu swapfile (dict analyze_extents + path)."""
+    rep = analyze_extents(get_file_extents(path), os.path.getsize(path))
+    rep["path"] = path
+    return rep
+
+def print_inspect(rep):
+    print(f"\n=== {rep['path']} ({_fmt_mib(rep['size'])}) ===")
+    print(f"extent        : {rep['extents']}  (run kontigu: {rep['runs']})")
+    pct = rep['largest_run'] * 100 / rep['size'] if rep['size'] else 0
+    print(f"run terbesar  : {_fmt_mib(rep['largest_run'])} ({pct:.0f}%)")
+    print(f"unwritten     : {rep['unwritten']}   shared: {rep['shared']}   hole: {_fmt_mib(rep['holes'])}")
+    for p in rep["problems"]:
+        print(f"❌ {p}")
+    if rep["fragmented"]:
+        print("⚠ Terfragmentasi — pertimbangkan mode reallocate.")
+    if rep["swap_safe"] and not rep["fragmented"]:
+        print("✅ Aman untuk swap.")
+
+def warn_fragmentation(path: str):
+    """Cek cepat setelah alokasi/resize; cetak peringatan bila file bermasalah."""
+    try:
+        rep = inspect_swapfile(path)
+    except OSError:
+        return  # FIEMAP tidak didukung / tidak ada akses
+    if rep["problems"] or rep["fragmented"]:
+        print_inspect(rep)
+
+def alternate_swap_path(path: str):
+    """Nama pasangan untuk penggantian bertahap: /swapfile <-> /swapfile.1"""
+    return path[:-2] if path.endswith(".1") else f"{path}.1"
+
+def _fstab_has(path: str):
+    try:
+        return bool(Fstab.load().find_swap(path))
+    except OSError:
+        return False
+
+def reallocate_swapfile(path: str):
+    """Bangun pengganti kontigu di sebelah file lama lalu tukar (dijalankan sebagai root).
+
+    File aktif tidak bisa di-rename/di-unlink kernel, jadi pengganti diaktifkan dengan nama
+    pasangan (alternate_swap_path), file lama di-drain & dihapus, lalu entri fstab dipindah.
+    Kembalikan path baru, atau None bila batal.
+    """
+    try:
+        old = inspect_swapfile(path)
+        hdr = read_swap_header(path)
+    except OSError as e:
+        print(f"❌ Gagal membaca {path}: {e}")
+        return None
+    new_path = alternate_swap_path(path)
+    if os.path.exists(new_path):
+        print(f"❌ {new_path} sudah ada; bereskan dulu sebelum reallocate.")
+        return None
+    try:
+        allocate_swapfile(new_path, old["size"])
+        new = inspect_swapfile(new_path)
+    except OSError as e:
+        print(f"❌ Gagal alokasi pengganti: {e}")
+        Plan().unlink(new_path).execute()
+        return None
+    if not new["swap_safe"] or (old["swap_safe"] and new["runs"] >= old["runs"]):
+        print(f"ℹ Pengganti tidak lebih baik ({new['runs']} run vs {old['runs']}); dibatalkan.")
+        Plan().unlink(new_path).execute()
+        return None
+    # UUID & label dipertahankan supaya entri fstab UUID=/LABEL= tetap cocok
+    if not make_swap(new_path, (hdr["label"] or None) if hdr else None,
+                     uuid_bytes=hdr.get("uuid_bytes") if hdr else None) or not check_swap_header(new_path):
+        Plan().unlink(new_path).execute()
+        return None
+
+    if system_snapshot().get(path) is None:
+        # tidak aktif: cukup timpa di tempat, nama tetap
+        Plan().rename(new_path, path).execute()
+        print(f"✅ {path} dialokasikan ulang: {old['runs']} -> {new['runs']} run kontigu.")
+        return path
+
+    pri = get_priority_for(path)
+    if not Plan().swapon(new_path, pri).execute():
+        Plan().unlink(new_path).execute()
+        return None
+    if not Plan().swapoff(path, progress=True).execute():
+        print("❌ swapoff file lama gagal, pengganti dilepas kembali.")
+        Plan().swapoff(new_path).unlink(new_path).execute()
+        return None
+    plan = Plan()
+    if _fstab_has(path):
+        # UUID=/LABEL= file lama dibaca (op swap_ids) sebelum unlink supaya entri berbasis ID ikut terhapus
+        fstab_remove(plan, path)
+        fstab_set_swap(plan, new_path, pri, msg="✅ /etc/fstab diperbarui.")
+    plan.unlink(path)
+    plan.note(f"✅ {path} dialokasikan ulang sebagai {new_path}: {old['runs']} -> {new['runs']} run kontigu.")
+    plan.execute()
+    return new_path
+
+def inspect_prompt():
+    files = classify_existing_swaps()['files']
+    extra = input("Path swapfile tambahan (kosong = swapfile aktif saja): ").strip()
+    if extra and extra not in files:
+        files.append(extra)
+    if not files:
+        print("ℹ Tidak ada swapfile untuk diinspeksi.")
+        return
+    # FIEMAP butuh akses baca ke swapfile (0600 root) -> lewat executor
+    plan = Plan(readonly=True)
+    for path in files:
+        plan.add("inspect", path=path, check=False)
+    plan.execute()
+    reports = []
+    for res in plan.results:
+        if res.get("ok") and res.get("out"):
+            print_inspect(res["out"])
+            reports.append(res["out"])
+    bad = [r["path"] for r in reports if r["fragmented"] or not r["swap_safe"]]
+    if bad and input("\nReallocate file bermasalah? (y/n): ").strip().lower() == "y":
+        path = bad[0] if len(bad) == 1 else pick_from_list("Pilih swapfile:", bad)
+        if path:
+            Plan().add("reallocate", path=path).execute()
+
+
+# -------------------- Actions --------------------
+def check_swap():
+    swapon = find_cmd("swapon")
+    if swapon:
+        code, out, err = run([swapon, "--show"])
+        if out:
+            print("\n=== Info Swap (swapon) ===")
+            print(out)
+        else:
+            print("Tidak ada swap aktif (swapon).")
+    else:
+        print("\n⚠ 'swapon' tidak ditemukan, fallback ke 'free -h':")
+        _, out, _ = run(["free", "-h"])
+        print(out)
+
+    swaps = system_snapshot().swaps
+    if swaps:
+        print("\n=== Detail /proc/swaps ===")
+        print("Filename\t\tType\tSize(MiB)\tUsed(MiB)\tPrio")
+        for s in swaps:
+            print(f"{s['name']}\t{s['type']}\t{int(s['size_kib']/1024)}\t\t{int(s['used_kib']/1024)}\t\t{s['prio']}")
+        if any(s['used_kib'] for s in swaps):
+            print_swap_top(SwapTop().refresh(), 5)
+
+
+def add_swap():
+    path = (input("Path swapfile (default: /swapfile): ").strip() or "/swapfile")
+    size_str = input("Ukuran (contoh 8G atau 4096M): ").strip()
+    size = parse_size_to_bytes(size_str)
+    if not size:
+        print("❌ Ukuran tidak valid. Contoh benar: 8G, 4096M")
+        return
+
+    # cek penempatan: kelas disk, filesystem, disk yang dipakai mount latency-critical
+    real = os.path.realpath(path)
+    rec = next(r for r in advise_placement([path])["areas"] if os.path.realpath(r["path"]) == real)
+    for issue in rec["issues"]:
+        print(f"⚠ {issue}")
+    if rec["class"] is None and input("Tetap lanjut? (y/n): ").strip().lower() != "y":
+        return
+    sug = rec["priority"]
+    ans = input("Tambahkan ke /etc/fstab agar permanen? (y/n): ").strip().lower()
+    if ans == "y" and sug is not None:
+        pri = input(f"Set priority? (saran {sug} untuk {rec['class']}, kosong = {sug}): ").strip() or str(sug)
+    else:
+        pri = input("Set priority? (mis. -1, kosong = tanpa pri): ").strip() if ans == "y" else ""
+
+    print(f"\n[Membuat] {path} sebesar {size_str} ...")
+    plan = Plan()
+    plan.allocate(path, size).chmod(path).mkswap(path).verify_swap(path)
+    plan.swapon(path, pri, msg="✅ Swapfile diaktifkan.")
+    if ans == "y":
+        fstab_set_swap(plan, path, pri, msg="✅ Ditambahkan ke /etc/fstab.")
+    plan.execute()
+
+
+def remove_swap():
+    path = (input("Path swapfile yang dihapus (default: /swapfile): ").strip() or "/swapfile")
+    print(f"\n[Hapus] {path} ...")
+    plan = Plan()
+    plan.swapoff(path, check=False)  # best effort
+    fstab_remove(plan, path)
+    plan.unlink(path, msg="✅ Swapfile dihapus & fstab dibersihkan.")
+    plan.execute()
+
+
+def set_swap_priority():
+    swaps = system_snapshot().swaps
+    if not swaps:
+        print("❌ Tidak ada swap aktif.")
+        return
+
+    print("\nSwap aktif:")
+    for i, s in enumerate(swaps, 1):
+        size_gib = s['size_kib'] / 1024 / 1024
+        used_gib = s['used_kib'] / 1024 / 1024
+        print(f"{i}. {s['name']} ({s['type']})  size≈{size_gib:.2f}GiB  used≈{used_gib:.2f}GiB  prio={s['prio']}")
+
+    sel = input("Pilih nomor target: ").strip()
+    if not sel.isdigit() or not (1 <= int(sel) <= len(swaps)):
+        print("❌ Pilihan tidak valid.")
+        return
+
+    target = swaps[int(sel) - 1]['name']
+    new_pri = input("Masukkan prioritas baru (mis. -1..100): ").strip()
+    if new_pri == "":
+        print("❌ Prioritas kosong.")
+        return
+
+    set_priority(target, new_pri)
+
+
+def set_priority(target: str, pri, plan=None):
+    """Ubah prioritas runtime (swapoff + swapon) dan persist di fstab (kecuali zram)."""
+    try:
+        pri = int(pri)
+    except (TypeError, ValueError):
+        print("❌ Prioritas harus angka.")
+        return False
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.swapoff(target)
+    plan.swapon(target, pri, msg="✅ Prioritas runtime diubah.")
+    if "/zram" in target:
+        print("ℹ ZRAM tidak dikonfigurasi via /etc/fstab. Untuk persist, atur di zram-generator (override.conf).")
+    else:
+        fstab_set_swap(plan, target, pri, msg="✅ /etc/fstab diperbarui.")
+    return plan.execute() if own else True
+
+
+# -------------------- Resize swapfile --------------------
+def resize_swapfile():
+    path = (input("Path swapfile yang ingin di-resize (default: /swapfile): ").strip() or "/swapfile")
+    if not os.path.exists(path):
+        print("❌ Swapfile tidak ditemukan.")
+        return
+
+    new_size = input("Ukuran baru (contoh 12G atau 6144M): ").strip()
+    mode = input("Mode (auto/staged/inplace, default auto): ").strip() or "auto"
+    resize_swapfile_path(path, new_size, mode=mode)
+
+def resize_zram(dev="/dev/zram0", new_size_str=None, plan=None, mode="auto", mem_limit=None,
+                update_service: bool = True):
+    """Resize zram device (default /dev/zram0) sambil pertahankan prioritas, algoritma (primer &
+    rekompresi), mem_limit dan backing_dev.
+
+    mode: "inplace" (swapoff + reset), "staged" (device baru aktif dulu, lalu yang lama di-drain),
+    "auto" (staged bila device sedang berisi). plan diberikan -> op ditambahkan ke plan pemanggil.
+    mem_limit: limit baru (default limit lama). update_service=False: zram.service tidak disentuh
+    (pemanggil yang mem-persist, mis. reconcile). Kembalikan device hasil resize.
+    """
+    if new_size_str is None:
+        new_size_str = input(f"Ukuran ZRAM baru untuk {dev} (mis. 4G): ").strip()
+    bytes_ = parse_size_to_bytes(new_size_str)
+    if not bytes_:
+        print("❌ Ukuran tidak valid.")
+        return None
+
+    base = zram_sysfs(dev)
+    if not os.path.exists(f"{base}/disksize"):
+        print("❌ Tidak menemukan sysfs zram. Kernel mungkin tidak mendukung.")
+        return None
+    old_pri = get_priority_for(dev)
+    old = zram_device_settings(dev)
+    limit = old["mem_limit"] if mem_limit is None else mem_limit
+
+    own = plan is None
+    if old["backing_dev"] and mode != "inplace":
+        # backing_dev dibuka eksklusif oleh device lama -> pengganti tidak bisa memakainya sebelum reset
+        if own:
+            print(f"ℹ {dev} memakai backing_dev {old['backing_dev']}; resize di tempat.")
+        mode = "inplace"
+    staged = choose_resize_mode(dev, bytes_, mode, quiet=not own)
+    if staged is None:
+        return None
+    plan = Plan() if own else plan
+    if staged:
+        # device baru di prioritas & setelan yang sama menampung page saat device lama di-drain
+        new_dev = zram_add_ops(plan, bytes_, old_pri, old["algorithm"], limit, old["recomp"], var="zram_staged")
+        zram_remove_ops(plan, dev)
+        plan.note(f"✅ ZRAM di-resize bertahap: {dev} diganti {new_dev}.")
+    else:
+        # disksize hanya bisa diubah setelah reset; reset juga menghapus algoritma, rekompresi,
+        # backing_dev & mem_limit, jadi semuanya diset ulang (urutan sama dengan zram_add_ops)
+        new_dev = dev
+        plan.swapoff(dev, check=False, progress=True)
+        plan.write_sysfs(f"{base}/reset", 1)
+        if old["recomp"]:
+            plan.add("zram_recomp", device=dev, algorithms=old["recomp"], check=False)
+        if old["algorithm"]:
+            plan.write_sysfs(f"{base}/comp_algorithm", old["algorithm"])
+        if old["backing_dev"]:
+            plan.write_sysfs(f"{base}/backing_dev", old["backing_dev"])
+        plan.write_sysfs(f"{base}/disksize", bytes_)
+        if limit:
+            plan.write_sysfs(f"{base}/mem_limit", limit)
+        plan.mkswap(dev)
+        plan.swapon(dev, old_pri, msg="✅ ZRAM di-resize & aktif kembali.")
+
+    # zram.service yang mengelola device ini ikut diperbarui (device pengganti bila staged)
+    svc = read_zram_service() if update_service else None
+    persisted = bool(svc and svc["count"] == 1 and svc["device"] == dev)
+    if persisted:
+        plan.write_file(ZRAM_SERVICE, render_zram_service(new_dev, bytes_, svc["priority"],
+                                                          svc["mem_limit"] if mem_limit is None else mem_limit,
+                                                          svc["algorithm"], svc["recomp"],
+                                                          backing_dev=svc["backing_dev"]), mode=0o644)
+        plan.exec(["systemctl", "daemon-reload"], msg="✅ zram.service diperbarui.")
+
+    # Persist pakai zram-generator kalau ada
+    zr_gen = find_cmd("zram-generator") or ("/usr/lib/systemd/zram-generator"
+                                            if os.path.exists("/usr/lib/systemd/zram-generator") else None)
+    if zr_gen:
+        mib = int(bytes_ / 1024 / 1024)
+        pri = old_pri if old_pri is not None else 100
+        conf = f"[{os.path.basename(new_dev)}]\nzram-size = {mib}\npriorities = {pri}\n"
+        plan.mkdir("/etc/systemd/zram-generator.conf.d")
+        plan.write_file("/etc/systemd/zram-generator.conf.d/override.conf", conf)
+        plan.exec(["systemctl", "daemon-reexec"], msg="✅ Persist zram-generator diperbarui.")
+    elif not persisted and update_service:
+        print("ℹ zram-generator tidak ada; perubahan ZRAM hanya runtime.")
+    if own and not plan.execute():
+        return None
+    if staged and own and not DRY_RUN:
+        return f"/dev/{plan.vars['zram_staged']}"
+    # device pengganti berupa template bila plan milik pemanggil & belum dieksekusi
+    return new_dev
+
+
+def zram_add_ops(plan, bytes_size, priority, algorithm=None, mem_limit=None, recomp=None, var="zram",
+                 backing_dev=None):
+    """Op runtime untuk satu device zram baru (cari device bebas, set algoritma & ukuran, swapon).
+
+    Kembalikan path device dalam bentuk template ("/dev/${var}") yang di-resolve saat eksekusi.
+    """
+    # Pastikan modul zram tersedia, lalu cari device zram kosong
+    plan.exec([find_cmd("modprobe") or "modprobe", "zram"], check=False)
+    plan.add("zram_find", save=var)
+    device, base = f"/dev/${{{var}}}", f"/sys/block/${{{var}}}"
+
+    # Algoritma (primer & rekompresi) harus di-set sebelum disksize
+    if recomp:
+        plan.add("zram_recomp", device=device, algorithms=list(recomp), check=False)
+    if algorithm:
+        plan.write_sysfs(f"{base}/comp_algorithm", algorithm)
+    # backing_dev (writeback) juga hanya bisa di-set sebelum disksize
+    if backing_dev:
+        plan.write_sysfs(f"{base}/backing_dev", backing_dev)
+    plan.write_sysfs(f"{base}/disksize", bytes_size)
+    if mem_limit:
+        plan.write_sysfs(f"{base}/mem_limit", mem_limit)
+    plan.mkswap(device)
+    plan.swapon(device, priority)
+    return device
+
+def zram_remove_ops(plan, dev):
+    """Op untuk melepas satu device zram: swapoff, reset, lalu hot_remove (zram0 boleh gagal)."""
+    base = zram_sysfs(dev)
+    plan.swapoff(dev, progress=True)
+    plan.write_sysfs(f"{base}/reset", 1)
+    num = os.path.basename(dev)[len("zram"):]
+    plan.write_sysfs("/sys/class/zram-control/hot_remove", num, check=False)
+    return plan
+
+ZRAM_MIN_SHARE = 64 * 1024 * 1024  # device lebih kecil dari ini tidak sepadan dengan overhead-nya
+
+def numa_node_count():
+    try:
+        return max(1, len([n for n in os.listdir("/sys/devices/system/node") if re.match(r"node\d+$", n)]))
+    except OSError:
+        return 1
+
+def zram_topology_count(topology="single", total_bytes=None):
+    """Jumlah device zram untuk topologi: single, cpu (per CPU), numa (per node), atau angka."""
+    topology = str(topology or "single").strip().lower()
+    if topology == "single":
+        n = 1
+    elif topology == "cpu":
+        n = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    elif topology == "numa":
+        n = numa_node_count()
+    elif topology.isdigit() and int(topology) > 0:
+        n = int(topology)
+    else:
+        raise ValueError(f"topologi zram tidak dikenal: {topology}")
+    if total_bytes:
+        n = max(1, min(n, total_bytes // ZRAM_MIN_SHARE))
+    return n
+
+def split_zram_size(total: int, n: int):
+    """Bagi total jadi n bagian rata (kelipatan page); sisa masuk ke device pertama."""
+    share = total // n // PAGE_SIZE * PAGE_SIZE
+    return [total - share * (n - 1)] + [share] * (n - 1)
+
+def create_zram_permanent(size_gb, priority, mem_limit=None, algorithm=None, recomp=None, plan=None,
+                          topology="single", backing_dev=None, backing_size=None):
+    # angka polos dianggap GiB (perilaku lama), selain itu ikut suffix G/M/K
+    size_str = size_gb.strip()
+    bytes_size = parse_size_to_bytes(size_str + "G" if size_str.isdigit() else size_str)
+    if not bytes_size:
+        print(f"❌ Ukuran ZRAM '{size_gb}' tidak valid. Gunakan format seperti 1G atau 512M.")
+        return False
+
+    try:
+        count = zram_topology_count(topology, bytes_size)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    if backing_dev and not zram_writeback_supported():
+        print("⚠ Kernel tanpa CONFIG_ZRAM_WRITEBACK (tidak ada backing_dev di sysfs); writeback dilewati.")
+        backing_dev = None
+    if backing_dev and count > 1:
+        print("⚠ backing_dev hanya didukung untuk satu device zram; writeback dilewati.")
+        backing_dev = None
+
+    own = plan is None
+    plan = Plan() if own else plan
+    with plan.lane("zram"):
+        bd = zram_backing_ops(plan, backing_dev, backing_size or bytes_size // 2) if backing_dev else None
+        limits = split_zram_size(int(mem_limit), count) if mem_limit else [None] * count
+        devices = [zram_add_ops(plan, size, priority, algorithm, lim, recomp,
+                                var="zram" if i == 0 else f"zram_{i}", backing_dev=bd)
+                   for i, (size, lim) in enumerate(zip(split_zram_size(bytes_size, count), limits))]
+
+        # Buat systemd service permanen (seluruh set device dalam satu unit); nomor device = yang dipilih
+        # zram_find di atas (template di-resolve saat eksekusi), jadi ExecStop melepas device yang sama
+        plan.write_file(ZRAM_SERVICE, render_zram_service(devices, bytes_size, priority, mem_limit, algorithm,
+                                                          recomp, backing_dev=backing_dev),
+                        mode=0o644)
+        plan.exec(["systemctl", "enable", "zram.service"], check=False)
+        where = devices[0] if count == 1 else f"{count} device @ {_fmt_mib(bytes_size // count)}"
+        plan.note(f"✅ ZRAM permanent {size_gb} ({where}) dibuat dengan prioritas {priority}"
+                  + (f" (algoritma {algorithm})" if algorithm else ""))
+    return plan.execute() if own else True
+
+
+ZRAM_SERVICE = "/etc/systemd/system/zram.service"
+ZRAM_SERVICE_WANTS = "/etc/systemd/system/multi-user.target.wants/zram.service"  # symlink dari `enable`
+
+def render_zram_service(devices, bytes_size, priority, mem_limit=None, algorithm=None, recomp=None,
+                        backing_dev=None):
+    """Isi unit systemd zram.service.
+
+    devices: path device (atau daftar path) — sama dengan yang dipakai plan runtime, boleh berupa
+    template "/dev/${var}" dari zram_add_ops. bytes_size & mem_limit adalah total yang dibagi rata ke
+    semua device dengan prioritas sama (kernel membagi swap-out round-robin di antaranya).
+    """
+    devices = [devices] if isinstance(devices, str) else list(devices)
+    sizes = split_zram_size(bytes_size, len(devices))
+    limits = split_zram_size(mem_limit, len(devices)) if mem_limit else [None] * len(devices)
+    alg = f" --algorithm {algorithm}" if algorithm else ""
+    start, stop = "", ""
+    for i, (dev, size, lim) in enumerate(zip(devices, sizes, limits)):
+        base = zram_sysfs(dev)
+        if dev != "/dev/zram0":
+            # modprobe saat boot hanya membuat zram0 -> hot_add (id terkecil yang bebas) sampai device ini ada
+            start += (f"ExecStart=/bin/sh -c 'until [ -e {base} ]; do "
+                      f"cat /sys/class/zram-control/hot_add >/dev/null || exit 1; done'\n")
+        # '-' = kegagalan diabaikan (kernel tanpa dukungan rekompresi)
+        for prio, algo in enumerate(recomp or [], 1):
+            start += f"ExecStart=-/bin/sh -c 'echo algo={algo} priority={prio} > {base}/recomp_algorithm'\n"
+        if backing_dev and i == 0:
+            src = backing_dev if backing_dev.startswith("/dev/") else \
+                f"$(losetup --find --show --direct-io=on {backing_dev})"
+            start += f"ExecStart=/bin/sh -c 'echo {src} > {base}/backing_dev'\n"
+        start += f"ExecStart=/sbin/zramctl --size {size}{alg} {dev}\n"
+        if lim:
+            start += f"ExecStart=/bin/sh -c 'echo {lim} > {base}/mem_limit'\n"
+        start += f"ExecStart=/sbin/mkswap {dev}\nExecStart=/sbin/swapon -p {priority} {dev}\n"
+        stop += f"ExecStop=-/sbin/swapoff {dev}\n"
+        if backing_dev and i == 0 and not backing_dev.startswith("/dev/"):
+            # loop dari losetup --find di ExecStart: lepas sebelum reset (autoclear saat zram menutupnya)
+            stop += f"ExecStop=-/bin/sh -c 'losetup -d \"$(cat {base}/backing_dev)\"'\n"
+        stop += f"ExecStop=-/bin/sh -c 'echo 1 > {base}/reset'\n"
+    return f"""[Unit]
+Description=ZRAM swap
+After=multi-user.target
+
+[Service]
+Type=oneshot
+ExecStart=/sbin/modprobe zram
+{start}{stop}RemainAfterExit=yes
+
+[Install]
+WantedBy=multi-user.target
+"""
+
+def read_zram_service():
+    """Parse zram.service buatan render_zram_service() -> dict parameter, atau None.
+
+    bytes_size & mem_limit adalah total semua device; count = jumlah device di unit.
+    """
+    text = _read_sysfs(ZRAM_SERVICE)
+    if not text:
+        return None
+    devs = re.findall(r'zramctl --size (\d+)(?: --algorithm (\S+))? (\S+)', text)
+    if not devs:
+        return None
+    pri = re.search(r'swapon -p (-?\d+)', text)
+    lims = [int(v) for v in re.findall(r"echo (\d+) > \S+/mem_limit", text)]
+    return {
+        "device": devs[0][2],
+        "devices": [d[2] for d in devs],
+        "count": len(devs),
+        "bytes_size": sum(int(d[0]) for d in devs),
+        "algorithm": devs[0][1] or None,
+        "priority": int(pri.group(1)) if pri else 100,
+        "mem_limit": sum(lims) if lims else None,
+        "recomp": list(dict.fromkeys(re.findall(r'echo algo=(\S+) priority=\d+ >', text))),
+        "backing_dev": next((a or b for a, b in re.findall(
+            r"echo (?:\$\(losetup --find --show --direct-io=on (\S+)\)|(\S+)) > \S+/backing_dev", text)), None),
+    }
+
+def set_zram_recomp(device, algorithms):
+    """Daftarkan algoritma rekompresi sekunder (kernel >= 6.2, CONFIG_ZRAM_MULTI_COMP).
+
+    Dijalankan di executor (root). Kembalikan daftar yang berhasil di-set.
+    """
+    path = f"{zram_sysfs(device)}/recomp_algorithm"
+    if not os.path.exists(path):
+        print("ℹ Kernel tidak mendukung rekompresi zram; algoritma sekunder dilewati.")
+        return []
+    done = []
+    for i, algo in enumerate(algorithms, 1):
+        try:
+            _write_file(path, f"algo={algo} priority={i}")
+            done.append(algo)
+        except OSError as e:
+            print(f"⚠ Gagal set algoritma rekompresi {algo}: {e}")
+    return done
+
+
+
+def remove_zram_permanent(plan=None):
+    own = plan is None
+    plan = Plan() if own else plan
+    with plan.lane("zram"):
+        # try disable service first
+        plan.exec(["systemctl", "disable", "--now", "zram.service"], check=False)
+        # lepas semua device zram aktif (set multi-device ikut), lalu modul sekali bila bukan built-in
+        for dev in classify_existing_swaps()['zram']:
+            backing = zram_writeback_info(dev)["backing_dev"]
+            plan.swapoff(dev, check=False, progress=True)
+            plan.write_sysfs(f"{zram_sysfs(dev)}/reset", 1, check=False)
+            if backing and "/loop" in backing:
+                plan.exec(["losetup", "-d", backing], check=False)
+            if not dev.endswith("zram0"):
+                plan.write_sysfs("/sys/class/zram-control/hot_remove", os.path.basename(dev)[len("zram"):],
+                                 check=False)
+        plan.exec(["modprobe", "-r", "zram"], check=False)
+        # remove files
+        plan.exec(["systemctl", "disable", "--now", "zram-writeback.timer"], check=False)
+        plan.unlink(ZRAM_SERVICE).unlink("/usr/local/bin/zram-start.sh")
+        plan.unlink(WRITEBACK_SERVICE).unlink(WRITEBACK_TIMER)
+        plan.exec(["systemctl", "daemon-reload"], check=False)
+        plan.note("✅ ZRAM permanen berhasil dihapus (service & runtime).")
+    return plan.execute() if own else True
+
+
+
+# -------------------- ZRAM stats & auto-size --------------------
+ZRAM_MM_STAT_FIELDS = ("orig_data_size", "compr_data_size", "mem_used_total", "mem_limit",
+                       "mem_used_max", "same_pages", "pages_compacted", "huge_pages", "huge_pages_since")
+ZRAM_IO_STAT_FIELDS = ("failed_reads", "failed_writes", "invalid_io", "notify_free")
+ZRAM_BD_STAT_FIELDS = ("bd_count", "bd_reads", "bd_writes")  # satuan: page
+DEFAULT_ZRAM_RATIO = 2.0
+
+def zram_sysfs(dev: str):
+    return f"/sys/block/{os.path.basename(dev)}"
+
+def list_zram_devices():
+    """Daftar device zram yang ada di sysfs (terinisialisasi atau belum)."""
+    try:
+        names = [n for n in os.listdir("/sys/block") if n.startswith("zram")]
+    except OSError:
+        return []
+    return [f"/dev/{n}" for n in sorted(names, key=lambda n: int(n[4:] or 0))]
+
+def _read_sysfs(path: str):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _parse_stat_fields(text, fields):
+    """Pasangkan kolom angka dari mm_stat/io_stat/bd_stat dengan nama field-nya."""
+    if text is None:
+        return None
+    vals = text.split()
+    # kolom yang tidak dikenal kernel lama -> dilewati, kolom ekstra kernel baru -> diabaikan
+    return {k: int(v) for k, v in zip(fields, vals) if v.lstrip("-").isdigit()}
+
+def parse_comp_algorithm(text: str):
+    """'lzo [lzo-rle] lz4 zstd' -> (['lzo', 'lzo-rle', 'lz4', 'zstd'], 'lzo-rle')"""
+    algos, current = [], None
+    for tok in (text or "").split():
+        if tok.startswith("[") and tok.endswith("]"):
+            tok = tok[1:-1]
+            current = tok
+        algos.append(tok)
+    return algos, current
+
+def zram_device_settings(dev: str):
+    """Setelan device zram yang hilang saat reset: algoritma, rekompresi, mem_limit (byte), backing_dev."""
+    base = zram_sysfs(dev)
+    recomp = []
+    # recomp_algorithm: satu baris per prioritas, mis. "#1: lzo lzo-rle lz4 [zstd]"
+    for line in (_read_sysfs(f"{base}/recomp_algorithm") or "").splitlines():
+        m = re.match(r"#\d+:\s*(.*)", line)
+        cur = parse_comp_algorithm(m.group(1))[1] if m else None
+        if cur:
+            recomp.append(cur)
+    mm = _parse_stat_fields(_read_sysfs(f"{base}/mm_stat"), ZRAM_MM_STAT_FIELDS) or {}
+    bd = _read_sysfs(f"{base}/backing_dev")
+    return {
+        "algorithm": parse_comp_algorithm(_read_sysfs(f"{base}/comp_algorithm"))[1],
+        "recomp": recomp,
+        "mem_limit": mm.get("mem_limit") or None,
+        "backing_dev": None if bd in (None, "none") else bd,
+    }
+
+def read_zram_stats(dev: str):
+    """Baca statistik zram (mm_stat, io_stat, bd_stat) jadi satu record dict.
+
+    Field turunan: ratio (orig/compr), ram_used (mem_used_total), same_pages, huge_pages.
+    """
+    base = zram_sysfs(dev)
+    disksize = _read_sysfs(f"{base}/disksize")
+    if disksize is None:
+        return None
+    algos, current = parse_comp_algorithm(_read_sysfs(f"{base}/comp_algorithm"))
+    mm = _parse_stat_fields(_read_sysfs(f"{base}/mm_stat"), ZRAM_MM_STAT_FIELDS) or {}
+    st = {
+        "dev": dev,
+        "disksize": int(disksize),
+        "comp_algorithm": current,
+        "algorithms": algos,
+        "mm": mm,
+        "io": _parse_stat_fields(_read_sysfs(f"{base}/io_stat"), ZRAM_IO_STAT_FIELDS) or {},
+        "bd": _parse_stat_fields(_read_sysfs(f"{base}/bd_stat"), ZRAM_BD_STAT_FIELDS),
+    }
+    orig, compr = mm.get("orig_data_size", 0), mm.get("compr_data_size", 0)
+    st["ratio"] = (orig / compr) if compr else None
+    st["ram_used"] = mm.get("mem_used_total", 0)
+    st["same_pages"] = mm.get("same_pages", 0)
+    st["huge_pages"] = mm.get("huge_pages", 0)
+    return st
+
+def _fmt_mib(b):
+    return f"{b / 1024 / 1024:.1f}MiB"
+
+def show_zram_stats():
+    devs = [d for d in list_zram_devices() if read_zram_stats(d)]
+    if not devs:
+        print("ℹ Tidak ada device zram.")
+        return
+    for dev in devs:
+        st = read_zram_stats(dev)
+        mm = st["mm"]
+        ratio = f"{st['ratio']:.2f}:1" if st["ratio"] else "-"
+        print(f"\n=== {dev} ({st['comp_algorithm'] or '?'}) ===")
+        print(f"disksize      : {_fmt_mib(st['disksize'])}")
+        print(f"data asli     : {_fmt_mib(mm.get('orig_data_size', 0))}")
+        print(f"terkompresi   : {_fmt_mib(mm.get('compr_data_size', 0))}  (rasio {ratio})")
+        print(f"RAM terpakai  : {_fmt_mib(st['ram_used'])}  (max {_fmt_mib(mm.get('mem_used_max', 0))}, "
+              f"limit {_fmt_mib(mm['mem_limit']) if mm.get('mem_limit') else '-'})")
+        print(f"same pages    : {st['same_pages']}   huge pages: {st['huge_pages']}")
+        if st["io"]:
+            print(f"io            : failed_reads={st['io'].get('failed_reads', 0)} "
+                  f"failed_writes={st['io'].get('failed_writes', 0)}")
+        if st["bd"]:
+            wb = zram_writeback_info(dev)
+            limit = (f", sisa writeback_limit {_fmt_mib(wb['limit_pages'] * PAGE_SIZE)}"
+                     if wb["limit_enabled"] and wb["limit_pages"] is not None else "")
+            print(f"backing dev   : {wb['backing_dev'] or '-'} count={st['bd']['bd_count']} "
+                  f"reads={st['bd']['bd_reads']} writes={st['bd']['bd_writes']} (page){limit}")
+
+def compute_zram_autosize(st, ram_budget: int, min_ratio: float = 1.0, max_ratio: float = 4.0,
+                          min_sample: int = 64 * 1024 * 1024):
+    """Hitung (disksize, mem_limit, ratio) dari rasio kompresi teramati & budget RAM.
+
+    Rasio hanya dipercaya bila data asli >= min_sample; kalau belum, pakai DEFAULT_ZRAM_RATIO.
+    """
+    ratio = DEFAULT_ZRAM_RATIO
+    if st and st["ratio"] and st["mm"].get("orig_data_size", 0) >= min_sample:
+        ratio = st["ratio"]
+    ratio = max(min_ratio, min(max_ratio, ratio))
+    # ram_used juga menanggung metadata zsmalloc, jadi disksize = budget * rasio cukup konservatif
+    disksize = int(ram_budget * ratio) // PAGE_SIZE * PAGE_SIZE
+    return disksize, ram_budget, ratio
+
+def zram_auto_size(dev: str, ram_budget_str: str, apply: bool = True, tolerance: float = 0.10):
+    """Set disksize & mem_limit zram berdasarkan rasio kompresi teramati dan budget RAM."""
+    budget = parse_size_to_bytes(ram_budget_str)
+    if not budget:
+        print("❌ Budget RAM tidak valid.")
+        return None
+    st = read_zram_stats(dev)
+    if st is None:
+        print(f"❌ {dev} tidak ditemukan di sysfs.")
+        return None
+
+    disksize, mem_limit, ratio = compute_zram_autosize(st, budget)
+    print(f"[Auto-size] {dev}: rasio {ratio:.2f}:1, budget RAM {_fmt_mib(budget)} "
+          f"-> disksize {_fmt_mib(disksize)}, mem_limit {_fmt_mib(mem_limit)}")
+    if not apply:
+        return disksize, mem_limit
+
+    plan = Plan()
+    # disksize hanya bisa diubah lewat reset; hindari churn kalau selisihnya kecil
+    cur = st["disksize"]
+    if not cur or abs(disksize - cur) / cur > tolerance:
+        # resize menerapkan mem_limit ke device hasil resize (device pengganti bila staged) dan
+        # memperbarui zram.service yang mengelolanya
+        if not resize_zram(dev, f"{disksize // 1024}K", plan=plan, mem_limit=mem_limit):
+            return None
+    else:
+        print(f"ℹ disksize sekarang {_fmt_mib(cur)} sudah dalam toleransi, tidak di-reset.")
+        disksize = cur
+        plan.write_sysfs(f"{zram_sysfs(dev)}/mem_limit", mem_limit,
+                         msg=f"✅ mem_limit {dev} = {_fmt_mib(mem_limit)}")
+        # perbarui unit persist bila device ini dikelola zram.service
+        svc = read_zram_service()
+        if svc and svc["count"] == 1 and svc["device"] == dev:
+            plan.write_file(ZRAM_SERVICE, render_zram_service(dev, disksize, svc["priority"], mem_limit,
+                                                              svc["algorithm"], svc["recomp"],
+                                                              backing_dev=svc["backing_dev"]), mode=0o644)
+            plan.exec(["systemctl", "daemon-reload"], msg="✅ zram.service diperbarui.")
+    if not plan.execute():
+        return None
+    return disksize, mem_limit
+
+def zram_stats_prompt():
+    show_zram_stats()
+    devs = list_zram_devices()
+    if not devs:
+        return
+    ans = input("\nAuto-size ZRAM dari rasio kompresi? (y/n): ").strip().lower()
+    if ans != "y":
+        return
+    dev = devs[0] if len(devs) == 1 else pick_from_list("Pilih device ZRAM:", devs)
+    if not dev:
+        return
+    budget = input("Budget RAM untuk ZRAM (mis. 2G): ").strip()
+    zram_auto_size(dev, budget)
+
+
+# -------------------- ZRAM writeback (backing_dev) --------------------
+WRITEBACK_STATE = "/var/lib/swapi/zram-writeback.json"
+WRITEBACK_SERVICE = "/etc/systemd/system/zram-writeback.service"
+WRITEBACK_TIMER = "/etc/systemd/system/zram-writeback.timer"
+
+def zram_backing_ops(plan, backing: str, size: int = None, var: str = "backing"):
+    """Siapkan backing device: partisi dipakai langsung, file di-loop-kan (direct I/O).
+
+    Kembalikan path device (template "${var}" untuk file) untuk ditulis ke backing_dev.
+    """
+    if backing.startswith("/dev/"):
+        return backing
+    if not os.path.exists(backing):
+        plan.allocate(backing, size)
+        plan.chmod(backing)
+    plan.exec([find_cmd("losetup") or "losetup", "--find", "--show", "--direct-io=on", backing], save=var)
+    return f"${{{var}}}"
+
+def zram_writeback_supported():
+    """False bila device zram yang ada tidak punya atribut backing_dev; modul belum dimuat -> anggap ya."""
+    devs = list_zram_devices()
+    return not devs or os.path.exists(f"{zram_sysfs(devs[0])}/backing_dev")
+
+def zram_writeback_info(dev: str):
+    """backing_dev, sisa writeback_limit (page) dan bd_stat satu device zram."""
+    base = zram_sysfs(dev)
+    bd = _read_sysfs(f"{base}/backing_dev")
+    limit = _read_sysfs(f"{base}/writeback_limit")
+    return {
+        "dev": dev,
+        "backing_dev": None if bd in (None, "none") else bd,
+        "limit_enabled": _read_sysfs(f"{base}/writeback_limit_enable") == "1",
+        "limit_pages": int(limit) if limit and limit.isdigit() else None,
+        "bd": _parse_stat_fields(_read_sysfs(f"{base}/bd_stat"), ZRAM_BD_STAT_FIELDS) or {},
+    }
+
+def _load_writeback_state():
+    import json
+    try:
+        with open(WRITEBACK_STATE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def zram_writeback_cycle(dev: str, idle_age=None, huge: bool = True, budget_pages=None, period: float = 86400):
+    """Satu siklus writeback (dijalankan sebagai root).
+
+    Dengan idle_age (kernel dengan CONFIG_ZRAM_TRACK_ENTRY_TIME): tandai page yang tak tersentuh
+    >= idle_age detik lalu tulis. Tanpa itu: tulis page yang ditandai idle pada siklus sebelumnya
+    dan belum disentuh sejak itu, lalu tandai ulang semua page. Page huge (tak terkompresi) ikut
+    ditulis. budget_pages per period dijaga lewat writeback_limit + bd_stat.
+    """
+    import json
+    base = zram_sysfs(dev)
+    info = zram_writeback_info(dev)
+    if not info["backing_dev"]:
+        raise RuntimeError(f"{dev} tanpa backing_dev")
+    writes0 = info["bd"].get("bd_writes", 0)
+    res = {"dev": dev, "written_pages": 0, "budget_left": None, "errors": []}
+
+    if budget_pages is not None:
+        state = _load_writeback_state()
+        st = state.get(dev)
+        now = time.time()
+        if not st or now - st["start"] >= period or writes0 < st["writes"]:
+            st = state[dev] = {"start": now, "writes": writes0}
+        left = max(0, int(budget_pages) - (writes0 - st["writes"]))
+        res["budget_left"] = left
+        if os.path.exists(f"{base}/writeback_limit"):
+            _write_file(f"{base}/writeback_limit_enable", 1)
+            _write_file(f"{base}/writeback_limit", left)
+        os.makedirs(os.path.dirname(WRITEBACK_STATE), exist_ok=True)
+        atomic_write(WRITEBACK_STATE, json.dumps(state), mode=0o644)
+        if left == 0:
+            res["errors"].append("budget writeback habis")
+
+    def writeback(mode):
+        try:
+            _write_file(f"{base}/writeback", mode)
+        except OSError as e:
+            res["errors"].append(f"{mode}: {e.strerror}")
+
+    aged = False
+    if idle_age:
+        try:
+            _write_file(f"{base}/idle", int(idle_age))
+            aged = True
+        except OSError:
+            pass  # kernel tanpa pelacakan umur entri -> pola tandai/tulis per siklus
+    if res["budget_left"] != 0:
+        if huge:
+            writeback("huge")
+        writeback("idle")
+    if not aged:
+        _write_file(f"{base}/idle", "all")
+    after = zram_writeback_info(dev)["bd"].get("bd_writes", 0)
+    res["written_pages"] = after - writes0
+    if res["budget_left"] is not None:
+        res["budget_left"] = max(0, res["budget_left"] - res["written_pages"])
+    return res
+
+def zram_writeback_run(devs=None, interval: float = 300, idle_age=None, huge: bool = True, budget=None,
+                       period: float = 86400, once: bool = False):
+    """Scheduler writeback: tiap interval jalankan satu siklus untuk tiap zram yang punya backing_dev."""
+    devs = devs or [d for d in list_zram_devices() if zram_writeback_info(d)["backing_dev"]]
+    if not devs:
+        print("ℹ Tidak ada device zram dengan backing_dev.")
+        return False
+    budget_pages = budget // PAGE_SIZE if budget else None
+    ok = True
+    try:
+        while True:
+            plan = Plan()
+            for dev in devs:
+                plan.add("zram_writeback", device=dev, idle_age=idle_age, huge=huge,
+                         budget_pages=budget_pages, period=period, check=False)
+            ok = plan.execute()
+            for dev, res in zip(devs, plan.results):
+                out = res.get("out") or {}
+                if not res.get("ok"):
+                    print(f"⚠ {dev}: {res.get('error')}")
+                    ok = False
+                    continue
+                bd = zram_writeback_info(dev)["bd"]
+                left = out.get("budget_left")
+                print(f"[Writeback] {time.strftime('%H:%M:%S')} {dev}: +{_fmt_mib(out['written_pages'] * PAGE_SIZE)}, "
+                      f"di backing {_fmt_mib(bd.get('bd_count', 0) * PAGE_SIZE)} "
+                      f"(reads={bd.get('bd_reads', 0)} writes={bd.get('bd_writes', 0)} page)"
+                      + (f", sisa budget {_fmt_mib(left * PAGE_SIZE)}" if left is not None else "")
+                      + "".join(f"; ⚠ {e}" for e in out.get("errors", [])))
+            if once:
+                return ok
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nℹ Scheduler writeback dihentikan.")
+    return ok
+
+def install_writeback_timer(interval: float = 300, idle_age=None, budget=None, period: float = 86400, plan=None):
+    """Pasang zram-writeback.service + .timer yang menjalankan satu siklus tiap interval."""
+    args = [*SELF_ARGV, "zram-writeback", "--once"]
+    if idle_age:
+        args += ["--idle-age", str(int(idle_age))]
+    if budget:
+        args += ["--budget", f"{budget // 1024}K", "--period", str(int(period))]
+    service = f"""[Unit]
+Description=ZRAM idle/huge page writeback
+After=zram.service
+
+[Service]
+Type=oneshot
+ExecStart={" ".join(shlex.quote(a) for a in args)}
+"""
+    timer = f"""[Unit]
+Description=ZRAM writeback tiap {int(interval)}s
+
+[Timer]
+OnBootSec={int(interval)}s
+OnUnitActiveSec={int(interval)}s
+
+[Install]
+WantedBy=timers.target
+"""
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.write_file(WRITEBACK_SERVICE, service, mode=0o644).write_file(WRITEBACK_TIMER, timer, mode=0o644)
+    plan.exec(["systemctl", "daemon-reload"], check=False)
+    plan.exec(["systemctl", "enable", "--now", "zram-writeback.timer"], check=False,
+              msg="✅ zram-writeback.timer aktif.")
+    return plan.execute() if own else True
+
+def zram_writeback_prompt():
+    devs = [d for d in list_zram_devices() if zram_writeback_info(d)["backing_dev"]]
+    for d in devs:
+        info = zram_writeback_info(d)
+        print(f"{d}: backing {info['backing_dev']}, bd_stat {info['bd']}")
+    if not devs:
+        print("ℹ Belum ada zram dengan backing_dev (set saat membuat ZRAM di Setup Hybrid).")
+        return
+    age = input("Umur idle minimal (detik, kosong = pola tandai/tulis per siklus): ").strip()
+    budget = input("Budget writeback per hari (mis. 2G, kosong = tanpa batas): ").strip()
+    timer = input("Pasang systemd timer (y) atau jalankan satu siklus sekarang (n)? ").strip().lower() == "y"
+    budget_b = parse_size_to_bytes(budget) if budget else None
+    idle_age = int(age) if age.isdigit() else None
+    if timer:
+        iv = input("Interval detik (default 300): ").strip()
+        install_writeback_timer(int(iv) if iv.isdigit() else 300, idle_age, budget_b)
+    else:
+        zram_writeback_run(devs, idle_age=idle_age, budget=budget_b, once=True)
+
+
+# -------------------- ZRAM compression advisor --------------------
+# Padanan nama algoritma kernel -> codec Python (opsional, dicoba saat dipakai)
+ZRAM_CODEC_MODULES = {
+    "zstd": "zstandard",
+    "lz4": "lz4.block",
+    "lz4hc": "lz4.block",
+    "lzo": "lzo",
+    "lzo-rle": "lzo",
+    "deflate": "zlib",
+}
+
+def python_codecs():
+    """Codec in-process yang tersedia: {nama_kernel: (compress, decompress)}."""
+    import importlib
+    import zlib
+    codecs = {}
+    for name, mod in ZRAM_CODEC_MODULES.items():
+        try:
+            m = importlib.import_module(mod)
+        except ImportError:
+            continue
+        if name == "zstd":
+            c, d = m.ZstdCompressor(level=1), m.ZstdDecompressor()
+            codecs[name] = (c.compress, d.decompress)
+        elif name == "lz4":
+            codecs[name] = (lambda b, m=m: m.compress(b, store_size=True), m.decompress)
+        elif name == "lz4hc":
+            codecs[name] = (lambda b, m=m: m.compress(b, mode="high_compression", store_size=True),
+                            m.decompress)
+        elif name in ("lzo", "lzo-rle"):
+            codecs[name] = (m.compress, m.decompress)
+        elif name == "deflate":
+            # zram deflate = raw deflate (tanpa header/adler zlib), level default, window 2^11
+            codecs[name] = (lambda b: zlib.compress(b, 6, wbits=-11), lambda b: zlib.decompress(b, wbits=-11))
+    return codecs
+
+def build_synthetic_corpus(pages: int = 2048, seed: int = 1):
+    """Korpus sintetis yang meniru campuran page anonim: nol, pointer/struct, teks, int kecil, acak."""
+    import random
+    import struct
+    rnd = random.Random(seed)
+    vocab = ["".join(rnd.choice("etaoinshrdlucmfwyp") for _ in range(rnd.randint(2, 9)))
+             for _ in range(400)]
+    out = bytearray()
+    for _ in range(pages):
+        kind = rnd.random()
+        if kind < 0.15:
+            page = bytes(PAGE_SIZE)
+        elif kind < 0.40:
+            base = 0x7f0000000000 + rnd.randrange(1 << 24) * PAGE_SIZE
+            page = b"".join(
+                struct.pack("<Q", base + rnd.randrange(1 << 12) * 16 if rnd.random() < 0.6 else rnd.randrange(256))
+                for _ in range(PAGE_SIZE // 8))
+        elif kind < 0.65:
+            text = " ".join(rnd.choice(vocab) for _ in range(PAGE_SIZE // 3)).encode()
+            page = text[:PAGE_SIZE]
+        elif kind < 0.85:
+            page = struct.pack(f"<{PAGE_SIZE // 4}i", *(rnd.randrange(-500, 5000) for _ in range(PAGE_SIZE // 4)))
+        else:
+            page = rnd.randbytes(PAGE_SIZE)
+        out += page
+    return bytes(out)
+
+def capture_corpus_from_swap(name: str, pages: int = 2048, seed: int = 1):
+    """Ambil sampel page (non-nol) dari area swap aktif — isi page yang benar-benar di-swap-out."""
+    import random
+    rnd = random.Random(seed)
+    out = bytearray()
+    with open(name, "rb", buffering=0) as f:
+        total = os.lseek(f.fileno(), 0, os.SEEK_END) // PAGE_SIZE
+        if total < 2:
+            return b""
+        zero = bytes(PAGE_SIZE)
+        for _ in range(pages * 8):
+            if len(out) >= pages * PAGE_SIZE:
+                break
+            # page 0 = header swap
+            page = os.pread(f.fileno(), PAGE_SIZE, rnd.randrange(1, total) * PAGE_SIZE)
+            if len(page) == PAGE_SIZE and page != zero:
+                out += page
+    return bytes(out)
+
+def load_corpus(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    return data[:len(data) // PAGE_SIZE * PAGE_SIZE]
+
+def save_corpus(path: str, corpus: bytes):
+    with open(path, "wb") as f:
+        f.write(corpus)
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def _is_same_filled(page: bytes):
+    # zram menyimpan page berisi satu word berulang tanpa kompresi (same_pages)
+    return page[:8] * (len(page) // 8) == page
+
+def _bench_result(algo, mode, n, orig, stored, c_lat, d_lat):
+    c_total, d_total = sum(c_lat) or 1, sum(d_lat) or 1
+    # korpus yang seluruhnya page nol/same-filled tidak menyimpan byte apa pun: rasio dibatasi agar tetap
+    # hingga (inf membuat skor jadi NaN)
+    return {
+        "algorithm": algo,
+        "mode": mode,
+        "pages": n,
+        "ratio": orig / max(stored, 1),
+        "comp_mbps": orig / (c_total / 1e9) / 1e6,
+        "decomp_mbps": orig / (d_total / 1e9) / 1e6,
+        "comp_p99_us": _percentile(c_lat, 99) / 1000,
+        "decomp_p99_us": _percentile(d_lat, 99) / 1000,
+    }
+
+def bench_codec_python(algo, compress, decompress, corpus: bytes):
+    """Benchmark codec in-process per page, meniru aturan penyimpanan zram."""
+    huge = PAGE_SIZE * 3 // 4  # di atas ini zram menyimpan page apa adanya (huge page)
+    c_lat, d_lat, stored = [], [], 0
+    clock = time.perf_counter_ns
+    for off in range(0, len(corpus), PAGE_SIZE):
+        page = corpus[off:off + PAGE_SIZE]
+        if _is_same_filled(page):
+            continue
+        t0 = clock()
+        comp = compress(page)
+        t1 = clock()
+        decompress(comp)
+        t2 = clock()
+        c_lat.append(t1 - t0)
+        d_lat.append(t2 - t1)
+        stored += PAGE_SIZE if len(comp) >= huge else len(comp)
+    return _bench_result(algo, "python", len(corpus) // PAGE_SIZE, len(corpus), stored, c_lat, d_lat)
+
+def _write_file(path: str, value):
+    with open(path, "w") as f:
+        f.write(str(value))
+
+def bench_codec_kernel(algo, corpus: bytes):
+    """Benchmark algoritma di zram sungguhan: device sementara (hot_add), tulis/baca O_DIRECT per page."""
+    import mmap
+    dev_id = _read_sysfs("/sys/class/zram-control/hot_add")
+    if dev_id is None:
+        raise OSError("zram-control/hot_add tidak tersedia (modul zram belum dimuat?)")
+    dev = f"/dev/zram{dev_id}"
+    base = zram_sysfs(dev)
+    fd = None
+    try:
+        _write_file(f"{base}/comp_algorithm", algo)
+        _write_file(f"{base}/disksize", len(corpus) + 16 * PAGE_SIZE)
+        fd = os.open(dev, os.O_RDWR | getattr(os, "O_DIRECT", 0))
+        buf = mmap.mmap(-1, PAGE_SIZE)  # buffer ter-align untuk O_DIRECT
+        clock = time.perf_counter_ns
+        c_lat, d_lat = [], []
+        n = len(corpus) // PAGE_SIZE
+        for i in range(n):
+            buf[:] = corpus[i * PAGE_SIZE:(i + 1) * PAGE_SIZE]
+            t0 = clock()
+            os.pwrite(fd, buf, i * PAGE_SIZE)
+            c_lat.append(clock() - t0)
+        mm = _parse_stat_fields(_read_sysfs(f"{base}/mm_stat"), ZRAM_MM_STAT_FIELDS) or {}
+        for i in range(n):
+            t0 = clock()
+            os.preadv(fd, [buf], i * PAGE_SIZE)
+            d_lat.append(clock() - t0)
+        return _bench_result(algo, "kernel", n, mm.get("orig_data_size", len(corpus)),
+                             mm.get("compr_data_size", 0), c_lat, d_lat)
+    finally:
+        if fd is not None:
+            os.close(fd)
+        try:
+            _write_file(f"{base}/reset", 1)
+            _write_file("/sys/class/zram-control/hot_remove", dev_id)
+        except OSError:
+            pass
+
+def zram_candidate_algorithms():
+    """Algoritma yang ditawarkan kernel (dari comp_algorithm zram pertama), atau [] tanpa modul zram."""
+    for dev in list_zram_devices():
+        algos, _ = parse_comp_algorithm(_read_sysfs(f"{zram_sysfs(dev)}/comp_algorithm"))
+        if algos:
+            return algos
+    return []
+
+def score_zram_results(results, objective: str = "balanced"):
+    """Urutkan hasil benchmark; objective: 'ratio', 'speed', atau 'balanced'."""
+    if not results:
+        return []
+    max_ratio = max(r["ratio"] for r in results) or 1
+    tput = lambda r: (r["comp_mbps"] * r["decomp_mbps"]) ** 0.5
+    max_tput = max(tput(r) for r in results) or 1
+    for r in results:
+        if objective == "ratio":
+            r["score"] = r["ratio"] / max_ratio
+        elif objective == "speed":
+            r["score"] = tput(r) / max_tput
+        else:
+            r["score"] = (r["ratio"] / max_ratio) ** 0.6 * (tput(r) / max_tput) ** 0.4
+    return sorted(results, key=lambda r: r["score"], reverse=True)
+
+def advise_zram(corpus: bytes, mode: str = "auto", candidates=None, objective: str = "balanced"):
+    """Benchmark kandidat algoritma pada korpus; kembalikan hasil terurut (terbaik dulu).
+
+    mode 'kernel' memakai device zram sementara (butuh root & modul zram), 'python' memakai
+    codec in-process, 'auto' memilih kernel bila memungkinkan.
+    """
+    kernel_algos = zram_candidate_algorithms()
+    if mode == "auto":
+        mode = "kernel" if kernel_algos and os.geteuid() == 0 and \
+            os.path.exists("/sys/class/zram-control/hot_add") else "python"
+    results = []
+    if mode == "kernel":
+        for algo in candidates or kernel_algos:
+            try:
+                results.append(bench_codec_kernel(algo, corpus))
+            except OSError as e:
+                print(f"⚠ {algo}: benchmark kernel gagal ({e})")
+    else:
+        codecs = python_codecs()
+        # tanpa codec untuk algoritma kernel, tetap benchmark codec yang ada (mis. deflate/zlib)
+        names = candidates or [a for a in kernel_algos if a in codecs] or list(codecs)
+        for algo in names:
+            if algo not in codecs:
+                print(f"ℹ {algo}: tidak ada codec Python, dilewati.")
+                continue
+            results.append(bench_codec_python(algo, *codecs[algo], corpus))
+    return score_zram_results(results, objective)
+
+def print_zram_advice(results):
+    print(f"\n{'Algoritma':<10}{'Mode':<8}{'Rasio':>7}{'Comp MB/s':>11}{'Dec MB/s':>10}"
+          f"{'Comp p99':>10}{'Dec p99':>9}{'Skor':>7}")
+    for r in results:
+        print(f"{r['algorithm']:<10}{r['mode']:<8}{r['ratio']:>7.2f}{r['comp_mbps']:>11.0f}"
+              f"{r['decomp_mbps']:>10.0f}{r['comp_p99_us']:>8.1f}us{r['decomp_p99_us']:>7.1f}us{r['score']:>7.2f}")
+    adv = zram_advice(results)
+    if adv["recommended"]:
+        print(f"\n👉 Rekomendasi: {adv['recommended']}" +
+              (f" (rekompresi: {', '.join(adv['recomp'])})" if adv["recomp"] else ""))
+
+def pick_recomp_algorithms(results, primary):
+    """Algoritma rekompresi: yang rasionya lebih baik dari primer (untuk page huge/idle)."""
+    base = next((r["ratio"] for r in results if r["algorithm"] == primary), 0)
+    better = sorted((r for r in results if r["ratio"] > base * 1.05), key=lambda r: r["ratio"], reverse=True)
+    return [r["algorithm"] for r in better[:1]]
+
+def zram_advice(results):
+    """Ringkasan hasil advisor: {'recommended', 'recomp', 'results'} (recommended None tanpa hasil)."""
+    best = results[0]["algorithm"] if results else None
+    return {"recommended": best, "recomp": pick_recomp_algorithms(results, best) if best else [],
+            "results": results}
+
+def load_zram_corpus(from_swap=None, corpus_file=None, pages: int = 2048):
+    """Korpus advisor: sampel page area swap aktif, file korpus, atau sintetis (default)."""
+    if from_swap:
+        corpus = capture_corpus_from_swap(from_swap, pages)
+    elif corpus_file:
+        corpus = load_corpus(corpus_file)
+    else:
+        corpus = build_synthetic_corpus(pages)
+    if not corpus:
+        raise ValueError("korpus kosong")
+    return corpus
+
+def apply_zram_advice(algorithm, recomp, plan=None):
+    """Tulis ulang zram.service dengan algoritma & rekompresi saran (berlaku saat boot berikutnya)."""
+    svc = read_zram_service()
+    if svc is None:
+        print(f"❌ {ZRAM_SERVICE} tidak ada atau tidak dikenali; buat dulu ZRAM permanen.")
+        return False
+    text = render_zram_service(svc["devices"], svc["bytes_size"], svc["priority"], svc["mem_limit"], algorithm,
+                               recomp, backing_dev=svc["backing_dev"])
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.write_file(ZRAM_SERVICE, text).exec(["systemctl", "daemon-reload"], msg="✅ zram.service diperbarui.")
+    return plan.execute() if own else True
+
+def advise_zram_prompt():
+    print("\n=== Advisor algoritma kompresi ZRAM ===")
+    print("Sumber korpus: 1) sintetis  2) dari area swap aktif  3) file korpus")
+    src = input("Pilih (default 1): ").strip() or "1"
+    try:
+        if src == "2":
+            swaps = [s['name'] for s in system_snapshot().swaps]
+            name = pick_from_list("Pilih area swap:", swaps)
+            if not name:
+                return
+            corpus = capture_corpus_from_swap(name)
+        elif src == "3":
+            corpus = load_corpus(input("Path file korpus: ").strip())
+        else:
+            corpus = build_synthetic_corpus()
+    except OSError as e:
+        print("❌ Gagal membaca korpus:", e)
+        return
+    if not corpus:
+        print("❌ Korpus kosong.")
+        return
+    save = input("Simpan korpus untuk dipakai ulang? (path, kosong = tidak): ").strip()
+    if save:
+        save_corpus(save, corpus)
+
+    mode = input("Mode benchmark (auto/kernel/python, default auto): ").strip() or "auto"
+    objective = input("Tujuan (balanced/ratio/speed, default balanced): ").strip() or "balanced"
+    results = advise_zram(corpus, mode, objective=objective)
+    if not results:
+        print("❌ Tidak ada algoritma yang bisa di-benchmark.")
+        return
+    print_zram_advice(results)
+    adv = zram_advice(results)
+    if read_zram_service() and \
+            input("Terapkan ke zram.service (berlaku saat boot berikutnya)? (y/n): ").strip().lower() == "y":
+        apply_zram_advice(adv["recommended"], adv["recomp"])
+
+
+def create_swapfile(path: str, size_str: str, pri: str = "-1", add_to_fstab: bool = True, plan=None):
+    """Buat swapfile non-interaktif, aktifkan, dan (opsional) tambahkan ke fstab."""
+    size = parse_size_to_bytes(size_str)
+    if not size:
+        print("❌ Ukuran tidak valid untuk swapfile.")
+        return False
+
+    print(f"[Membuat swapfile] {path} = {size_str} ...")
+    own = plan is None
+    plan = Plan() if own else plan
+    # alokasi -> signature -> aktifkan berurutan di lane disk-nya; fstab (persist) jadi barrier di akhir plan
+    with plan.lane(swap_lane(path)):
+        plan.allocate(path, size).chmod(path).mkswap(path).verify_swap(path)
+        plan.swapon(path, pri)
+        if add_to_fstab:
+            fstab_set_swap(plan, path, pri)
+        plan.note(f"✅ Swapfile {path} siap (pri={pri}).")
+    return plan.execute() if own else True
+
+
+def remove_swapfile_by_path(path: str, plan=None):
+    """Non-interactive: swapoff + hapus fstab entry + rm file"""
+    print(f"[Hapus swapfile] {path} ...")
+    own = plan is None
+    plan = Plan() if own else plan
+    with plan.lane(swap_lane(path)):
+        plan.swapoff(path, check=False)
+        fstab_remove(plan, path)
+        plan.unlink(path, msg=f"✅ {path} dihapus.")
+    return plan.execute() if own else True
+
+
+def resize_swapfile_path(path: str, new_size_str: str, plan=None, pri=None, mode="auto"):
+    """Resize swapfile yang spesifik tanpa prompt ulang path (pri=None -> prioritas lama).
+
+    mode: "inplace" (swapoff lalu perpanjang/potong), "staged" (file pengganti aktif dulu, file lama
+    di-drain), "auto" (staged bila file sedang berisi & ruang disk cukup).
+    """
+    if not os.path.exists(path):
+        print("❌ Swapfile tidak ditemukan.")
+        return False
+    size = parse_size_to_bytes(new_size_str)
+    if not size:
+        print("❌ Ukuran tidak valid.")
+        return False
+
+    # simpan prioritas lama (runtime/fstab)
+    old_pri = get_priority_for(path) if pri is None else pri
+    own = plan is None
+    # dalam plan milik pemanggil (reconcile / --check) estimasi drain tidak dicetak
+    staged = choose_resize_mode(path, size, mode, quiet=not own)
+    if staged is None:
+        return False
+    if own:
+        print(f"[Resize] {path} -> {new_size_str}" + (" (bertahap)" if staged else ""))
+    plan = Plan() if own else plan
+    with plan.lane(swap_lane(path)):
+        if staged:
+            if staged_swapfile_ops(plan, path, size, old_pri) is None:
+                return False
+            return plan.execute() if own else True
+        plan.swapoff(path, check=False, progress=True)
+        # perpanjang/potong file yang ada, tidak ditulis ulang dari nol
+        plan.allocate(path, size, grow=True).add("check_extents", path=path, check=False)
+        plan.chmod(path).mkswap(path, keep_ids=True).verify_swap(path)
+        plan.swapon(path, old_pri, msg="✅ Resize selesai & swapfile aktif kembali.")
+        fstab_set_swap(plan, path, old_pri, msg="✅ /etc/fstab diperbarui.")
+    return plan.execute() if own else True
+
+
+
+
+# -------------------- Staged resize (drain) --------------------
+# perkiraan kasar laju swap-in saat swapoff (page dibaca acak, bukan sekuensial)
+DRAIN_RATE_MIB_S = {"zram": 1024, "ssd": 200, "hdd": 15}
+DRAIN_RESERVE = 256 * 1024 * 1024  # RAM yang harus tetap bebas selama drain
+
+def swap_backing_kind(name: str):
+    """'zram', 'ssd', atau 'hdd' dari queue/rotational device di bawah area swap."""
+    if "zram" in name:
+        return "zram"
+    import stat as _stat
+    try:
+        st = os.stat(name)
+    except OSError:
+        return "ssd"
+    if _stat.S_ISBLK(st.st_mode):
+        majmin = f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+    else:
+        m = mount_for_path(name)
+        majmin = m["majmin"] if m else None
+    if not majmin:
+        return "ssd"
+    sysdir = os.path.realpath(f"/sys/dev/block/{majmin}")
+    if not os.path.exists(f"{sysdir}/queue"):
+        sysdir = os.path.dirname(sysdir)  # partisi: atribut queue ada di disk induk
+    return "hdd" if _read_sysfs(f"{sysdir}/queue/rotational") == "1" else "ssd"
+
+def estimate_drain(name: str, extra_swap_free: int = 0):
+    """Perkiraan biaya swapoff: byte yang harus kembali ke RAM vs MemAvailable & laju baca device.
+
+    extra_swap_free: kapasitas swap pengganti yang sudah aktif (staged) untuk menampung page yang
+    terdesak keluar lagi selama drain.
+    """
+    s = system_snapshot().get(name)
+    used = s["used_kib"] * 1024 if s else 0
+    try:
+        with open("/proc/meminfo") as f:
+            mem = parse_meminfo(f.read(), ("MemAvailable",)).get("MemAvailable", 0) * 1024
+    except OSError:
+        mem = 0
+    kind = swap_backing_kind(name)
+    rate = DRAIN_RATE_MIB_S[kind] * 1024 * 1024
+    return {
+        "name": name,
+        "used": used,
+        "mem_available": mem,
+        "kind": kind,
+        "seconds": used / rate,
+        "fits_ram": used <= mem - DRAIN_RESERVE,
+        "fits": used <= mem - DRAIN_RESERVE + extra_swap_free,
+    }
+
+def print_drain_estimate(est):
+    print(f"[Drain] {est['name']}: {_fmt_mib(est['used'])} harus kembali ke RAM "
+          f"(MemAvailable {_fmt_mib(est['mem_available'])}), backing {est['kind']}, "
+          f"perkiraan ~{est['seconds']:.0f}s")
+
+def choose_resize_mode(name: str, new_size: int, mode: str = "auto", quiet: bool = False):
+    """True = staged, False = in-place, None = ditolak (drain tidak muat di RAM).
+
+    quiet: jangan cetak pilihan mode & estimasi drain (hanya penolakan yang dilaporkan).
+    """
+    live = system_snapshot().get(name)
+    if live is None or (live["used_kib"] == 0 and mode != "staged"):
+        return False  # tidak ada yang perlu di-drain
+    if mode == "auto" and "zram" not in name:
+        d = os.path.dirname(os.path.abspath(name))
+        if shutil.disk_usage(d).free < new_size + ALLOC_CHUNK:
+            if not quiet:
+                print(f"ℹ Ruang disk di {d} tidak cukup untuk file pengganti; resize di tempat.")
+            mode = "inplace"
+    staged = mode != "inplace"
+    est = estimate_drain(name, new_size if staged else 0)
+    if not quiet:
+        print_drain_estimate(est)
+    if not est["fits"]:
+        print("❌ Drain tidak muat di RAM" + (" walau dengan area pengganti" if staged else
+                                              "; gunakan mode staged") + ". Resize dibatalkan.")
+        return None
+    return staged
+
+def swapoff_with_progress(path: str, interval: float = 0.5):
+    """swapoff(2) di thread terpisah sambil menampilkan sisa page dari /proc/swaps."""
+    def used_kib():
+        with open("/proc/swaps") as f:
+            for s in parse_proc_swaps(f.read()):
+                if s["name"] == path:
+                    return s["used_kib"]
+        return 0
+
+    total = used_kib()
+    err = []
+
+    def worker():
+        try:
+            sys_swapoff(path)
+        except OSError as e:
+            err.append(e)
+
+    t = threading.Thread(target=worker, daemon=True)
+    t0 = time.monotonic()
+    t.start()
+    tty = sys.stdout.isatty()
+    while t.is_alive():
+        t.join(interval)
+        if total and t.is_alive():
+            left = used_kib()
+            done = total - left
+            rate = done / 1024 / max(time.monotonic() - t0, 1e-3)
+            eta = f"{left / 1024 / rate:.0f}s" if rate > 0 else "?"
+            print(f"[Drain] {path}: {done // 1024}/{total // 1024} MiB ({done * 100 // total}%), "
+                  f"{rate:.0f} MiB/s, ETA {eta}", end="\r" if tty else "\n", flush=True)
+    if total:
+        print(f"[Drain] {path}: {total // 1024} MiB selesai dalam {time.monotonic() - t0:.1f}s" + " " * 20)
+    if err:
+        raise err[0]
+
+def resolve_swapfile(path: str):
+    """Path aktif untuk swapfile: setelah staged resize file bisa hidup di nama pasangannya."""
+    alt = alternate_swap_path(path)
+    if not os.path.exists(path) and os.path.exists(alt):
+        return alt
+    return path
+
+def staged_swapfile_ops(plan, path: str, size: int, pri):
+    """Resize tanpa downtime: file pengganti (nama pasangan) aktif di prioritas sama, lalu yang lama di-drain.
+
+    Kernel menolak rename/unlink swapfile aktif, jadi file baru tetap di nama pasangan dan entri
+    fstab dipindah ke sana.
+    """
+    new_path = alternate_swap_path(path)
+    if os.path.exists(new_path):
+        print(f"❌ {new_path} sudah ada; bereskan dulu sebelum staged resize.")
+        return None
+    plan.allocate(new_path, size).add("check_extents", path=new_path, check=False)
+    plan.chmod(new_path).mkswap(new_path, ids_from=path).verify_swap(new_path)
+    plan.swapon(new_path, pri)
+    plan.swapoff(path, progress=True)
+    plan.unlink(path)
+    if _fstab_has(path):
+        # area baru mewarisi UUID/LABEL, jadi entri UUID=/LABEL= tetap valid & dipakai set_swap(new_path);
+        # yang dihapus hanya entri berdasarkan path lama
+        fstab_remove(plan, path, resolve_ids=False)
+        fstab_set_swap(plan, new_path, pri, msg="✅ /etc/fstab diperbarui.")
+    plan.note(f"✅ Resize bertahap selesai: {path} digantikan {new_path}.")
+    return new_path
+
+
+# -------------------- Placement advisor (topologi storage) --------------------
+# prioritas per kelas: zram di atas semua disk, lalu NVMe > SSD > HDD; kelas sama = prioritas sama (striping)
+PLACEMENT_TIERS = {"zram": 100, "nvme": 50, "ssd": 30, "hdd": 10}
+SWAPFILE_FS = {"ext2", "ext3", "ext4", "xfs", "btrfs", "f2fs"}
+NETWORK_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "ceph", "glusterfs", "fuse.sshfs", "9p", "virtiofs", "afs"}
+LATENCY_CRITICAL_PATHS = ("/var/lib/mysql", "/var/lib/postgresql", "/var/lib/pgsql", "/var/lib/mongodb",
+                          "/var/lib/redis", "/var/lib/etcd", "/var/lib/kafka", "/var/lib/cassandra",
+                          "/var/lib/elasticsearch", "/var/lib/clickhouse")
+
+def _path_majmin(path: str):
+    """major:minor block device di bawah path (node block device, atau filesystem yang memuatnya)."""
+    import stat as _stat
+    try:
+        st = os.stat(path)
+    except OSError:
+        st = None
+    if st is not None and _stat.S_ISBLK(st.st_mode):
+        return f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+    m = mount_for_path(path)
+    return m["majmin"] if m else None
+
+def physical_disks(majmin: str, depth: int = 0):
+    """Disk fisik (nama kernel) di bawah major:minor: partisi -> disk induk, dm/md -> slaves,
+    loop -> disk di bawah backing_file. Set kosong bila bukan block device (tmpfs, nfs, ...)."""
+    sysdir = os.path.realpath(f"/sys/dev/block/{majmin}")
+    if not os.path.isdir(sysdir) or depth > 8:
+        return set()
+    if os.path.exists(f"{sysdir}/partition"):
+        sysdir = os.path.dirname(sysdir)
+    name = os.path.basename(sysdir)
+    try:
+        slaves = os.listdir(f"{sysdir}/slaves")
+    except OSError:
+        slaves = []
+    if slaves:
+        out = set()
+        for s in slaves:
+            mm = _read_sysfs(f"/sys/class/block/{s}/dev")
+            out |= physical_disks(mm, depth + 1) if mm else set()
+        return out
+    backing = _read_sysfs(f"{sysdir}/loop/backing_file") if name.startswith("loop") else None
+    if backing:
+        mm = _path_majmin(backing)
+        return physical_disks(mm, depth + 1) if mm else set()
+    return {name}
+
+def disk_class(disk: str):
+    """Kelas disk fisik: zram, nvme, ssd atau hdd (queue/rotational)."""
+    if disk.startswith("zram"):
+        return "zram"
+    if disk.startswith("nvme"):
+        return "nvme"
+    return "hdd" if _read_sysfs(f"/sys/block/{disk}/queue/rotational") == "1" else "ssd"
+
+def placement_record(path: str, critical=None, current=None):
+    """Analisis satu kandidat/area swap -> dict {path, disks, class, fstype, nr_requests, issues, ...}."""
+    import stat as _stat
+    real = os.path.realpath(path)
+    try:
+        is_dev = _stat.S_ISBLK(os.stat(real).st_mode)
+    except OSError:
+        is_dev = False
+    rec = {"path": path, "active": current is not None, "current": current, "kind": "partition" if is_dev else "file",
+           "disks": [], "class": None, "fstype": None, "mountpoint": None, "nr_requests": None, "issues": []}
+    if os.path.basename(real).startswith("zram"):
+        rec.update(kind="zram", disks=[os.path.basename(real)], **{"class": "zram"})
+        return rec
+    if not is_dev:
+        m = mount_for_path(real)
+        if m:
+            rec["fstype"], rec["mountpoint"] = m["fstype"], m["mountpoint"]
+            if m["fstype"] in NETWORK_FS or m["fstype"].startswith("fuse"):
+                rec["issues"].append(f"filesystem jaringan/FUSE ({m['fstype']}): swap di sini bisa deadlock saat reclaim")
+            elif m["fstype"] not in SWAPFILE_FS:
+                rec["issues"].append(f"{m['fstype']} tidak bisa menampung swapfile")
+            if "ro" in m["options"].split(","):
+                rec["issues"].append(f"{m['mountpoint']} di-mount read-only")
+    majmin = _path_majmin(real)
+    if is_dev and current is None:
+        try:
+            with open("/proc/self/mountinfo") as f:
+                mounted = [m["mountpoint"] for m in parse_mountinfo(f.read()) if m["majmin"] == majmin]
+        except OSError:
+            mounted = []
+        if mounted:
+            rec["issues"].append(f"device berisi filesystem ter-mount ({', '.join(mounted)})")
+    disks = sorted(physical_disks(majmin)) if majmin else []
+    rec["disks"] = disks
+    if not disks:
+        if not rec["issues"]:
+            rec["issues"].append("tidak berada di block device")
+        return rec
+    classes = {disk_class(d) for d in disks}
+    # volume yang menyebar ke beberapa kelas (mis. LVM SSD+HDD) dinilai dari kelas terlambat
+    rec["class"] = min(classes, key=lambda c: PLACEMENT_TIERS[c])
+    nr = [int(v) for v in (_read_sysfs(f"/sys/block/{d}/queue/nr_requests") for d in disks) if v and v.isdigit()]
+    rec["nr_requests"] = min(nr) if nr else None
+    for cpath, cdisks in (critical or {}).items():
+        shared = sorted(set(disks) & cdisks)
+        if shared:
+            rec["issues"].append(f"satu disk dengan mount latency-critical {cpath} ({', '.join(shared)})")
+    return rec
+
+def critical_mount_disks(paths=LATENCY_CRITICAL_PATHS):
+    """{path: set disk fisik} untuk path latency-critical yang ada di host ini."""
+    out = {}
+    for p in paths:
+        if os.path.exists(p):
+            mm = _path_majmin(p)
+            disks = physical_disks(mm) if mm else set()
+            if disks:
+                out[p] = disks
+    return out
+
+def advise_placement(paths=(), critical_paths=None, include_active: bool = True):
+    """Rekomendasi prioritas bertingkat untuk area swap aktif + kandidat path.
+
+    Tiap kelas (zram > nvme > ssd > hdd) mendapat satu prioritas; area di disk fisik yang
+    independen dalam kelas sama diberi prioritas sama agar kernel men-stripe (round-robin).
+    Area kedua di disk yang sama tidak menambah bandwidth -> diturunkan satu tingkat dan ditandai.
+    """
+    critical = critical_mount_disks(tuple(critical_paths) if critical_paths else LATENCY_CRITICAL_PATHS)
+    active = {s["name"]: s["prio"] for s in get_swaps_from_proc()} if include_active else {}
+    recs = [placement_record(p, critical, pri) for p, pri in active.items()]
+    seen = {os.path.realpath(p) for p in active}
+    recs += [placement_record(p, critical, None) for p in paths if os.path.realpath(p) not in seen]
+    used_disks = {}
+    for rec in sorted(recs, key=lambda r: (not r["active"], r["path"])):
+        if rec["class"] is None:
+            rec["priority"] = None
+            continue
+        pri = PLACEMENT_TIERS[rec["class"]]
+        if rec["class"] != "zram":
+            dup = next((used_disks[d] for d in rec["disks"] if d in used_disks), None)
+            if dup:
+                rec["issues"].append(f"disk yang sama dengan {dup}: tidak menambah bandwidth, gabungkan saja")
+                pri -= 1
+            for d in rec["disks"]:
+                used_disks.setdefault(d, rec["path"])
+        rec["priority"] = pri
+    return {"areas": recs, "critical": {p: sorted(d) for p, d in critical.items()}}
+
+def print_placement(rep):
+    if rep["critical"]:
+        print("Mount latency-critical: " + ", ".join(f"{p} ({', '.join(d)})" for p, d in rep["critical"].items()))
+    print(f"{'area':28} {'kelas':6} {'disk':14} {'fs':6} {'nr_req':>6} {'pri kini':>8} {'saran':>6}")
+    for r in rep["areas"]:
+        cur = "" if r["current"] is None else r["current"]
+        pri = "-" if r["priority"] is None else r["priority"]
+        print(f"{r['path']:28} {r['class'] or '-':6} {','.join(r['disks']) or '-':14} {r['fstype'] or '-':6} "
+              f"{r['nr_requests'] or '':>6} {cur:>8} {pri:>6}")
+        for issue in r["issues"]:
+            print(f"   ⚠ {issue}")
+    pris = [r["priority"] for r in rep["areas"] if r["class"] not in (None, "zram")]
+    if any(pris.count(p) > 1 for p in set(pris)):
+        print("ℹ Prioritas sama dalam satu kelas = kernel men-stripe page swap round-robin antar area.")
+
+def apply_placement(rep, plan=None):
+    """Terapkan prioritas saran ke area aktif yang berbeda (swapoff + swapon, di lane disk masing-masing)."""
+    own = plan is None
+    plan = Plan() if own else plan
+    # swapfile dynamic swap sengaja tidak masuk fstab; set_priority akan menambahkannya
+    changed = [r for r in rep["areas"] if r["active"] and r["priority"] is not None and r["priority"] != r["current"]
+               and not is_dynamic_swapfile(r["path"])]
+    for r in changed:
+        with plan.lane(swap_lane(r["path"])):
+            set_priority(r["path"], r["priority"], plan=plan)
+    if not changed:
+        print("✅ Prioritas area aktif sudah sesuai saran.")
+    return plan.execute() if own else True
+
+
+# -------------------- zswap backend --------------------
+ZSWAP_PARAMS_DIR = "/sys/module/zswap/parameters"
+ZSWAP_DEBUGFS = "/sys/kernel/debug/zswap"
+# urutan tulis: compressor/zpool dulu supaya pool pertama langsung memakai setelan baru, enabled terakhir
+ZSWAP_PARAMS = ("compressor", "zpool", "max_pool_percent", "accept_threshold_percent", "shrinker_enabled",
+                "enabled")
+GRUB_DEFAULT = "/etc/default/grub"
+KERNEL_CMDLINE = "/etc/kernel/cmdline"
+DOUBLE_COMPRESSION_WARNING = ("⚠ zswap aktif bersama swap zram: page dikompres zswap lalu dikompres lagi oleh "
+                              "zram saat writeback (CPU dobel, rasio hampir tidak bertambah). Pilih salah satu: "
+                              "zram saja, atau zswap di depan swapfile/partisi disk.")
+
+def zswap_supported():
+    return os.path.isdir(ZSWAP_PARAMS_DIR)
+
+def zswap_params():
+    """Parameter zswap saat ini -> {nama: nilai}; parameter yang tidak ada di kernel ini tidak muncul."""
+    out = {}
+    for name in ZSWAP_PARAMS:
+        v = _read_sysfs(f"{ZSWAP_PARAMS_DIR}/{name}")
+        if v is not None:
+            out[name] = v
+    return out
+
+def zswap_enabled():
+    return zswap_params().get("enabled") in ("Y", "1")
+
+def crypto_algorithms():
+    """Nama algoritma terdaftar di /proc/crypto (algoritma modul yang belum dimuat tidak ikut)."""
+    names = set()
+    for line in (_read_sysfs("/proc/crypto") or "").splitlines():
+        k, _, v = line.partition(":")
+        if k.strip() == "name":
+            names.add(v.strip())
+    return names
+
+def zswap_stats():
+    """Statistik zswap: debugfs (pool & reject) bila ter-mount, plus Zswap/Zswapped dari meminfo."""
+    stats = {"debugfs": os.path.isdir(ZSWAP_DEBUGFS)}
+    if stats["debugfs"]:
+        for name in sorted(os.listdir(ZSWAP_DEBUGFS)):
+            v = _read_sysfs(f"{ZSWAP_DEBUGFS}/{name}")
+            if v is not None and v.lstrip("-").isdigit():
+                stats[name] = int(v)
+    mem = parse_meminfo(_read_sysfs("/proc/meminfo") or "", ("Zswap", "Zswapped"))
+    if mem:
+        stats["pool_kib"], stats["stored_kib"] = mem.get("Zswap", 0), mem.get("Zswapped", 0)
+    pool = stats.get("pool_total_size") or stats.get("pool_kib", 0) * 1024
+    stored = stats.get("stored_pages", 0) * PAGE_SIZE or stats.get("stored_kib", 0) * 1024
+    stats["ratio"] = round(stored / pool, 2) if pool else None
+    stats["rejects"] = {k[len("reject_"):]: v for k, v in stats.items() if k.startswith("reject_")}
+    return stats
+
+def zswap_zram_conflict(snap=None, enabling: bool = False):
+    """True bila zswap aktif (atau akan diaktifkan) bersamaan dengan swap zram -> kompresi ganda."""
+    zram = (snap or system_snapshot()).classify()["zram"]
+    return bool(zram) and (enabling or zswap_enabled())
+
+def show_zswap_status():
+    if not zswap_supported():
+        print("ℹ Kernel tanpa zswap (CONFIG_ZSWAP).")
+        return
+    params = zswap_params()
+    print("\n=== zswap ===")
+    for k, v in params.items():
+        print(f"{k:26} {v}")
+    st = zswap_stats()
+    if st.get("pool_kib") is not None:
+        print(f"{'pool (RAM)':26} {_fmt_mib(st['pool_kib'] * 1024)}")
+        print(f"{'data tersimpan':26} {_fmt_mib(st['stored_kib'] * 1024)}"
+              + (f" (rasio {st['ratio']}x)" if st["ratio"] else ""))
+    if st["debugfs"]:
+        for k in ("pool_limit_hit", "written_back_pages", "same_filled_pages"):
+            if k in st:
+                print(f"{k:26} {st[k]}")
+        for k, v in st["rejects"].items():
+            print(f"{'reject ' + k:26} {v}")
+    else:
+        print("ℹ debugfs belum ter-mount (mount -t debugfs none /sys/kernel/debug) — statistik reject tidak tersedia.")
+    if zswap_zram_conflict():
+        print(DOUBLE_COMPRESSION_WARNING)
+
+def edit_cmdline_args(cmdline: str, args: dict):
+    """Ganti semua token zswap.* di cmdline dengan args {param: nilai}."""
+    tokens = [t for t in cmdline.split() if not t.startswith("zswap.")]
+    return " ".join(tokens + [f"zswap.{k}={v}" for k, v in args.items()])
+
+def zswap_cmdline_ops(args: dict, plan):
+    """Persist parameter zswap di kernel cmdline (grubby, /etc/default/grub, atau /etc/kernel/cmdline).
+
+    zswap selalu built-in (CONFIG_ZSWAP bool), jadi opsi modprobe.d tidak pernah dibaca; cmdline berlaku
+    mulai boot berikutnya. Kembalikan nama metode, atau None bila tidak ada bootloader yang dikenali.
+    """
+    grubby = find_cmd("grubby")
+    if grubby:
+        plan.exec([grubby, "--update-kernel=ALL", "--remove-args=" + " ".join(f"zswap.{p}" for p in ZSWAP_PARAMS)])
+        plan.exec([grubby, "--update-kernel=ALL", "--args=" + edit_cmdline_args("", args)],
+                  msg="✅ Parameter zswap dipersist via grubby (aktif setelah reboot).")
+        return "grubby"
+    grub = _read_sysfs(GRUB_DEFAULT)
+    if grub is not None:
+        key = "GRUB_CMDLINE_LINUX_DEFAULT"
+        m = re.search(rf'^{key}=(["\']?)(.*?)\1$', grub, re.M)
+        line = f'{key}="{edit_cmdline_args(m.group(2) if m else "", args)}"'
+        grub = grub[:m.start()] + line + grub[m.end():] if m else grub.rstrip("\n") + "\n" + line
+        plan.write_file(GRUB_DEFAULT, grub + "\n", backup=True)
+        mk = find_cmd("update-grub") or find_cmd("grub2-mkconfig") or find_cmd("grub-mkconfig")
+        if mk:
+            argv = [mk] if mk.endswith("update-grub") else \
+                [mk, "-o", "/boot/grub2/grub.cfg" if "grub2" in mk else "/boot/grub/grub.cfg"]
+            plan.exec(argv, msg="✅ Parameter zswap dipersist di GRUB (aktif setelah reboot).")
+        else:
+            plan.note(f"⚠ {GRUB_DEFAULT} diperbarui; jalankan generator konfigurasi GRUB secara manual.")
+        return "grub"
+    cmdline = _read_sysfs(KERNEL_CMDLINE)
+    if cmdline is not None:
+        plan.write_file(KERNEL_CMDLINE, edit_cmdline_args(cmdline, args) + "\n", backup=True,
+                        msg=f"✅ Parameter zswap dipersist di {KERNEL_CMDLINE} (aktif setelah image boot "
+                            "dibuat ulang, mis. kernel-install / reboot).")
+        return "kernel-cmdline"
+    return None
+
+def configure_zswap(enabled: bool = True, compressor=None, zpool=None, max_pool_percent=None,
+                    accept_threshold_percent=None, persist: bool = True, plan=None):
+    """Atur parameter zswap runtime via /sys/module/zswap/parameters dan (opsional) persist ke cmdline."""
+    if not zswap_supported():
+        print("❌ Kernel tidak mendukung zswap.")
+        return False
+    have = zswap_params()
+    want = {"compressor": compressor, "zpool": zpool, "max_pool_percent": max_pool_percent,
+            "accept_threshold_percent": accept_threshold_percent, "enabled": "Y" if enabled else "N"}
+    want = {k: str(v) for k, v in want.items() if v is not None}
+    for k in ("max_pool_percent", "accept_threshold_percent"):
+        if k in want and not (want[k].isdigit() and 0 <= int(want[k]) <= 100):
+            print(f"❌ {k} harus 0-100.")
+            return False
+    for k in [k for k in want if k not in have]:
+        print(f"⚠ Parameter zswap '{k}' tidak ada di kernel ini, dilewati.")
+        del want[k]
+    if compressor and compressor not in crypto_algorithms():
+        print(f"⚠ Compressor '{compressor}' belum terdaftar di /proc/crypto; kernel akan mencoba memuatnya.")
+    if enabled and zswap_zram_conflict(enabling=True):
+        print(DOUBLE_COMPRESSION_WARNING)
+    own = plan is None
+    plan = Plan() if own else plan
+    for k in ZSWAP_PARAMS:
+        if k in want and want[k] != have.get(k):
+            plan.write_sysfs(f"{ZSWAP_PARAMS_DIR}/{k}", want[k])
+    plan.note(f"✅ zswap {'aktif' if enabled else 'nonaktif'} ({', '.join(f'{k}={v}' for k, v in want.items())})")
+    if persist:
+        # cmdline menggantikan semua token zswap.*: persist set efektif (runtime ditimpa want) supaya
+        # parameter yang tidak disebut di pemanggilan ini tidak hilang saat reboot; boolean ditulis 1/0
+        merged = {k: want.get(k, have.get(k)) for k in ZSWAP_PARAMS if k in want or k in have}
+        args = {k: {"Y": "1", "N": "0"}.get(v, v) for k, v in merged.items()}
+        if zswap_cmdline_ops(args, plan) is None:
+            print("⚠ Bootloader tidak dikenali (grubby / /etc/default/grub / /etc/kernel/cmdline); "
+                  "setelan zswap hanya berlaku sampai reboot.")
+    return plan.execute() if own else True
+
+def zswap_prompt():
+    """Menu zswap: status lalu aktifkan/ubah atau nonaktifkan."""
+    show_zswap_status()
+    if not zswap_supported():
+        return
+    sel = input("\n(1) aktifkan/ubah, (2) nonaktifkan, kosong = kembali: ").strip()
+    if sel == "2":
+        configure_zswap(False)
+    elif sel == "1":
+        comp = input("Compressor (mis. zstd, lz4, lzo; kosong = tetap): ").strip() or None
+        pool = input("max_pool_percent (default tetap): ").strip() or None
+        accept = input("accept_threshold_percent (default tetap): ").strip() or None
+        configure_zswap(True, comp, None, pool, accept)
+
+
+# -------------------- Setup Hybrid (zram + swapfile) --------------------
+def setup_hybrid():
+    print("\n=== Setup Hybrid (ZRAM + Swapfile) — dengan pre-check anti double ===")
+
+    existing = classify_existing_swaps()
+    plan = Plan()
+    has_zr = bool(existing['zram'])
+    has_sf = bool(existing['files'])
+    choice = None
+
+    if has_zr or has_sf:
+        print("\nDitemukan swap aktif:")
+        if has_zr:
+            print(f"- ZRAM : {', '.join(existing['zram'])}")
+        if has_sf:
+            print(f"- Files: {', '.join(existing['files'])}")
+
+        print("\nApa yang ingin kamu lakukan?")
+        print("1) Buat baru (double) — tetap pertahankan yang lama")
+        print("2) Hapus yang lama, lalu buat baru")
+        print("3) Edit/Resize yang ada")
+        print("4) Batal")
+        choice = input("Pilih: ").strip()
+
+        if choice == "4":
+            return
+
+        if choice == "3":
+            # Pilih apa yang ingin di-resize
+            opts = []
+            if has_zr: opts.append("zram")
+            if has_sf: opts.append("swapfile")
+            print("\nPilih target resize:")
+            for i, o in enumerate(opts, 1):
+                print(f"{i}) {o}")
+            print("0) Batal")
+            sel = input("Pilih: ").strip()
+            if sel == "0":
+                return
+            if not sel.isdigit() or not (1 <= int(sel) <= len(opts)):
+                print("❌ Pilihan tidak valid.")
+                return
+            target = opts[int(sel) - 1]
+
+            if target == "zram":
+                dev = pick_from_list("Pilih device ZRAM:", existing['zram'])
+                if dev:
+                    resize_zram(dev)
+            else:
+                path = pick_from_list("Pilih swapfile:", existing['files'])
+                if path:
+                    new_size = input(f"Ukuran baru untuk {path} (mis. 12G): ").strip()
+                    resize_swapfile_path(path, new_size)
+            return
+
+        if choice == "2":
+            # dibersihkan dalam plan yang sama dengan pembuatan hybrid baru
+            clear_existing_swaps(existing, plan)
+
+    # Jika tidak ada swap atau user memilih buat baru / sudah dihapus, lanjut pembuatan hybrid
+    print("\n== Konfigurasi Hybrid ==")
+    backend = "zram"
+    if zswap_supported():
+        b = input("Tier kompresi di depan swapfile: (1) zram, (2) zswap [1]: ").strip()
+        backend = "zswap" if b == "2" else "zram"
+    zswap_opts = {}
+    if backend == "zswap":
+        zr_size = ""
+        zswap_opts["compressor"] = input("Compressor zswap (mis. zstd, lz4; kosong=default): ").strip() or None
+        zswap_opts["max_pool_percent"] = input("max_pool_percent (default 20): ").strip() or "20"
+        if existing["zram"] and choice != "2":
+            print(DOUBLE_COMPRESSION_WARNING)
+    else:
+        zr_size = input("Ukuran ZRAM (mis. 2G, kosong=skip ZRAM): ").strip()
+        if zr_size and zswap_enabled():
+            print(DOUBLE_COMPRESSION_WARNING)
+            if input("Nonaktifkan zswap sekalian? (y/n): ").strip().lower() == "y":
+                configure_zswap(False, plan=plan)
+    sf_path_default = "/swapfile2" if os.path.exists("/swapfile") else "/swapfile"
+    sf_path = (input(f"Path swapfile (default: {sf_path_default}): ").strip() or sf_path_default)
+    sf_size = input("Ukuran swapfile (mis. 8G): ").strip()
+    zr_algo = input("Algoritma ZRAM (mis. zstd, lz4; kosong=default kernel): ").strip() if zr_size else ""
+    zr_topo = (input("Topologi ZRAM (single/cpu/numa/jumlah device, default single): ").strip() or "single") \
+        if zr_size else "single"
+    zr_backing = input("Backing device writeback ZRAM (partisi /dev/... atau file; kosong=tanpa): ").strip() \
+        if zr_size else ""
+    pri_zr = input("Prioritas ZRAM (default 100): ").strip() or "100"
+    pri_sf = input("Prioritas swapfile (default -1): ").strip() or "-1"
+
+    create_hybrid(zr_size, sf_path, sf_size, pri_zr, pri_sf, zr_algo or None, plan=plan, topology=zr_topo,
+                  backing_dev=zr_backing or None, backend=backend, zswap_opts=zswap_opts)
+
+
+def clear_existing_swaps(existing, plan):
+    """Tambahkan op pembersihan semua zram & swapfile aktif ke plan.
+
+    zram dilepas di lane "zram" (modul dilepas sekali setelah semua device), swapfile di lane
+    disk masing-masing, jadi area di disk berbeda di-drain paralel (dibatasi SWAPOFF_PARALLEL).
+    """
+    if existing['zram']:
+        remove_zram_permanent(plan)
+    for path in existing['files']:
+        remove_swapfile_by_path(path, plan=plan)
+    plan.note("✅ Swap/ZRAM lama dibersihkan.")
+    return plan
+
+
+def create_hybrid(zr_size, sf_path, sf_size, pri_zr="100", pri_sf="-1", algorithm=None, plan=None,
+                  topology="single", backing_dev=None, backend="zram", zswap_opts=None):
+    """Buat tier kompresi (ZRAM permanen, atau zswap bila backend='zswap') + swapfile dalam satu plan."""
+    # satu plan: ZRAM/zswap + swapfile dieksekusi sekaligus oleh satu helper
+    plan = Plan() if plan is None else plan
+    if backend == "zswap":
+        with plan.lane("zswap"):
+            if not configure_zswap(True, plan=plan, **(zswap_opts or {})):
+                return False
+    elif zr_size:
+        # create permanent zram service
+        if not create_zram_permanent(zr_size, pri_zr, algorithm=algorithm, plan=plan, topology=topology,
+                                     backing_dev=backing_dev):
+            return False
+    else:
+        print("ℹ Lewatkan ZRAM.")
+
+    # buat swapfile (wajib untuk hybrid)
+    if not create_swapfile(sf_path, sf_size, pri_sf, add_to_fstab=True, plan=plan) or not plan.execute():
+        print("❌ Gagal membuat swapfile. Batalkan.")
+        return False
+
+    tier = "zswap" if backend == "zswap" else "ZRAM (jika dibuat)"
+    print(f"\n✨ Hybrid selesai. {tier} dan swapfile sudah aktif dan persist sesuai konfigurasi.")
+    return True
+
+
+# -------------------- Swappiness --------------------
+SWAPPINESS_CONF = "/etc/sysctl.d/99-swap-tuning.conf"
+
+def swappiness_max():
+    """Batas atas vm.swappiness: 200 sejak kernel 5.8, sebelumnya 100."""
+    m = re.match(r"(\d+)\.(\d+)", os.uname().release)
+    return 200 if m and (int(m.group(1)), int(m.group(2))) >= (5, 8) else 100
+
+def read_sysctl_conf(path=None):
+    """Parse file sysctl.d -> {kunci: nilai} (urutan file dipertahankan, komentar dibuang)."""
+    out = {}
+    for line in (_read_sysfs(path or SWAPPINESS_CONF) or "").splitlines():
+        line = line.strip()
+        if line and not line.startswith(("#", ";")) and "=" in line:
+            k, _, v = line.partition("=")
+            out[k.strip().replace("/", ".")] = v.strip()
+    return out
+
+def render_sysctl_conf(values, source=None):
+    head = "# dikelola oleh swap_manager" + (f" ({source})" if source else "")
+    return head + "\n" + "".join(f"{k}={v}\n" for k, v in values.items())
+
+def set_swappiness(percent, plan=None):
+    """Set vm.swappiness secara runtime dan permanent (kunci lain di file sysctl.d dipertahankan)."""
+    try:
+        percent = int(percent)
+    except ValueError:
+        print("❌ Masukkan angka valid.")
+        return False
+    if not (0 <= percent <= swappiness_max()):
+        print(f"❌ Nilai swappiness harus antara 0 dan {swappiness_max()}.")
+        return False
+    conf = read_sysctl_conf()
+    conf["vm.swappiness"] = str(percent)
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.write_sysfs("/proc/sys/vm/swappiness", percent)
+    plan.write_file(SWAPPINESS_CONF, render_sysctl_conf(conf), mode=0o644,
+                    msg=f"✅ vm.swappiness={percent} (runtime + {SWAPPINESS_CONF})")
+    return plan.execute() if own else True
+
+SWAPPINESS_HELP = """vm.swappiness (0-100, kernel >= 5.8: 0-200) BUKAN ambang "pakai swap setelah RAM terpakai X%".
+Nilai ini adalah bobot relatif biaya reclaim page anon (di-swap) terhadap page cache (dibuang):
+rendah = lebih suka membuang page cache, 100 = keduanya setara, tinggi = lebih rela swap-out."""
+
+def setup_swappiness_prompt():
+    """Prompt user untuk set swappiness statis atau controller adaptif."""
+    print(SWAPPINESS_HELP)
+    cur = _read_sysfs("/proc/sys/vm/swappiness")
+    mode = input(f"Nilai sekarang {cur}. (1) set statis, (2) controller adaptif PSI/refault [1]: ").strip()
+    if mode == "2":
+        swappiness_controller_prompt()
+        return
+    value = input(f"vm.swappiness baru (0-{swappiness_max()}, default=60): ").strip()
+    set_swappiness(value or "60")
+
+def menu_change_swappiness():
+    """Menu ubah swappiness."""
+    print("\n=== Ubah vm.swappiness ===")
+    print(SWAPPINESS_HELP)
+    set_swappiness(input(f"Masukkan nilai baru (0-{swappiness_max()}): ").strip())
+
+
+
+# -------------------- Profil tuning sysctl VM --------------------
+SYSCTL_STATE = "/var/lib/swapi/sysctl-rollback.json"
+# nilai "N%" untuk min_free_kbytes = persen MemTotal, dibatasi MIN_FREE_BOUNDS (KiB)
+MIN_FREE_BOUNDS = (16384, 524288)
+SYSCTL_PROFILES = {
+    "zram-only": {
+        "desc": "hanya zram: tanpa readahead swap, swap-out murah -> swappiness tinggi",
+        "swappiness": 180, "page-cluster": 0, "watermark_scale_factor": 125,
+        "vfs_cache_pressure": 100, "min_free_kbytes": "1%",
+    },
+    "hybrid": {
+        "desc": "zram di depan disk: swap-in dominan dari zram, readahead tetap mati",
+        "swappiness": 120, "page-cluster": 0, "watermark_scale_factor": 100,
+        "vfs_cache_pressure": 100, "min_free_kbytes": "1%",
+    },
+    "ssd-swap": {
+        "desc": "swap di SSD/NVMe: baca acak murah, readahead kecil",
+        "swappiness": 80, "page-cluster": 1, "watermark_scale_factor": 50,
+        "vfs_cache_pressure": 100, "min_free_kbytes": "0.5%",
+    },
+    "hdd-swap": {
+        "desc": "swap di HDD: seek mahal -> swap seminim mungkin, readahead 8 page",
+        "swappiness": 10, "page-cluster": 3, "watermark_scale_factor": 10,
+        "vfs_cache_pressure": 50, "min_free_kbytes": "0.5%",
+    },
+    "latency": {
+        "desc": "latensi: kswapd bangun lebih awal agar jarang direct reclaim",
+        "swappiness": 10, "page-cluster": 0, "watermark_scale_factor": 200,
+        "vfs_cache_pressure": 50, "min_free_kbytes": "2%",
+    },
+    "throughput": {
+        "desc": "throughput batch: reclaim malas, readahead swap penuh",
+        "swappiness": 60, "page-cluster": 3, "watermark_scale_factor": 10,
+        "vfs_cache_pressure": 100, "min_free_kbytes": "0.5%",
+    },
+}
+
+def detect_swap_profile(snap=None):
+    """Pilih profil dari layout swap aktif -> (nama, alasan); nama None bila tidak ada swap."""
+    c = (snap or system_snapshot()).classify()
+    disks = c["files"] + c["parts"]
+    if c["zram"] and not disks:
+        return "zram-only", f"{len(c['zram'])} device zram, tanpa swap disk"
+    if c["zram"]:
+        return "hybrid", f"zram + {len(disks)} swap disk"
+    if not disks:
+        return None, "tidak ada swap aktif"
+    kinds = {swap_backing_kind(n) for n in disks}
+    if "hdd" in kinds:
+        return "hdd-swap", "swap di disk rotasional"
+    return "ssd-swap", "swap di SSD/NVMe"
+
+def resolve_profile(name):
+    """Nilai sysctl konkret profil: persen min_free_kbytes dihitung, swappiness dibatasi kernel."""
+    prof = SYSCTL_PROFILES[name]
+    mem_kib = parse_meminfo(_read_sysfs("/proc/meminfo") or "", ("MemTotal",)).get("MemTotal", 0)
+    out = {}
+    for key in SNAPSHOT_SYSCTLS:
+        v = prof.get(key)
+        if v is None:
+            continue
+        if isinstance(v, str) and v.endswith("%"):
+            lo, hi = MIN_FREE_BOUNDS
+            v = max(lo, min(hi, int(mem_kib * float(v[:-1]) / 100)))
+        if key == "swappiness":
+            v = min(v, swappiness_max())
+        out[key] = v
+    return out
+
+def profile_diff(name, snap=None):
+    """Bandingkan profil dengan nilai runtime & file persist -> list dict per sysctl."""
+    snap = snap or system_snapshot()
+    want = resolve_profile(name)
+    conf = read_sysctl_conf()
+    rows = []
+    for key, v in want.items():
+        runtime, persisted = snap.sysctl.get(key), conf.get(f"vm.{key}")
+        rows.append({"key": f"vm.{key}", "runtime": runtime, "persisted": persisted, "profile": v,
+                     "changed": runtime != v or persisted != str(v)})
+    return rows
+
+def print_profile_diff(name, rows):
+    print(f"\nProfil {name}: {SYSCTL_PROFILES[name]['desc']}")
+    print(f"{'sysctl':28} {'runtime':>9} {'persist':>9} {'profil':>9}")
+    for r in rows:
+        mark = "*" if r["changed"] else " "
+        print(f"{mark} {r['key']:26} {str(r['runtime']):>9} {str(r['persisted'] or '-'):>9} {r['profile']:>9}")
+    if not any(r["changed"] for r in rows):
+        print("✅ Sudah sesuai profil.")
+
+def apply_profile(name="auto", plan=None):
+    """Terapkan profil (runtime + SWAPPINESS_CONF); state sebelumnya disimpan untuk rollback."""
+    import json
+    snap = system_snapshot()
+    if name == "auto":
+        name, why = detect_swap_profile(snap)
+        if name is None:
+            print(f"❌ Tidak bisa memilih profil otomatis: {why}.")
+            return False
+        print(f"ℹ Profil otomatis: {name} ({why})")
+    if name not in SYSCTL_PROFILES:
+        print(f"❌ Profil tidak dikenal: {name} (pilihan: {', '.join(SYSCTL_PROFILES)})")
+        return False
+    want = resolve_profile(name)
+    conf = read_sysctl_conf()
+    state = {"profile": name, "conf": _read_sysfs(SWAPPINESS_CONF) if os.path.exists(SWAPPINESS_CONF) else None,
+             "runtime": {k: snap.sysctl.get(k) for k in want}}
+    try:
+        with open(SYSCTL_STATE) as f:
+            base = json.load(f)
+    except (OSError, ValueError):
+        base = None
+    if base:
+        # baseline pra-tuning dipertahankan sampai rollback; kunci yang belum tercatat masih bernilai asli
+        state = dict(base, profile=name, runtime={**state["runtime"], **base["runtime"]})
+    conf.update({f"vm.{k}": str(v) for k, v in want.items()})
+    own = plan is None
+    plan = Plan() if own else plan
+    for key, v in want.items():
+        plan.write_sysfs(f"/proc/sys/vm/{key}", v)
+    plan.mkdir(os.path.dirname(SYSCTL_STATE))
+    plan.write_file(SYSCTL_STATE, json.dumps(state, indent=2) + "\n", mode=0o644)
+    plan.write_file(SWAPPINESS_CONF, render_sysctl_conf(conf, f"profil {name}"), mode=0o644,
+                    msg=f"✅ Profil {name} diterapkan (runtime + {SWAPPINESS_CONF}); rollback: `tune rollback`")
+    return plan.execute() if own else True
+
+def rollback_profile(plan=None):
+    """Kembalikan sysctl runtime & file persist ke state sebelum apply_profile terakhir."""
+    import json
+    try:
+        with open(SYSCTL_STATE) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        print("ℹ Tidak ada state rollback profil.")
+        return False
+    own = plan is None
+    plan = Plan() if own else plan
+    for key, v in state["runtime"].items():
+        if v is not None:
+            plan.write_sysfs(f"/proc/sys/vm/{key}", v)
+    if state["conf"] is None:
+        plan.unlink(SWAPPINESS_CONF, check=False)
+    else:
+        plan.write_file(SWAPPINESS_CONF, state["conf"] + "\n", mode=0o644)
+    plan.unlink(SYSCTL_STATE, msg=f"✅ Profil {state['profile']} di-rollback.")
+    return plan.execute() if own else True
+
+def tune_profile_prompt():
+    """Menu profil tuning: tampilkan diff profil otomatis/pilihan lalu terapkan atau rollback."""
+    auto, why = detect_swap_profile()
+    names = list(SYSCTL_PROFILES)
+    for i, n in enumerate(names, 1):
+        print(f"{i}. {n:11} — {SYSCTL_PROFILES[n]['desc']}" + ("  [otomatis]" if n == auto else ""))
+    print(f"r. Rollback profil terakhir\n(layout terdeteksi: {why})")
+    sel = input(f"Pilih profil [{auto or '-'}]: ").strip().lower()
+    if sel == "r":
+        rollback_profile()
+        return
+    name = names[int(sel) - 1] if sel.isdigit() and 1 <= int(sel) <= len(names) else (auto if not sel else None)
+    if name is None:
+        print("❌ Pilihan tidak valid.")
+        return
+    rows = profile_diff(name)
+    print_profile_diff(name, rows)
+    if any(r["changed"] for r in rows) and input("Terapkan? (y/n): ").strip().lower() == "y":
+        apply_profile(name)
+
+
+# -------------------- Monitor (sampler + exporter Prometheus) --------------------
+class ProcFile:
+    """File /proc yang dibuka sekali lalu dibaca ulang via pread (tanpa open/close per sampel)."""
+
+    def __init__(self, path: str, bufsize: int = 16384):
+        self.path = path
+        self.bufsize = bufsize
+        try:
+            self.fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except OSError:
+            self.fd = None
+
+    def read(self):
+        if self.fd is None:
+            return ""
+        try:
+            data = os.pread(self.fd, self.bufsize, 0)
+            # buffer penuh -> mungkin terpotong, perbesar lalu baca ulang
+            while len(data) >= self.bufsize:
+                self.bufsize *= 2
+                data = os.pread(self.fd, self.bufsize, 0)
+        except OSError:
+            return ""
+        return data.decode("ascii", "replace")
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+MEMINFO_KEYS = ("MemTotal", "MemAvailable", "SwapTotal", "SwapFree", "SwapCached")
+VMSTAT_KEYS = ("pswpin", "pswpout", "pgmajfault")
+
+def parse_meminfo(text: str, keys=MEMINFO_KEYS):
+    """Ambil field /proc/meminfo (dalam KiB). keys=None -> semua field."""
+    out = {}
+    for line in text.splitlines():
+        name, _, rest = line.partition(":")
+        if keys is None or name in keys:
+            out[name] = int(rest.split()[0])
+    return out
+
+def parse_vmstat(text: str, keys=VMSTAT_KEYS):
+    """Ambil counter /proc/vmstat. keys=None -> semua counter."""
+    out = {}
+    for line in text.splitlines():
+        name, _, val = line.partition(" ")
+        if keys is None or name in keys:
+            out[name] = int(val)
+    return out
+
+def parse_psi(text: str):
+    """Parse /proc/pressure/memory -> {'some': {...}, 'full': {...}} (total dalam mikrodetik)."""
+    out = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        rec = {}
+        for kv in parts[1:]:
+            k, _, v = kv.partition("=")
+            rec[k] = int(v) if k == "total" else float(v)
+        out[parts[0]] = rec
+    return out
+
+def parse_diskstats(text: str):
+    """Parse /proc/diskstats -> {(major, minor): {...}} (sektor selalu 512 byte)."""
+    out = {}
+    for line in text.splitlines():
+        p = line.split()
+        if len(p) < 14:
+            continue
+        out[(int(p[0]), int(p[1]))] = {
+            "name": p[2],
+            "reads": int(p[3]),
+            "sectors_read": int(p[5]),
+            "ms_reading": int(p[6]),
+            "writes": int(p[7]),
+            "sectors_written": int(p[9]),
+            "ms_writing": int(p[10]),
+        }
+    return out
+
+def swap_device_number(name: str, typ: str):
+    """(major, minor) block device di balik area swap; untuk swapfile = device filesystem-nya."""
+    try:
+        st = os.stat(name)
+    except OSError:
+        return None
+    dev = st.st_dev if typ == "file" else st.st_rdev
+    return (os.major(dev), os.minor(dev))
+
+
+class SwapSampler:
+    """Sampler /proc/swaps, meminfo, vmstat, PSI memory & diskstats dengan fd yang tetap terbuka."""
+
+    SOURCES = {
+        "swaps": "/proc/swaps",
+        "meminfo": "/proc/meminfo",
+        "vmstat": "/proc/vmstat",
+        "psi": "/proc/pressure/memory",
+        "diskstats": "/proc/diskstats",
+    }
+
+    def __init__(self):
+        self.files = {k: ProcFile(p) for k, p in self.SOURCES.items()}
+        self._dev_names = ()
+        self._devmap = {}
+        self.prev = None
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+    def _device_map(self, swaps):
+        names = tuple(s['name'] for s in swaps)
+        # stat() device hanya diulang bila daftar swap berubah
+        if names != self._dev_names:
+            self._devmap = {}
+            for s in swaps:
+                num = swap_device_number(s['name'], s['type'])
+                if num:
+                    self._devmap[s['name']] = num
+            self._dev_names = names
+        return self._devmap
+
+    def sample(self):
+        """Satu sampel mentah (counter kumulatif) + timestamp monotonic."""
+        swaps = parse_proc_swaps(self.files["swaps"].read())
+        devmap = self._device_map(swaps)
+        disks = parse_diskstats(self.files["diskstats"].read()) if devmap else {}
+        return {
+            "t": time.monotonic(),
+            "swaps": swaps,
+            "meminfo": parse_meminfo(self.files["meminfo"].read()),
+            "vmstat": parse_vmstat(self.files["vmstat"].read()),
+            "psi": parse_psi(self.files["psi"].read()),
+            "disk": {name: disks[num] for name, num in devmap.items() if num in disks},
+        }
+
+    @staticmethod
+    def rates(prev, cur):
+        """Hitung laju per detik antara dua sampel."""
+        dt = cur["t"] - prev["t"]
+        if dt <= 0:
+            return {}
+        r = {}
+        for k in VMSTAT_KEYS:
+            if k in cur["vmstat"] and k in prev["vmstat"]:
+                r[k] = (cur["vmstat"][k] - prev["vmstat"][k]) / dt
+        # PSI avg10 terlalu kasar untuk resolusi sub-detik; pakai delta 'total' (mikrodetik)
+        for kind in ("some", "full"):
+            a, b = prev["psi"].get(kind), cur["psi"].get(kind)
+            if a and b:
+                r[f"psi_{kind}"] = (b["total"] - a["total"]) / (dt * 1e6)
+        disk = {}
+        for name, d in cur["disk"].items():
+            p = prev["disk"].get(name)
+            if p:
+                disk[name] = {
+                    "read_bps": (d["sectors_read"] - p["sectors_read"]) * 512 / dt,
+                    "write_bps": (d["sectors_written"] - p["sectors_written"]) * 512 / dt,
+                }
+        r["disk"] = disk
+        return r
+
+    def step(self):
+        """Ambil sampel baru; kembalikan (sampel, laju) — laju kosong pada sampel pertama."""
+        cur = self.sample()
+        r = self.rates(self.prev, cur) if self.prev else {}
+        self.prev = cur
+        return cur, r
+
+
+def _prom_label(v):
+    return str(v).replace("\\", "\\\\").replace('"', '\\"')
+
+def render_prometheus(sample, rates):
+    """Render sampel + laju ke format teks Prometheus / node-exporter textfile."""
+    out = []
+
+    def metric(name, help_, typ, rows):
+        out.append(f"# HELP {name} {help_}")
+        out.append(f"# TYPE {name} {typ}")
+        for labels, val in rows:
+            lbl = ",".join(f'{k}="{_prom_label(v)}"' for k, v in labels.items())
+            out.append(f"{name}{{{lbl}}} {val}" if lbl else f"{name} {val}")
+
+    swaps = sample["swaps"]
+    dev = lambda s: {"device": s['name'], "type": s['type']}
+    metric("swapi_swap_size_bytes", "Ukuran area swap.", "gauge",
+           [(dev(s), s['size_kib'] * 1024) for s in swaps])
+    metric("swapi_swap_used_bytes", "Swap terpakai per area.", "gauge",
+           [(dev(s), s['used_kib'] * 1024) for s in swaps])
+    metric("swapi_swap_priority", "Prioritas area swap.", "gauge",
+           [(dev(s), s['prio']) for s in swaps])
+    for k, v in sample["meminfo"].items():
+        metric(f"swapi_meminfo_{k.lower()}_bytes", f"/proc/meminfo {k}.", "gauge", [({}, v * 1024)])
+    for k, v in sample["vmstat"].items():
+        metric(f"swapi_vmstat_{k}_total", f"/proc/vmstat {k}.", "counter", [({}, v)])
+    for k in VMSTAT_KEYS:
+        if k in rates:
+            metric(f"swapi_{k}_per_second", f"Laju {k} per detik.", "gauge", [({}, f"{rates[k]:.3f}")])
+    for kind, rec in sample["psi"].items():
+        metric(f"swapi_pressure_memory_{kind}_avg10", f"PSI memory {kind} avg10 (%).", "gauge",
+               [({}, rec.get("avg10", 0))])
+        if f"psi_{kind}" in rates:
+            metric(f"swapi_pressure_memory_{kind}_ratio", f"Fraksi stall memory {kind} selama interval sampel.",
+                   "gauge", [({}, f"{rates[f'psi_{kind}']:.6f}")])
+    if rates.get("disk"):
+        metric("swapi_swap_device_read_bytes_per_second", "Throughput baca device swap.", "gauge",
+               [({"device": n}, f"{d['read_bps']:.0f}") for n, d in rates["disk"].items()])
+        metric("swapi_swap_device_write_bytes_per_second", "Throughput tulis device swap.", "gauge",
+               [({"device": n}, f"{d['write_bps']:.0f}") for n, d in rates["disk"].items()])
+    return "\n".join(out) + "\n"
+
+def write_textfile(directory: str, text: str, name: str = "swapi.prom"):
+    """Tulis file untuk textfile collector node-exporter secara atomik (tmp + rename)."""
+    final = os.path.join(directory, name)
+    tmp = f"{final}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, final)
+
+def start_metrics_server(port: int, get_text, addr: str = "127.0.0.1"):
+    """HTTP endpoint lokal /metrics di thread daemon; get_text() mengembalikan teks terakhir."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = get_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer((addr, port), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+def monitor(interval: float = 0.25, port=None, textfile_dir=None, textfile_every: float = 1.0,
+            duration=None, quiet: bool = False):
+    """Loop sampling swap/memory; ekspor ke HTTP (/metrics) dan/atau textfile node-exporter."""
+    sampler = SwapSampler()
+    latest = {"text": ""}
+    srv = start_metrics_server(port, lambda: latest["text"]) if port else None
+    if srv:
+        print(f"📡 Exporter aktif di http://127.0.0.1:{port}/metrics")
+    if not quiet:
+        print(f"Sampling tiap {interval * 1000:.0f} ms — Ctrl+C untuk berhenti.")
+
+    start = next_t = time.monotonic()
+    last_print = last_textfile = 0.0
+    try:
+        while duration is None or next_t - start < duration:
+            sample, rates = sampler.step()
+            now = sample["t"]
+            if rates:
+                latest["text"] = render_prometheus(sample, rates)
+                if textfile_dir and now - last_textfile >= textfile_every:
+                    write_textfile(textfile_dir, latest["text"])
+                    last_textfile = now
+                if not quiet and now - last_print >= 1.0:
+                    used = sum(s['used_kib'] for s in sample["swaps"]) / 1024
+                    print(f"swap used={used:.0f}MiB  swpin={rates.get('pswpin', 0):.0f}/s  "
+                          f"swpout={rates.get('pswpout', 0):.0f}/s  majflt={rates.get('pgmajfault', 0):.0f}/s  "
+                          f"psi some={rates.get('psi_some', 0) * 100:.1f}% full={rates.get('psi_full', 0) * 100:.1f}%")
+                    last_print = now
+            # jadwal absolut supaya interval tidak melar oleh waktu proses
+            next_t += interval
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.monotonic()
+    except KeyboardInterrupt:
+        print("\nMonitor dihentikan.")
+    finally:
+        sampler.close()
+        if srv:
+            srv.shutdown()
+
+def monitor_prompt():
+    """Prompt untuk menjalankan monitor interaktif."""
+    iv = input("Interval sampling ms (default 250): ").strip() or "250"
+    port = input("Port exporter HTTP (kosong = tanpa HTTP): ").strip()
+    tdir = input("Direktori textfile node-exporter (kosong = tanpa textfile): ").strip()
+    if not iv.isdigit() or int(iv) <= 0 or (port and not port.isdigit()):
+        print("❌ Input tidak valid.")
+        return
+    monitor(int(iv) / 1000, port=int(port) if port else None, textfile_dir=tdir or None)
+
+
+# -------------------- Swap history (ring buffer mmap) --------------------
+HISTORY_DIR = "/var/lib/swapi/history"
+HISTORY_SERVICE = "/etc/systemd/system/swapi-history.service"
+HISTORY_MAGIC = b"SWPH"
+HISTORY_VERSION = 1
+HISTORY_MAX_DEVS = 8
+# tier: (nama, detik per sampel, kapasitas) -> 6 jam @1s, 14 hari @1m, ±400 hari @1h; ukuran file tetap
+HISTORY_TIERS = (("1s", 1, 21600), ("1m", 60, 20160), ("1h", 3600, 9600))
+# t, swap used/total (KiB), MemAvailable (KiB), pswpin/s, pswpout/s, rasio zram, used per device (KiB)
+HISTORY_FIELDS = ("t", "used_kib", "total_kib", "mem_avail_kib", "pswpin_s", "pswpout_s", "zram_ratio")
+
+def _history_structs():
+    import struct
+    # header: magic, versi, ukuran record, kapasitas, interval, head, count, lalu nama device (64 byte/slot)
+    header = struct.Struct(f"<4sIIIIQQ{HISTORY_MAX_DEVS * 64}s")
+    record = struct.Struct(f"<dIIIfff{HISTORY_MAX_DEVS}I")
+    return header, record
+
+
+class HistoryRing:
+    """Ring buffer sampel berukuran tetap di file yang di-mmap; append O(1), sampel terlama ditimpa.
+
+    Satu penulis (recorder) per file; pembaca membuka read-only dan membaca head/count dari header.
+    """
+
+    def __init__(self, path: str, interval: int = 1, capacity: int = 3600, writable: bool = False):
+        import mmap
+        self.header, self.record = _history_structs()
+        self.path, self.writable = path, writable
+        size = self.header.size + capacity * self.record.size
+        if writable and not os.path.exists(path):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            os.ftruncate(fd, size)
+            os.pwrite(fd, self.header.pack(HISTORY_MAGIC, HISTORY_VERSION, self.record.size, capacity,
+                                           interval, 0, 0, b""), 0)
+        else:
+            fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        try:
+            self.mm = mmap.mmap(fd, 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+        magic, ver, recsize, self.capacity, self.interval, _, _, names = self.header.unpack_from(self.mm, 0)
+        if magic != HISTORY_MAGIC or ver != HISTORY_VERSION or recsize != self.record.size:
+            self.mm.close()
+            raise ValueError(f"{path}: bukan file history swapi v{HISTORY_VERSION}")
+        self.devices = [names[i * 64:(i + 1) * 64].rstrip(b"\0").decode() for i in range(HISTORY_MAX_DEVS)]
+
+    def close(self):
+        self.mm.close()
+
+    def _state(self):
+        return self.header.unpack_from(self.mm, 0)[5:7]
+
+    def device_slot(self, name: str):
+        """Slot tetap untuk device; slot terakhir menampung device lain bila semua slot terpakai."""
+        if name in self.devices:
+            return self.devices.index(name)
+        if "" not in self.devices:
+            return HISTORY_MAX_DEVS - 1
+        i = self.devices.index("")
+        self.devices[i] = name
+        off = self.header.size - HISTORY_MAX_DEVS * 64 + i * 64
+        self.mm[off:off + 64] = name.encode()[:64].ljust(64, b"\0")
+        return i
+
+    def append(self, rec: dict):
+        head, count = self._state()
+        devs = [0] * HISTORY_MAX_DEVS
+        for name, kib in rec.get("devices", {}).items():
+            devs[self.device_slot(name)] += int(round(kib))
+        vals = [rec.get(k) or 0 for k in HISTORY_FIELDS]
+        vals[1:4] = (int(round(v)) for v in vals[1:4])  # kolom KiB = uint32
+        self.record.pack_into(self.mm, self.header.size + head * self.record.size, *vals, *devs)
+        # header diperbarui setelah record tertulis: pembaca tidak pernah melihat slot setengah jadi
+        import struct
+        struct.pack_into("<QQ", self.mm, 20, (head + 1) % self.capacity, min(count + 1, self.capacity))
+
+    def records(self, since=None, until=None):
+        """Record urut waktu (dict) dalam rentang [since, until] (epoch detik)."""
+        head, count = self._state()
+        start = (head - count) % self.capacity
+        names = self.devices
+        for i in range(count):
+            vals = self.record.unpack_from(self.mm, self.header.size + ((start + i) % self.capacity) * self.record.size)
+            t = vals[0]
+            if (since is not None and t < since) or (until is not None and t > until):
+                continue
+            rec = dict(zip(HISTORY_FIELDS, vals))
+            rec["devices"] = {names[j]: v for j, v in enumerate(vals[len(HISTORY_FIELDS):]) if names[j]}
+            yield rec
+
+
+def parse_duration(s: str):
+    """'90', '15m', '6h', '7d' -> detik (float), atau None bila tidak valid."""
+    m = re.match(r"^(\d+(?:\.\d+)?)([smhd]?)$", str(s).strip().lower())
+    if not m:
+        return None
+    return float(m.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}[m.group(2)]
+
+def history_path(tier: str, directory=None):
+    return os.path.join(directory or HISTORY_DIR, f"swap-{tier}.ring")
+
+def open_history(tier: str = "1s", directory=None, writable: bool = False):
+    spec = next(t for t in HISTORY_TIERS if t[0] == tier)
+    return HistoryRing(history_path(tier, directory), spec[1], spec[2], writable)
+
+def _zram_ratio():
+    orig = compr = 0
+    for dev in list_zram_devices():
+        mm = _parse_stat_fields(_read_sysfs(f"{zram_sysfs(dev)}/mm_stat"), ZRAM_MM_STAT_FIELDS) or {}
+        orig += mm.get("orig_data_size", 0)
+        compr += mm.get("compr_data_size", 0)
+    return orig / compr if compr else 0.0
+
+def linear_trend(points):
+    """Kemiringan least-squares (unit y per detik) dari [(t, y)], atau None bila < 2 titik."""
+    n = len(points)
+    if n < 2:
+        return None
+    mt = sum(t for t, _ in points) / n
+    my = sum(y for _, y in points) / n
+    den = sum((t - mt) ** 2 for t, _ in points)
+    return sum((t - mt) * (y - my) for t, y in points) / den if den else None
+
+def history_query(tier: str = "1m", window: float = 3600, directory=None, now=None):
+    """Ringkasan jendela waktu: persentil & tren tiap metrik -> dict, atau None bila tidak ada data."""
+    try:
+        ring = open_history(tier, directory)
+    except (OSError, ValueError, StopIteration):
+        return None
+    try:
+        now = now or time.time()
+        recs = list(ring.records(since=now - window))
+    finally:
+        ring.close()
+    if not recs:
+        return None
+    out = {"tier": tier, "window_s": window, "samples": len(recs), "from": recs[0]["t"], "to": recs[-1]["t"]}
+    for k in HISTORY_FIELDS[1:]:
+        vals = [r[k] for r in recs]
+        out[k] = {"p50": _percentile(vals, 50), "p95": _percentile(vals, 95), "max": max(vals),
+                  "last": vals[-1], "trend_per_s": linear_trend([(r["t"], r[k]) for r in recs])}
+    return out
+
+def forecast_exhaustion(tier: str = "1s", window: float = 900, directory=None, now=None):
+    """Perkiraan menit hingga swap habis dari tren 'used' di jendela terakhir -> dict.
+
+    minutes None = swap tidak bertambah (atau data kurang).
+    """
+    q = history_query(tier, window, directory, now)
+    if q is None:
+        return {"minutes": None, "reason": "belum ada data history"}
+    used, total = q["used_kib"]["last"], q["total_kib"]["last"]
+    slope = q["used_kib"]["trend_per_s"]
+    res = {"used_kib": used, "total_kib": total, "slope_kib_s": slope, "samples": q["samples"],
+           "minutes": None, "reason": "pemakaian swap tidak naik"}
+    if total and slope and slope > 0:
+        res["minutes"] = round((total - used) / slope / 60, 1)
+        res["reason"] = f"naik {slope * 60 / 1024:.1f} MiB/menit"
+    return res
+
+def run_forecast_hook(hook: str, fc: dict):
+    """Jalankan hook (argv, tanpa shell) dengan hasil forecast di environment SWAPI_*."""
+    env = dict(os.environ, SWAPI_FORECAST_MINUTES=str(fc["minutes"]), SWAPI_SWAP_USED_KIB=str(fc["used_kib"]),
+               SWAPI_SWAP_TOTAL_KIB=str(fc["total_kib"]), SWAPI_SWAP_SLOPE_KIB_S=f"{fc['slope_kib_s']:.1f}")
+    try:
+        subprocess.Popen(shlex.split(hook), env=env, stdin=subprocess.DEVNULL)
+    except OSError as e:
+        print(f"⚠ Hook forecast gagal: {e}")
+
+
+class _Downsampler:
+    """Rata-rata sampel ke bucket `step` detik; bucket selesai di-append ke ring tier-nya."""
+
+    def __init__(self, ring: HistoryRing, step: int):
+        self.ring, self.step = ring, step
+        self.bucket, self.acc = None, []
+
+    def add(self, rec):
+        b = int(rec["t"] // self.step)
+        if self.bucket is not None and b != self.bucket and self.acc:
+            n = len(self.acc)
+            avg = {k: sum(r[k] for r in self.acc) / n for k in HISTORY_FIELDS[1:]}
+            devs = {}
+            for r in self.acc:
+                for d, v in r["devices"].items():
+                    devs[d] = devs.get(d, 0) + v / n
+            avg.update(t=self.bucket * self.step, devices=devs)
+            self.ring.append(avg)
+            self.acc = []
+        self.bucket = b
+        self.acc.append(rec)
+
+
+def history_record(interval: float = 1.0, directory=None, hook=None, threshold_min: float = 30.0,
+                   hook_cooldown: float = 1800, forecast_window: float = 900, forecast_every: float = 60,
+                   duration=None, quiet: bool = False):
+    """Recorder: sampel tiap interval ke tier 1s, downsample ke 1m & 1h, forecast + hook tiap forecast_every."""
+    try:
+        rings = {t[0]: open_history(t[0], directory, writable=True) for t in HISTORY_TIERS}
+    except (OSError, ValueError) as e:
+        print(f"❌ Gagal membuka history: {e}")
+        return False
+    downs = [_Downsampler(rings[name], step) for name, step, _ in HISTORY_TIERS[1:]]
+    sampler = SwapSampler()
+    if not quiet:
+        print(f"📼 Merekam history ke {directory or HISTORY_DIR} tiap {interval}s — Ctrl+C untuk berhenti.")
+    start = next_t = last_fc = time.monotonic()
+    last_hook = None
+    try:
+        while duration is None or time.monotonic() - start < duration:
+            sample, rates = sampler.step()
+            if rates:
+                mem = sample["meminfo"]
+                rec = {"t": time.time(), "used_kib": sum(s["used_kib"] for s in sample["swaps"]),
+                       "total_kib": mem.get("SwapTotal", 0), "mem_avail_kib": mem.get("MemAvailable", 0),
+                       "pswpin_s": rates.get("pswpin", 0), "pswpout_s": rates.get("pswpout", 0),
+                       "zram_ratio": _zram_ratio(), "devices": {s["name"]: s["used_kib"] for s in sample["swaps"]}}
+                rings["1s"].append(rec)
+                for d in downs:
+                    d.add(rec)
+                now = time.monotonic()
+                if now - last_fc >= forecast_every:
+                    last_fc = now
+                    fc = forecast_exhaustion("1s", forecast_window, directory)
+                    if fc["minutes"] is not None and fc["minutes"] <= threshold_min:
+                        print(f"⚠ Swap diperkirakan habis dalam {fc['minutes']} menit ({fc['reason']}).")
+                        if hook and (last_hook is None or now - last_hook >= hook_cooldown):
+                            run_forecast_hook(hook, fc)
+                            last_hook = now
+            next_t += interval
+            delay = next_t - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_t = time.monotonic()
+    except KeyboardInterrupt:
+        print("\nℹ Recorder history dihentikan.")
+    finally:
+        sampler.close()
+        for r in rings.values():
+            r.close()
+    return True
+
+def install_history_service(interval: float = 1.0, hook=None, threshold_min: float = 30.0, plan=None):
+    """Pasang swapi-history.service yang merekam history sejak boot."""
+    args = [*SELF_ARGV, "history", "record", "--interval", str(interval),
+            "--threshold", str(threshold_min), "--quiet"]
+    if hook:
+        args += ["--hook", hook]
+    service = f"""[Unit]
+Description=Recorder history pemakaian swap (ring buffer)
+After=zram.service
+
+[Service]
+Type=simple
+ExecStart={" ".join(shlex.quote(a) for a in args)}
+Restart=on-failure
+
+[Install]
+WantedBy=multi-user.target
+"""
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.mkdir(HISTORY_DIR)
+    plan.write_file(HISTORY_SERVICE, service, mode=0o644)
+    plan.exec(["systemctl", "daemon-reload"], check=False)
+    plan.exec(["systemctl", "enable", "--now", "swapi-history.service"], check=False,
+              msg="✅ swapi-history.service aktif.")
+    return plan.execute() if own else True
+
+def print_history(q, fc):
+    if q is None:
+        print("ℹ Belum ada data history (jalankan `history record` atau pasang service-nya).")
+        return
+    span = (q["to"] - q["from"]) / 60
+    print(f"\n=== History {q['tier']} — {q['samples']} sampel, {span:.0f} menit terakhir ===")
+    print(f"{'metrik':20} {'p50':>10} {'p95':>10} {'max':>10} {'terakhir':>10} {'tren/menit':>11}")
+    for k in HISTORY_FIELDS[1:]:
+        m = q[k]
+        scale = (lambda v: v / 1024) if k.endswith("_kib") else (lambda v: v)
+        tr = f"{scale(m['trend_per_s']) * 60:+.2f}" if m["trend_per_s"] is not None else "-"
+        print(f"{k + (' (MiB)' if k.endswith('_kib') else ''):20} {scale(m['p50']):>10.1f} {scale(m['p95']):>10.1f} "
+              f"{scale(m['max']):>10.1f} {scale(m['last']):>10.1f} {tr:>11}")
+    if fc["minutes"] is not None:
+        print(f"⚠ Swap diperkirakan habis dalam {fc['minutes']} menit ({fc['reason']}).")
+    else:
+        print(f"✅ Tidak ada tanda swap akan habis ({fc['reason']}).")
+
+
+# -------------------- cgroup v2 swap limits --------------------
+# kunci -> (file cgroup, properti systemd atau None bila systemd tidak punya padanannya)
+CGROUP_LIMITS = {
+    "swap_max": ("memory.swap.max", "MemorySwapMax"),
+    "swap_high": ("memory.swap.high", None),
+    "zswap_max": ("memory.zswap.max", "MemoryZSwapMax"),
+    "zswap_writeback": ("memory.zswap.writeback", "MemoryZSwapWriteback"),
+    "high": ("memory.high", "MemoryHigh"),
+}
+CGROUP_DROPIN = "50-swapi-memory.conf"
+UNIT_SECTIONS = {".service": "Service", ".slice": "Slice", ".scope": "Scope", ".socket": "Socket",
+                 ".mount": "Mount", ".swap": "Swap"}
+
+@functools.lru_cache(maxsize=None)
+def cgroup2_root():
+    """Mount point cgroup v2 (unified), atau None."""
+    try:
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                p = line.split()
+                if len(p) > 2 and p[2] == "cgroup2":
+                    return p[1]
+    except OSError:
+        pass
+    return None
+
+def unit_section(target: str):
+    """Section drop-in untuk resource control unit systemd, atau None bila target bukan unit."""
+    if target.startswith("/"):
+        return None
+    return next((sec for ext, sec in UNIT_SECTIONS.items() if target.endswith(ext)), None)
+
+def unit_cgroup(unit: str):
+    """Path cgroup unit (relatif root cgroup v2) via systemctl; slice bisa diturunkan dari namanya."""
+    systemctl = find_cmd("systemctl")
+    if systemctl:
+        code, out, _ = run([systemctl, "show", "-p", "ControlGroup", "--value", unit])
+        if code == 0 and out.strip():
+            return out.strip()
+    if unit.endswith(".slice"):
+        # a-b-c.slice -> /a.slice/a-b.slice/a-b-c.slice
+        parts = unit[:-6].split("-")
+        return "/" + "/".join("-".join(parts[:i]) + ".slice" for i in range(1, len(parts) + 1))
+    return None
+
+def resolve_cgroup(target: str):
+    """Unit systemd atau path cgroup -> direktori absolut di cgroup v2, atau None."""
+    root = cgroup2_root()
+    if not root:
+        return None
+    rel = unit_cgroup(target) if unit_section(target) else target
+    if rel is None:
+        return None
+    path = rel if rel.startswith(root + "/") or rel == root else os.path.join(root, rel.lstrip("/"))
+    return path if os.path.isdir(path) else None
+
+def _cg_value(text):
+    """Isi file limit -> int byte, None untuk 'max', atau None bila file tidak ada."""
+    if text is None or text == "max":
+        return None
+    return int(text) if text.isdigit() else text
+
+def cgroup_swap_record(path: str, root=None):
+    """Record satu cgroup dalam model yang sama dengan entri /proc/swaps (name/type/size_kib/used_kib)."""
+    root = root or cgroup2_root()
+    rel = os.path.relpath(path, root)
+    kib = lambda v: v // 1024 if isinstance(v, int) else v
+    cur = _cg_value(_read_sysfs(f"{path}/memory.swap.current"))
+    rec = {"name": "/" if rel == "." else "/" + rel, "type": "cgroup",
+           "size_kib": kib(_cg_value(_read_sysfs(f"{path}/memory.swap.max"))),
+           "used_kib": kib(cur) or 0, "prio": None,
+           "zswap_used_kib": kib(_cg_value(_read_sysfs(f"{path}/memory.zswap.current")))}
+    for key, (fname, _) in CGROUP_LIMITS.items():
+        raw = _read_sysfs(f"{path}/{fname}")
+        rec[key] = None if raw is None else ("max" if raw == "max" else int(raw))
+    return rec
+
+def get_cgroup_swaps(root=None, limited_only: bool = False):
+    """Semua cgroup v2 yang punya controller memory -> list record (urut path)."""
+    root = root or cgroup2_root()
+    if not root:
+        return []
+    out = []
+    for d, dirs, files in os.walk(root):
+        dirs.sort()
+        if "memory.swap.max" not in files:
+            continue
+        rec = cgroup_swap_record(d, root)
+        defaults = lambda k: (None, 1 if k == "zswap_writeback" else "max")
+        if limited_only and all(rec[k] in defaults(k) for k in CGROUP_LIMITS) and not rec["used_kib"]:
+            continue
+        out.append(rec)
+    return out
+
+def print_cgroup_swaps(recs):
+    fmt = lambda v: "max" if v in (None, "max") else _fmt_mib(v * 1024 if isinstance(v, int) else 0)
+    lim = lambda v: "-" if v is None else ("max" if v == "max" else _fmt_mib(v))
+    print(f"{'CGROUP':48} {'USED':>9} {'SWAP.MAX':>9} {'SWAP.HIGH':>9} {'ZSWAP':>9} {'ZSWAP.MAX':>9} {'HIGH':>9}")
+    for r in recs:
+        print(f"{r['name'][-48:]:48} {_fmt_mib(r['used_kib'] * 1024):>9} {fmt(r['size_kib']):>9} "
+              f"{lim(r['swap_high']):>9} {fmt(r['zswap_used_kib']) if r['zswap_used_kib'] is not None else '-':>9} "
+              f"{lim(r['zswap_max']):>9} {lim(r['high']):>9}")
+
+def parse_cgroup_limit(key: str, value):
+    """Nilai CLI -> string untuk file cgroup ('max', byte, atau 0/1 untuk zswap_writeback)."""
+    value = str(value).strip().lower()
+    if key == "zswap_writeback":
+        if value not in ("0", "1", "yes", "no", "on", "off"):
+            raise ValueError("zswap_writeback harus 0/1")
+        return "1" if value in ("1", "yes", "on") else "0"
+    if value in ("max", "infinity"):
+        return "max"
+    if value == "0":
+        return "0"
+    b = parse_size_to_bytes(value)
+    if b is None:
+        raise ValueError(f"ukuran tidak valid untuk {key}: {value}")
+    return str(b)
+
+def _systemd_value(key, value):
+    if key == "zswap_writeback":
+        return "yes" if value == "1" else "no"
+    return "infinity" if value == "max" else value
+
+def read_cgroup_dropin(unit: str):
+    """Properti di drop-in swapi milik unit -> {properti: nilai}."""
+    out = {}
+    for line in (_read_sysfs(f"/etc/systemd/system/{unit}.d/{CGROUP_DROPIN}") or "").splitlines():
+        k, sep, v = line.partition("=")
+        if sep and not line.startswith(("#", "[")):
+            out[k.strip()] = v.strip()
+    return out
+
+def set_cgroup_limits(target: str, limits: dict, persist: bool = True, plan=None):
+    """Tulis limit swap/zswap/high ke cgroup (runtime) dan, untuk unit systemd, persist via drop-in.
+
+    limits: {kunci CGROUP_LIMITS: nilai}. memory.swap.high tidak punya properti systemd; untuk
+    .service dipersist lewat ExecStartPost yang memanggil perintah ini lagi, unit lain runtime saja.
+    """
+    try:
+        vals = {k: parse_cgroup_limit(k, v) for k, v in limits.items() if v is not None}
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    unknown = set(vals) - set(CGROUP_LIMITS)
+    if unknown or not vals:
+        print(f"❌ Limit tidak dikenal/kosong: {', '.join(sorted(unknown)) or '-'}")
+        return False
+    path = resolve_cgroup(target)
+    section = unit_section(target)
+    if path is None and not (persist and section):
+        print(f"❌ cgroup v2 untuk {target} tidak ditemukan (unit belum aktif / bukan cgroup v2).")
+        return False
+    own = plan is None
+    plan = Plan() if own else plan
+    if path:
+        for key, v in vals.items():
+            fname = CGROUP_LIMITS[key][0]
+            if not os.path.exists(f"{path}/{fname}"):
+                print(f"⚠ {fname} tidak didukung kernel, dilewati.")
+                continue
+            plan.write_sysfs(f"{path}/{fname}", v, msg=f"✅ {target}: {fname} = {v}")
+    if persist and section:
+        props = read_cgroup_dropin(target)
+        runtime_only = {}
+        for key, v in vals.items():
+            prop = CGROUP_LIMITS[key][1]
+            if prop:
+                props[prop] = _systemd_value(key, v)
+            else:
+                runtime_only[key] = v
+        if runtime_only and section == "Service":
+            args = [*SELF_ARGV, "cgroup", "set", target, "--no-persist"]
+            for key, v in runtime_only.items():
+                args += [f"--{key.replace('_', '-')}", v]
+            props["ExecStartPost"] = "+" + " ".join(shlex.quote(a) for a in args)
+        elif runtime_only:
+            print(f"⚠ {', '.join(runtime_only)} tidak bisa dipersist untuk {target} (tanpa properti systemd).")
+        body = "".join(f"{k}={v}\n" for k, v in props.items())
+        plan.mkdir(f"/etc/systemd/system/{target}.d")
+        plan.write_file(f"/etc/systemd/system/{target}.d/{CGROUP_DROPIN}",
+                        f"# dikelola oleh swap_manager\n[{section}]\n{body}", mode=0o644,
+                        msg=f"✅ Drop-in {target}.d/{CGROUP_DROPIN} ditulis.")
+        plan.exec(["systemctl", "daemon-reload"], check=False)
+    elif persist:
+        print(f"ℹ {target} bukan unit systemd; limit hanya berlaku runtime.")
+    return plan.execute() if own else True
+
+def reset_cgroup_limits(target: str, plan=None):
+    """Kembalikan semua limit ke default kernel dan hapus drop-in swapi."""
+    path = resolve_cgroup(target)
+    own = plan is None
+    plan = Plan() if own else plan
+    if path:
+        for key, (fname, _) in CGROUP_LIMITS.items():
+            if os.path.exists(f"{path}/{fname}"):
+                plan.write_sysfs(f"{path}/{fname}", "1" if key == "zswap_writeback" else "max", check=False)
+    dropin = f"/etc/systemd/system/{target}.d/{CGROUP_DROPIN}"
+    if unit_section(target) and os.path.exists(dropin):
+        plan.unlink(dropin)
+        plan.exec(["systemctl", "daemon-reload"], check=False)
+    plan.note(f"✅ Limit swap {target} dikembalikan ke default.")
+    return plan.execute() if own else True
+
+def cgroup_limits_prompt():
+    """Menu limit swap per slice/service."""
+    recs = get_cgroup_swaps(limited_only=True)
+    if recs:
+        print_cgroup_swaps(recs)
+    elif not cgroup2_root():
+        print("❌ cgroup v2 tidak ter-mount.")
+        return
+    target = input("Unit (mis. batch.slice, nginx.service) atau path cgroup: ").strip()
+    if not target:
+        return
+    if input("Reset ke default (r) atau set limit (s)? ").strip().lower() == "r":
+        reset_cgroup_limits(target)
+        return
+    limits = {}
+    for key, (fname, _) in CGROUP_LIMITS.items():
+        v = input(f"{fname} (mis. 2G, 0, max; kosong = tidak diubah): ").strip()
+        if v:
+            limits[key] = v
+    if limits:
+        set_cgroup_limits(target, limits)
+
+
+# -------------------- Top swap consumers --------------------
+STATUS_BUFSIZE = 8192  # /proc/<pid>/status < 2 KiB; buffer dipakai ulang per worker
+
+def _read_into(path: str, buf: bytearray):
+    """Baca file kecil ke buffer yang dipakai ulang -> jumlah byte (0 bila gagal/proses hilang)."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    except OSError:
+        return 0
+    try:
+        return os.readv(fd, [buf])
+    except OSError:
+        return 0
+    finally:
+        os.close(fd)
+
+def _field_kib(buf, n, key: bytes):
+    """Nilai 'Key:   123 kB' dari buffer tanpa decode/split seluruh file; None bila tidak ada."""
+    i = buf.find(key, 0, n)
+    if i < 0:
+        return None
+    j = buf.find(b"\n", i + len(key), n)
+    return int(buf[i + len(key):j if j >= 0 else n].split()[0])
+
+def scan_pid_swap(pids, buf=None):
+    """VmSwap (KiB) untuk daftar pid -> {pid: (swap_kib, nama)}; hanya proses dengan swap > 0."""
+    buf = buf if buf is not None else bytearray(STATUS_BUFSIZE)
+    out = {}
+    for pid in pids:
+        n = _read_into(f"/proc/{pid}/status", buf)
+        # kernel thread tidak punya VmSwap
+        kib = _field_kib(buf, n, b"VmSwap:") if n else None
+        if kib:
+            out[pid] = (kib, bytes(buf[6:buf.find(b"\n", 0, n)]).strip().decode("utf-8", "replace"))
+    return out
+
+def _pid_majflt(pid: int, buf: bytearray):
+    """Kolom majflt /proc/<pid>/stat (nama proses bisa berisi spasi -> parse setelah ')')."""
+    n = _read_into(f"/proc/{pid}/stat", buf)
+    if not n:
+        return None
+    fields = buf[buf.rfind(b")", 0, n) + 2:n].split()
+    return int(fields[9]) if len(fields) > 9 else None
+
+def smaps_swap(pid: int):
+    """Swap & SwapPss dari /proc/<pid>/smaps_rollup (KiB) -> dict, atau None bila tak terbaca."""
+    buf = bytearray(STATUS_BUFSIZE)
+    n = _read_into(f"/proc/{pid}/smaps_rollup", buf)
+    if not n:
+        return None
+    return {"swap_kib": _field_kib(buf, n, b"\nSwap:"), "swap_pss_kib": _field_kib(buf, n, b"SwapPss:")}
+
+def list_pids():
+    return [int(e.name) for e in os.scandir("/proc") if e.name.isdigit()]
+
+def scan_cgroup_swap(root=None):
+    """Record cgroup v2 (cgroup_swap_record) yang memakai swap, plus swap-in kumulatif -> {nama: record}."""
+    root = root or cgroup2_root()
+    out = {}
+    if not root:
+        return out
+    for d, dirs, files in os.walk(root):
+        cur = _read_sysfs(f"{d}/memory.swap.current") if "memory.swap.current" in files else None
+        if not cur or cur == "0":
+            continue
+        rec = cgroup_swap_record(d, root)
+        stat = _read_sysfs(f"{d}/memory.stat") or ""
+        st = dict(line.split() for line in stat.splitlines() if line.count(" ") == 1)
+        # pswpin per-cgroup baru ada di kernel baru; refault anon = page anon yang kembali dari swap
+        rec["swapin_pages"] = int(st.get("pswpin", st.get("workingset_refault_anon", "0")))
+        out[rec["name"]] = rec
+    return out
+
+
+class SwapTop:
+    """Pemindai konsumen swap per proses & cgroup dengan refresh inkremental.
+
+    Scan penuh membaca VmSwap semua pid (paralel per chunk, buffer per worker dipakai ulang).
+    Refresh berikutnya memakai counter global /proc/vmstat: bila pswpout tidak bertambah tidak ada
+    proses yang mendapat swap baru, sehingga cukup membaca pid baru dan (bila pswpin bertambah)
+    pid yang sebelumnya punya swap. Scan penuh tetap diulang tiap `full_every` refresh untuk
+    menangkap swap yang dibebaskan lewat munmap/exit tanpa swap-in.
+    """
+
+    def __init__(self, workers=None, full_every: int = 10, cgroups: bool = True):
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.full_every = full_every
+        self.cgroups = cgroups
+        self.procs = {}      # pid -> (swap_kib, nama)
+        self.majflt = {}     # pid -> majflt terakhir
+        self.cg = {}
+        self.rates, self.cg_rates = {}, {}
+        self.vm = None
+        self.t = None
+        self.refreshes = 0
+        self.last_scanned = 0
+        self._pids = set()
+
+    def _scan(self, pids):
+        pids = list(pids)
+        if self.workers <= 1 or len(pids) < 2048:
+            return scan_pid_swap(pids)
+        from concurrent.futures import ThreadPoolExecutor
+        size = -(-len(pids) // self.workers)
+        chunks = [pids[i:i + size] for i in range(0, len(pids), size)]
+        out = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for part in pool.map(scan_pid_swap, chunks):
+                out.update(part)
+        return out
+
+    def refresh(self):
+        now = time.monotonic()
+        vm = parse_vmstat(_read_sysfs("/proc/vmstat") or "", ("pswpin", "pswpout"))
+        pids = set(list_pids())
+        full = self.vm is None or self.refreshes % self.full_every == 0 or \
+            vm.get("pswpout") != self.vm.get("pswpout")
+        if full:
+            todo = pids
+            procs = {}
+        else:
+            todo = pids - self._pids
+            if vm.get("pswpin") != self.vm.get("pswpin"):
+                todo |= self.procs.keys() & pids
+            procs = {p: v for p, v in self.procs.items() if p in pids and p not in todo}
+        procs.update(self._scan(todo))
+        # majflt hanya untuk pemegang swap (biasanya sedikit) -> laju swap-in per proses
+        buf, majflt, rates = bytearray(STATUS_BUFSIZE), {}, {}
+        dt = now - self.t if self.t else None
+        for pid in procs:
+            m = _pid_majflt(pid, buf)
+            if m is None:
+                continue
+            majflt[pid] = m
+            if dt and pid in self.majflt:
+                rates[pid] = (m - self.majflt[pid]) / dt
+        cg = scan_cgroup_swap() if self.cgroups else {}
+        if dt:
+            self.cg_rates = {k: (v["swapin_pages"] - self.cg[k]["swapin_pages"]) * PAGE_SIZE / dt
+                             for k, v in cg.items() if k in self.cg}
+        self.procs, self.majflt, self.rates, self.cg = procs, majflt, rates, cg
+        self._pids, self.vm, self.t = pids, vm, now
+        self.refreshes += 1
+        self.last_scanned = len(todo)
+        return self
+
+    def top(self, n: int = 20, key: str = "swap", detail: bool = True):
+        """Peringkat proses teratas -> list dict; key 'swap' (VmSwap) atau 'rate' (majflt/s)."""
+        import heapq
+        sort = (lambda p: self.procs[p][0]) if key == "swap" else (lambda p: self.rates.get(p, 0))
+        rows = []
+        for pid in heapq.nlargest(n, self.procs, key=sort):
+            kib, name = self.procs[pid]
+            row = {"pid": pid, "name": name, "swap_kib": kib, "majflt_per_s": self.rates.get(pid)}
+            if detail:
+                sm = smaps_swap(pid)
+                row["swap_pss_kib"] = sm["swap_pss_kib"] if sm else None
+            rows.append(row)
+        return rows
+
+    def top_cgroups(self, n: int = 10, key: str = "swap"):
+        sort = (lambda k: self.cg[k]["used_kib"]) if key == "swap" else (lambda k: self.cg_rates.get(k, 0))
+        return [{**self.cg[k], "swapin_bytes_per_s": self.cg_rates.get(k)}
+                for k in sorted(self.cg, key=sort, reverse=True)[:n]]
+
+def print_swap_top(st: SwapTop, n: int = 20, key: str = "swap"):
+    total = sum(v[0] for v in st.procs.values())
+    print(f"\n=== Top swap: {len(st.procs)} proses memakai {_fmt_mib(total * 1024)} "
+          f"(scan {st.last_scanned}/{len(st._pids)} pid) ===")
+    print(f"{'PID':>8} {'SWAP':>10} {'SWAPPSS':>10} {'MAJFLT/s':>9}  NAMA")
+    for r in st.top(n, key):
+        pss = _fmt_mib(r["swap_pss_kib"] * 1024) if r["swap_pss_kib"] is not None else "-"
+        rate = f"{r['majflt_per_s']:.0f}" if r["majflt_per_s"] is not None else "-"
+        print(f"{r['pid']:>8} {_fmt_mib(r['swap_kib'] * 1024):>10} {pss:>10} {rate:>9}  {r['name']}")
+    cgs = st.top_cgroups(10, key)
+    if cgs:
+        print(f"\n{'SWAP':>10} {'SWAP-IN/s':>10} {'SWAP.MAX':>10}  CGROUP")
+        for c in cgs:
+            rate = _fmt_mib(c["swapin_bytes_per_s"]) if c["swapin_bytes_per_s"] is not None else "-"
+            smax = _fmt_mib(c["size_kib"] * 1024) if isinstance(c["size_kib"], int) else "max"
+            print(f"{_fmt_mib(c['used_kib'] * 1024):>10} {rate:>10} {smax:>10}  {c['name']}")
+
+def swap_top(n: int = 20, key: str = "swap", interval: float = 1.0, watch: bool = False, workers=None,
+             as_json: bool = False):
+    """Perintah top: dua scan berjarak `interval` (untuk laju), atau refresh terus dengan watch."""
+    st = SwapTop(workers)
+    st.refresh()
+    try:
+        while True:
+            time.sleep(interval)
+            st.refresh()
+            if as_json:
+                import json
+                print(json.dumps({"processes": st.top(n, key), "cgroups": st.top_cgroups(n, key)}))
+            else:
+                if watch and sys.stdout.isatty():
+                    print("\033[H\033[2J", end="")
+                print_swap_top(st, n, key)
+            if not watch:
+                return True
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        print()
+    return True
+
+
+# -------------------- Adaptive swappiness controller --------------------
+SWAPPINESS_SYSCTL = "/proc/sys/vm/swappiness"
+SWAPPINESS_LOG = "/var/log/swapi-swappiness.log"
+SWAPPINESS_SERVICE = "/etc/systemd/system/swappiness-controller.service"
+# kernel >= 5.9 memisah refault anon/file; kernel lama hanya punya workingset_refault (file)
+CONTROLLER_VMSTAT_KEYS = ("pswpin", "workingset_refault_anon", "workingset_refault_file", "workingset_refault")
+
+class SwappinessController:
+    """Controller closed-loop vm.swappiness dalam batas [lo, hi].
+
+    Sinyal tiap sampel: fraksi stall PSI memory 'some', laju swap-in (pswpin) dan refault
+    workingset anon vs file. Saat ada tekanan: swap-in/refault anon dominan = page anon yang
+    di-swap ternyata masih dipakai -> turunkan; refault file dominan = page cache terusir
+    terlalu cepat -> naikkan. Saat tenang, nilai kembali perlahan ke baseline. Di antara
+    ambang psi_low dan psi_high (deadband) nilai ditahan. Perubahan baru diambil setelah arah
+    yang sama bertahan `confirm` sampel (relaksasi: 2x lipat), dibatasi `step` per perubahan
+    dan minimal `cooldown` detik antar perubahan.
+    """
+
+    def __init__(self, lo=10, hi=100, baseline=None, step=10, cooldown=30.0, confirm=3,
+                 psi_high=0.05, psi_low=0.01, min_rate=50.0):
+        self.lo, self.hi, self.step = lo, hi, step
+        self.cooldown, self.confirm = cooldown, confirm
+        self.psi_high, self.psi_low, self.min_rate = psi_high, psi_low, min_rate
+        self.baseline = baseline
+        self.value = None
+        self.streak = (0, 0)  # (arah, jumlah sampel berturut-turut)
+        self.last_change = None
+
+    @staticmethod
+    def signals(prev, cur):
+        """Laju per detik antara dua sampel {'t', 'vmstat', 'psi'}; PSI None bila kernel tanpa PSI."""
+        dt = cur["t"] - prev["t"]
+        if dt <= 0:
+            return None
+        rate = lambda k: (cur["vmstat"].get(k, 0) - prev["vmstat"].get(k, 0)) / dt
+        file_key = "workingset_refault_file" if "workingset_refault_file" in cur["vmstat"] else "workingset_refault"
+        sig = {"swapin": rate("pswpin"), "refault_anon": rate("workingset_refault_anon"),
+               "refault_file": rate(file_key), "psi_some": None, "psi_full": None}
+        for kind in ("some", "full"):
+            a, b = prev["psi"].get(kind), cur["psi"].get(kind)
+            if a and b:
+                sig[f"psi_{kind}"] = (b["total"] - a["total"]) / (dt * 1e6)
+        return sig
+
+    def _direction(self, sig):
+        anon = sig["swapin"] + sig["refault_anon"]
+        file = sig["refault_file"]
+        psi = sig["psi_some"]
+        if psi is None:
+            # tanpa PSI: tekanan diukur dari total laju refault + swap-in saja
+            pressured, calm = anon + file >= self.min_rate * 4, anon + file < self.min_rate
+        else:
+            pressured, calm = psi >= self.psi_high, psi <= self.psi_low
+        if pressured:
+            if anon + file < self.min_rate:
+                return 0, "tekanan tanpa refault/swap-in berarti"
+            if anon >= file:
+                return -1, f"swap-in/refault anon dominan ({anon:.0f} vs file {file:.0f}/s)"
+            return 1, f"refault page cache dominan ({file:.0f} vs anon {anon:.0f}/s)"
+        if calm and self.value != self.baseline:
+            return (1 if self.baseline > self.value else -1), f"tenang, kembali ke baseline {self.baseline}"
+        return 0, "dalam deadband" if not calm else "tenang, di baseline"
+
+    def decide(self, sig, now):
+        """Satu keputusan -> dict {action, old, new, reason, ...sinyal}. Tidak menulis apa pun."""
+        d, reason = self._direction(sig)
+        relax = reason.startswith("tenang")
+        self.streak = (d, self.streak[1] + 1) if d and self.streak[0] == d else (d, 1 if d else 0)
+        need = self.confirm * 2 if relax else self.confirm
+        new, action = self.value, "hold"
+        if d and self.streak[1] < need:
+            reason += f"; menunggu konfirmasi {self.streak[1]}/{need}"
+        elif d and self.last_change is not None and now - self.last_change < self.cooldown:
+            reason += f"; cooldown {self.cooldown - (now - self.last_change):.0f}s"
+        elif d:
+            limit = self.baseline if relax else (self.hi if d > 0 else self.lo)
+            new = max(self.lo, min(self.hi, self.value + d * self.step))
+            new = min(new, limit) if d > 0 else max(new, limit)
+            if new == self.value:
+                reason += f"; sudah di batas {self.value}"
+            else:
+                action = "relax" if relax else ("raise" if d > 0 else "lower")
+        return {"action": action, "old": self.value, "new": new, "reason": reason, **sig}
+
+    def commit(self, decision, now):
+        if decision["new"] != self.value:
+            self.value = decision["new"]
+            self.last_change = now
+            self.streak = (0, 0)
+
+
+def _log_decision(path, rec):
+    import json
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(rec, sort_keys=True) + "\n")
+    except OSError as e:
+        print(f"⚠ Gagal menulis log {path}: {e}")
+        return False
+    return True
+
+def swappiness_controller(lo=10, hi=100, interval: float = 2.0, step=10, cooldown: float = 30.0,
+                          confirm=3, psi_high=0.05, psi_low=0.01, baseline=None,
+                          log_path=SWAPPINESS_LOG, duration=None, quiet: bool = False):
+    """Daemon: sampling PSI/refault/swap-in tiap interval lalu sesuaikan vm.swappiness runtime.
+
+    Setiap perubahan dan setiap pergantian alasan 'hold' dicatat ke log (JSON per baris).
+    Nilai persist di SWAPPINESS_CONF tidak diubah; itu menjadi baseline.
+    """
+    if not (0 <= lo < hi <= swappiness_max()) or step <= 0 or interval <= 0:
+        print(f"❌ Batas harus 0 <= min < max <= {swappiness_max()}, step dan interval > 0.")
+        return False
+    cur = _read_sysfs(SWAPPINESS_SYSCTL)
+    if cur is None:
+        print("❌ vm.swappiness tidak terbaca.")
+        return False
+    if baseline is None:
+        conf = read_sysctl_conf().get("vm.swappiness", "")
+        baseline = int(conf) if conf.isdigit() else int(cur)
+    ctl = SwappinessController(lo, hi, max(lo, min(hi, baseline)), step, cooldown, confirm, psi_high, psi_low)
+    ctl.value = int(cur)
+    vmstat, psi = ProcFile("/proc/vmstat"), ProcFile("/proc/pressure/memory")
+    if psi.fd is None and not quiet:
+        print("⚠ PSI tidak tersedia; tekanan diukur dari laju refault/swap-in saja.")
+    sample = lambda: {"t": time.monotonic(), "vmstat": parse_vmstat(vmstat.read(), CONTROLLER_VMSTAT_KEYS),
+                      "psi": parse_psi(psi.read())}
+    if not quiet:
+        print(f"🎛 Controller swappiness [{lo}, {hi}], baseline {ctl.baseline}, sekarang {ctl.value}; "
+              f"log: {log_path} — Ctrl+C untuk berhenti.")
+    prev, last_reason, ok = sample(), None, True
+    start = time.monotonic()
+    try:
+        while duration is None or time.monotonic() - start < duration:
+            time.sleep(interval)
+            cur = sample()
+            sig = SwappinessController.signals(prev, cur)
+            prev = cur
+            if sig is None:
+                continue
+            dec = ctl.decide(sig, cur["t"])
+            if dec["action"] != "hold":
+                applied = DRY_RUN or Plan().write_sysfs(SWAPPINESS_SYSCTL, dec["new"]).execute()
+                if not applied:
+                    dec["action"], dec["new"], ok = "error", dec["old"], False
+                ctl.commit(dec, cur["t"])
+            base = dec["reason"].split(";")[0]
+            if dec["action"] != "hold" or base != last_reason:
+                rec = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       **{k: round(v, 4) if isinstance(v, float) else v for k, v in dec.items()}}
+                _log_decision(log_path, rec)
+                if not quiet:
+                    arrow = f"{dec['old']} -> {dec['new']}" if dec["action"] != "hold" else f"{dec['old']}"
+                    print(f"[{rec['time'][11:]}] {dec['action']:5} swappiness {arrow}: {dec['reason']}")
+                last_reason = base
+    except KeyboardInterrupt:
+        print("\nℹ Controller swappiness dihentikan.")
+    finally:
+        vmstat.close()
+        psi.close()
+    return ok
+
+def install_swappiness_service(lo=10, hi=100, interval: float = 2.0, step=10, cooldown: float = 30.0,
+                               plan=None):
+    """Pasang swappiness-controller.service (systemd) yang menjalankan controller saat boot."""
+    args = [*SELF_ARGV, "swappiness-auto", "--min", str(lo), "--max", str(hi),
+            "--interval", str(interval), "--step", str(step), "--cooldown", str(cooldown), "--quiet"]
+    service = f"""[Unit]
+Description=Controller adaptif vm.swappiness (PSI + refault)
+After=zram.service
+
+[Service]
+Type=simple
+ExecStart={" ".join(shlex.quote(a) for a in args)}
+Restart=on-failure
+
+[Install]
+WantedBy=multi-user.target
+"""
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.write_file(SWAPPINESS_SERVICE, service, mode=0o644)
+    plan.exec(["systemctl", "daemon-reload"], check=False)
+    plan.exec(["systemctl", "enable", "--now", "swappiness-controller.service"], check=False,
+              msg="✅ swappiness-controller.service aktif.")
+    return plan.execute() if own else True
+
+def swappiness_controller_prompt():
+    """Prompt untuk menjalankan / memasang controller adaptif."""
+    lo = input("Batas bawah swappiness (default 10): ").strip() or "10"
+    hi = input("Batas atas swappiness (default 100): ").strip() or "100"
+    if not (lo.isdigit() and hi.isdigit()):
+        print("❌ Input tidak valid.")
+        return
+    if input("Pasang sebagai service systemd (y) atau jalankan di terminal (n)? ").strip().lower() == "y":
+        install_swappiness_service(int(lo), int(hi))
+    else:
+        swappiness_controller(int(lo), int(hi))
+
+
+# -------------------- Dynamic swap (grow/shrink on-demand) --------------------
+DYNSWAP_DIR = "/var/swap"
+DYNSWAP_PREFIX = "swapi-dyn-"
+DYNSWAP_LOG = "/var/log/swapi-dynswap.log"
+DYNSWAP_SERVICE = "/etc/systemd/system/swapi-dynswap.service"
+DYNSWAP_DISK_RESERVE = 1024 * 1024 * 1024  # ruang disk yang harus tetap bebas setelah menambah file
+
+def is_dynamic_swapfile(path: str):
+    """True bila path adalah swapfile tambahan milik daemon dynamic swap (tidak pernah masuk fstab)."""
+    name = os.path.basename(path)
+    return name.startswith(DYNSWAP_PREFIX) and name[len(DYNSWAP_PREFIX):].isdigit()
+
+def dynamic_swapfiles(directory=DYNSWAP_DIR, swaps=None):
+    """Swapfile tambahan di directory, urut indeks -> list dict {path, index, size, active, used_kib, prio}."""
+    live = {os.path.realpath(s["name"]): s for s in (get_swaps_from_proc() if swaps is None else swaps)}
+    try:
+        names = [n for n in os.listdir(directory) if is_dynamic_swapfile(n)]
+    except OSError:
+        return []
+    out = []
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            continue
+        s = live.get(os.path.realpath(path))
+        out.append({"path": path, "index": int(name[len(DYNSWAP_PREFIX):]), "size": size, "active": s is not None,
+                    "used_kib": s["used_kib"] if s else 0, "prio": s["prio"] if s else None})
+    return sorted(out, key=lambda f: f["index"])
+
+class DynamicSwapPolicy:
+    """Keputusan tambah/lepas swapfile tambahan dari pemakaian swap dan MemAvailable.
+
+    grow: swap terpakai >= grow_at persen DAN MemAvailable <= mem_low persen RAM (swap hampir
+    penuh tapi RAM masih lega tidak berisiko OOM), selama file tambahan < max_files.
+    shrink: file tambahan (terbaru dulu) yang used_kib-nya 0 selama `idle` detik, asalkan
+    tanpa file itu pemakaian swap tetap <= shrink_at persen. Antar aksi minimal `cooldown` detik.
+    """
+
+    def __init__(self, max_files=4, grow_at=80.0, mem_low=20.0, shrink_at=50.0, idle=600.0, cooldown=60.0):
+        self.max_files, self.grow_at, self.mem_low = max_files, grow_at, mem_low
+        self.shrink_at, self.idle, self.cooldown = shrink_at, idle, cooldown
+        self.idle_since = {}  # path -> waktu pertama terlihat kosong
+        self.last_action = None
+
+    def decide(self, state, now):
+        """state: {mem_total, mem_avail, swap_total, swap_free (KiB), files} -> dict {action, rule, reason, path, ...}.
+
+        Tidak menulis apa pun; panggil commit() setelah aksi benar-benar dijalankan.
+        """
+        total = state["swap_total"]
+        used = total - state["swap_free"]
+        used_pct = 100.0 * used / total if total else 100.0
+        avail_pct = 100.0 * state["mem_avail"] / state["mem_total"]
+        files = [f for f in state["files"] if f["active"]]
+        self.idle_since = {f["path"]: self.idle_since.get(f["path"], now) for f in files if not f["used_kib"]}
+        dec = {"action": "hold", "rule": "ok", "path": None, "used_pct": round(used_pct, 1),
+               "mem_avail_pct": round(avail_pct, 1), "files": len(files)}
+        wait = self.cooldown - (now - self.last_action) if self.last_action is not None else 0
+        if used_pct >= self.grow_at and avail_pct <= self.mem_low:
+            dec["reason"] = f"swap {used_pct:.0f}% terpakai, MemAvailable {avail_pct:.0f}%"
+            if len(files) >= self.max_files:
+                dec["rule"] = "max-files"
+                dec["reason"] += f"; batas {self.max_files} file tambahan tercapai"
+            elif wait > 0:
+                dec["rule"] = "cooldown"
+                dec["reason"] += f"; cooldown {wait:.0f}s"
+            else:
+                dec["action"] = dec["rule"] = "grow"
+            return dec
+        for f in reversed(files):
+            since = self.idle_since.get(f["path"])
+            if since is None or now - since < self.idle:
+                continue
+            size_kib = f["size"] // 1024
+            after = 0.0 if not used else 100.0 * used / (total - size_kib) if total > size_kib else 100.0
+            dec["path"] = f["path"]
+            dec["reason"] = f"{os.path.basename(f['path'])} kosong >= {self.idle:.0f}s"
+            if after > self.shrink_at:
+                dec["rule"] = "shrink-at"
+                dec["reason"] += f"; tanpa file ini swap {after:.0f}% terpakai (> {self.shrink_at:.0f}%)"
+            elif wait > 0:
+                dec["rule"] = "cooldown"
+                dec["reason"] += f"; cooldown {wait:.0f}s"
+            else:
+                dec["action"] = dec["rule"] = "shrink"
+            return dec
+        dec["reason"] = "dalam batas"
+        return dec
+
+    def commit(self, decision, now):
+        self.last_action = now
+        self.idle_since.pop(decision.get("path"), None)
+
+
+def _dynswap_grow(directory: str, chunk: int, pri, files):
+    """Tambah satu swapfile tambahan lewat jalur create_swapfile (tanpa fstab) -> (ok, path, alasan)."""
+    try:
+        st = os.statvfs(directory)
+    except OSError as e:
+        return False, None, f"direktori {directory}: {e.strerror}"
+    free = st.f_bavail * st.f_frsize
+    if free < chunk + DYNSWAP_DISK_RESERVE:
+        return False, None, f"ruang disk {_fmt_mib(free)} < chunk + cadangan {_fmt_mib(chunk + DYNSWAP_DISK_RESERVE)}"
+    index = max((f["index"] for f in files), default=0) + 1
+    path = os.path.join(directory, f"{DYNSWAP_PREFIX}{index:03d}")
+    if create_swapfile(path, f"{chunk // (1024 * 1024)}M", str(pri), add_to_fstab=False):
+        return True, path, None
+    if not DRY_RUN:
+        Plan().unlink(path, check=False).execute()  # sisa alokasi yang gagal
+    return False, path, "gagal membuat swapfile"
+
+def dynamic_swap_cleanup(directory=DYNSWAP_DIR, plan=None):
+    """Hapus swapfile tambahan yang tidak aktif (sisa boot sebelumnya / daemon yang mati)."""
+    own = plan is None
+    plan = Plan() if own else plan
+    for f in dynamic_swapfiles(directory):
+        if not f["active"]:
+            plan.unlink(f["path"], check=False, msg=f"🧹 {f['path']} (tidak aktif) dihapus.")
+    return plan.execute() if own else True
+
+def dynamic_swap(directory=DYNSWAP_DIR, chunk: str = "1G", max_files: int = 4, grow_at: float = 80.0,
+                 mem_low: float = 20.0, shrink_at: float = 50.0, idle: float = 600.0, cooldown: float = 60.0,
+                 interval: float = 5.0, pri: int = -1, log_path=DYNSWAP_LOG, duration=None, quiet: bool = False):
+    """Daemon: tambah swapfile sebesar chunk saat swap hampir habis, lepas lagi saat kosong & idle.
+
+    File tambahan hidup di directory (swapi-dyn-NNN), dibuat/dihapus lewat create_swapfile /
+    remove_swapfile_by_path dan tidak pernah masuk fstab; sisa file tidak aktif dihapus saat start.
+    Setiap aksi (dan pergantian alasan 'hold') dicatat ke log JSON per baris.
+    """
+    size = parse_size_to_bytes(chunk)
+    if not size or max_files < 1 or interval <= 0 or not (0 <= shrink_at < grow_at <= 100):
+        print("❌ chunk, max-files dan interval harus > 0, serta 0 <= shrink-at < grow-at <= 100.")
+        return False
+    size -= size % PAGE_SIZE
+    if not Plan().mkdir(directory).execute():
+        return False
+    dynamic_swap_cleanup(directory)
+    policy = DynamicSwapPolicy(max_files, grow_at, mem_low, shrink_at, idle, cooldown)
+    meminfo = ProcFile("/proc/meminfo")
+    if not quiet:
+        print(f"📈 Dynamic swap: chunk {_fmt_mib(size)}, maks {max_files} file di {directory}, grow >= {grow_at:.0f}% "
+              f"(MemAvailable <= {mem_low:.0f}%), shrink bila kosong {idle:.0f}s; log: {log_path} — Ctrl+C untuk berhenti.")
+    last_reason, ok = None, True
+    start = time.monotonic()
+    try:
+        while duration is None or time.monotonic() - start < duration:
+            mi = parse_meminfo(meminfo.read())
+            files = dynamic_swapfiles(directory)
+            state = {"mem_total": mi["MemTotal"], "mem_avail": mi["MemAvailable"], "swap_total": mi["SwapTotal"],
+                     "swap_free": mi["SwapFree"], "files": files}
+            now = time.monotonic()
+            dec = policy.decide(state, now)
+            if dec["action"] == "grow":
+                done, dec["path"], err = _dynswap_grow(directory, size, pri, files)
+                if not done:
+                    dec["action"], dec["reason"] = "error", f"{dec['reason']}; {err}"
+                policy.commit(dec, now)  # kegagalan juga ikut rate limit
+            elif dec["action"] == "shrink":
+                if not remove_swapfile_by_path(dec["path"]):
+                    dec["action"], ok = "error", False
+                policy.commit(dec, now)
+            # hold hanya dicatat saat aturan/file yang menahan berganti, bukan tiap sampel
+            base = (dec["rule"], dec["path"]) if dec["action"] == "hold" else None
+            if dec["action"] != "hold" or base != last_reason:
+                rec = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), **dec}
+                _log_decision(log_path, rec)
+                if not quiet:
+                    print(f"[{rec['time'][11:]}] {dec['action']:6} {dec['reason']}")
+                last_reason = base
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nℹ Dynamic swap dihentikan (file tambahan tetap aktif sampai dilepas/reboot).")
+    finally:
+        meminfo.close()
+    return ok
+
+def print_dynamic_swap(directory=DYNSWAP_DIR):
+    files = dynamic_swapfiles(directory)
+    if not files:
+        print(f"ℹ Tidak ada swapfile tambahan di {directory}.")
+        return
+    print(f"{'path':32} {'ukuran':>10} {'terpakai':>10} {'prio':>5}  status")
+    for f in files:
+        print(f"{f['path']:32} {_fmt_mib(f['size']):>10} {_fmt_mib(f['used_kib'] * 1024):>10} "
+              f"{'' if f['prio'] is None else f['prio']:>5}  {'aktif' if f['active'] else 'tidak aktif'}")
+
+def install_dynamic_swap_service(directory=DYNSWAP_DIR, chunk: str = "1G", max_files: int = 4,
+                                 grow_at: float = 80.0, mem_low: float = 20.0, shrink_at: float = 50.0,
+                                 idle: float = 600.0, cooldown: float = 60.0, interval: float = 5.0, plan=None):
+    """Pasang swapi-dynswap.service (systemd) yang menjalankan daemon saat boot."""
+    args = [*SELF_ARGV, "dynswap", "run", "--dir", directory, "--chunk", chunk,
+            "--max-files", str(max_files), "--grow-at", str(grow_at), "--mem-low", str(mem_low),
+            "--shrink-at", str(shrink_at), "--idle", str(idle), "--cooldown", str(cooldown),
+            "--interval", str(interval), "--quiet"]
+    service = f"""[Unit]
+Description=Swapfile tambahan on-demand (grow/shrink)
+After=local-fs.target swap.target
+
+[Service]
+Type=simple
+ExecStart={" ".join(shlex.quote(a) for a in args)}
+Restart=on-failure
+
+[Install]
+WantedBy=multi-user.target
+"""
+    own = plan is None
+    plan = Plan() if own else plan
+    plan.write_file(DYNSWAP_SERVICE, service, mode=0o644)
+    plan.exec(["systemctl", "daemon-reload"], check=False)
+    plan.exec(["systemctl", "enable", "--now", "swapi-dynswap.service"], check=False,
+              msg="✅ swapi-dynswap.service aktif.")
+    return plan.execute() if own else True
+
+
+# -------------------- Benchmark harness --------------------
+BENCH_PATTERNS = ("seq", "random", "zipf")
+BENCH_CGROUP = "swapi-bench"
+MADV_PAGEOUT = 21  # belum diekspor modul mmap di sebagian build Python
+
+def _cpu_busy_seconds():
+    """Total waktu CPU sibuk semua core (baris 'cpu' /proc/stat, tanpa idle & iowait) dalam detik."""
+    f = (_read_sysfs("/proc/stat") or "cpu 0").splitlines()[0].split()[1:]
+    vals = [int(v) for v in f[:8]]
+    return (sum(vals) - vals[3] - (vals[4] if len(vals) > 4 else 0)) / os.sysconf("SC_CLK_TCK")
+
+def _phase_counters():
+    import resource
+    ru = resource.getrusage(resource.RUSAGE_SELF)
+    vm = parse_vmstat(_read_sysfs("/proc/vmstat") or "", ("pswpin", "pswpout"))
+    return {"t": time.perf_counter(), "utime": ru.ru_utime, "stime": ru.ru_stime, "majflt": ru.ru_majflt,
+            "pswpin": vm.get("pswpin", 0), "pswpout": vm.get("pswpout", 0), "cpu": _cpu_busy_seconds()}
+
+def _phase_delta(a, b):
+    dt = b["t"] - a["t"]
+    return {
+        "seconds": round(dt, 4),
+        "swapout_mib_s": round((b["pswpout"] - a["pswpout"]) * PAGE_SIZE / 2**20 / dt, 2) if dt else 0,
+        "swapin_mib_s": round((b["pswpin"] - a["pswpin"]) * PAGE_SIZE / 2**20 / dt, 2) if dt else 0,
+        "majflt": b["majflt"] - a["majflt"],
+        "proc_cpu_s": {"user": round(b["utime"] - a["utime"], 4), "sys": round(b["stime"] - a["stime"], 4)},
+        "system_cpu_s": round(b["cpu"] - a["cpu"], 3),
+    }
+
+def access_order(pattern: str, npages: int, accesses: int, seed: int = 1, zipf_s: float = 1.0):
+    """Urutan indeks page: seq (melingkar), random (uniform), zipf (rank acak ke page, bobot 1/k^s)."""
+    import random
+    rnd = random.Random(seed)
+    if pattern == "seq":
+        return [i % npages for i in range(accesses)]
+    if pattern == "random":
+        return [rnd.randrange(npages) for _ in range(accesses)]
+    if pattern == "zipf":
+        import itertools
+        pages = list(range(npages))
+        rnd.shuffle(pages)  # page panas tersebar, bukan berurutan di awal region
+        cum = list(itertools.accumulate(1.0 / (k ** zipf_s) for k in range(1, npages + 1)))
+        return rnd.choices(pages, cum_weights=cum, k=accesses)
+    raise ValueError(f"pola tidak dikenal: {pattern}")
+
+def latency_summary(lat):
+    """Persentil & histogram log2 (ns) dari daftar latensi akses."""
+    s = sorted(lat)
+    pct = lambda p: s[min(len(s) - 1, int(len(s) * p))]
+    hist = {}
+    for v in s:
+        b = 1 << max(v, 1).bit_length()
+        hist[b] = hist.get(b, 0) + 1
+    return {"count": len(s), "p50_ns": pct(0.50), "p90_ns": pct(0.90), "p99_ns": pct(0.99),
+            "p999_ns": pct(0.999), "max_ns": s[-1], "mean_ns": round(sum(s) / len(s)),
+            "histogram_le_ns": {str(k): v for k, v in sorted(hist.items())}}
+
+def bench_workload(size: int, pattern: str, accesses: int, write_ratio: float = 0.25, seed: int = 1,
+                   pageout: bool = False):
+    """Workload di proses ini: isi region anonim (swap-out), lalu akses per pola sambil mengukur latensi.
+
+    Isi page diambil dari korpus sintetis agar kompresibilitasnya realistis bagi zram/zswap.
+    pageout=True (tanpa cgroup) memaksa swap-out dengan madvise(MADV_PAGEOUT).
+    """
+    import array
+    import mmap
+    import random
+    npages = size // PAGE_SIZE
+    corpus = build_synthetic_corpus(256, seed)
+    order = access_order(pattern, npages, accesses, seed)
+    rnd = random.Random(seed + 1)
+    writes = [rnd.random() < write_ratio for _ in range(accesses)]
+    lat = array.array("Q")
+    m = mmap.mmap(-1, npages * PAGE_SIZE, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    c0 = _phase_counters()
+    for i in range(npages):
+        off, src = i * PAGE_SIZE, (i % 256) * PAGE_SIZE
+        m[off:off + PAGE_SIZE] = corpus[src:src + PAGE_SIZE]
+    if pageout:
+        m.madvise(getattr(mmap, "MADV_PAGEOUT", MADV_PAGEOUT))
+    c1 = _phase_counters()
+    pc = time.perf_counter_ns
+    for idx, w in zip(order, writes):
+        off = idx * PAGE_SIZE
+        t = pc()
+        if w:
+            m[off] = 1
         else:
-            parts.append(name)
-    return {'zram': zram, 'files': files, 'parts': parts}
+            m[off]
+        lat.append(pc() - t)
+    c2 = _phase_counters()
+    # overhead pengukuran sendiri (dua panggilan timer + loop) sebagai lantai latensi
+    base = []
+    for _ in range(2000):
+        t = pc()
+        base.append(pc() - t)
+    m.close()
+    return {"populate": _phase_delta(c0, c1), "access": _phase_delta(c1, c2),
+            "latency": latency_summary(lat), "timer_overhead_ns": sorted(base)[len(base) // 2]}
 
-def pick_from_list(title, items):
-    """Pilih satu item dari list, return path terpilih atau None kalau batal."""
-    if not items:
-        return None
-    print(f"\n{title}")
-    for i, v in enumerate(items, 1):
-        print(f"{i}. {v}")
-    print("0. Batal")
-    sel = input("Pilih: ").strip()
-    if sel == "0":
+def _bench_cgroup(limit: int):
+    """Buat cgroup ber-limit memori untuk workload -> (versi, path) atau None (bukan root / tanpa memcg)."""
+    if os.geteuid() != 0:
         return None
-    if sel.isdigit() and 1 <= int(sel) <= len(items):
-        return items[int(sel) - 1]
-    print("❌ Pilihan tidak valid.")
+    name = f"{BENCH_CGROUP}-{os.getpid()}"
+    root = cgroup2_root()
+    try:
+        if root and "memory" in (_read_sysfs(f"{root}/cgroup.controllers") or "").split():
+            if "memory" not in (_read_sysfs(f"{root}/cgroup.subtree_control") or "").split():
+                _write_file(f"{root}/cgroup.subtree_control", "+memory")
+            path = os.path.join(root, name)
+            os.mkdir(path)
+            _write_file(f"{path}/memory.max", str(limit))
+            _write_file(f"{path}/memory.swap.max", "max")
+            return "v2", path
+        v1 = "/sys/fs/cgroup/memory"
+        if os.path.isdir(v1):
+            path = os.path.join(v1, name)
+            os.mkdir(path)
+            _write_file(f"{path}/memory.limit_in_bytes", str(limit))
+            return "v1", path
+    except OSError as e:
+        print(f"⚠ Gagal membuat cgroup benchmark: {e}")
     return None
 
+def _cgroup_stats(kind, path):
+    if kind == "v2":
+        ev = dict(line.split() for line in (_read_sysfs(f"{path}/memory.events") or "").splitlines())
+        return {"memory_peak": _cg_value(_read_sysfs(f"{path}/memory.peak")),
+                "swap_peak": _cg_value(_read_sysfs(f"{path}/memory.swap.peak")),
+                "limit_hits": int(ev.get("max", 0)), "oom_kill": int(ev.get("oom_kill", 0))}
+    return {"memory_peak": _cg_value(_read_sysfs(f"{path}/memory.max_usage_in_bytes")),
+            "limit_hits": _cg_value(_read_sysfs(f"{path}/memory.failcnt"))}
 
-# -------------------- Actions --------------------
-def check_swap():
-    swapon = find_cmd("swapon")
-    if swapon:
-        code, out, err = run(f"{swapon} --show")
-        if out:
-            print("\n=== Info Swap (swapon) ===")
-            print(out)
-        else:
-            print("Tidak ada swap aktif (swapon).")
-    else:
-        print("\n⚠ 'swapon' tidak ditemukan, fallback ke 'free -h':")
-        _, out, _ = run("free -h")
-        print(out)
+def bench_run(pattern: str, size: int, limit: int, accesses: int, write_ratio: float = 0.25, seed: int = 1):
+    """Satu run di proses anak (di dalam cgroup ber-limit bila bisa) -> dict hasil."""
+    import json
+    cg = _bench_cgroup(limit)
+    r, w = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(r)
+        code = 0
+        try:
+            if cg:
+                _write_file(f"{cg[1]}/cgroup.procs", str(os.getpid()))
+            res = bench_workload(size, pattern, accesses, write_ratio, seed, pageout=cg is None)
+        except BaseException as e:
+            res, code = {"error": str(e)}, 1
+        with os.fdopen(w, "w") as f:
+            json.dump(res, f)
+        os._exit(code)
+    os.close(w)
+    with os.fdopen(r) as f:
+        data = f.read()
+    _, status = os.waitpid(pid, 0)
+    res = json.loads(data) if data else {}
+    if os.WIFSIGNALED(status):
+        res["error"] = f"workload mati oleh sinyal {os.WTERMSIG(status)} (OOM? swap kosong tidak cukup)"
+    res.update({"pattern": pattern, "size": size, "limit": limit if cg else None, "accesses": accesses,
+                "write_ratio": write_ratio, "seed": seed, "pressure": f"cgroup-{cg[0]}" if cg else "madv_pageout"})
+    if cg:
+        res["cgroup"] = _cgroup_stats(*cg)
+        try:
+            os.rmdir(cg[1])
+        except OSError:
+            pass
+    return res
 
-    swaps = get_swaps_from_proc()
-    if swaps:
-        print("\n=== Detail /proc/swaps ===")
-        print("Filename\t\tType\tSize(MiB)\tUsed(MiB)\tPrio")
-        for s in swaps:
-            print(f"{s['name']}\t{s['type']}\t{int(s['size_kib']/1024)}\t\t{int(s['used_kib']/1024)}\t\t{s['prio']}")
+def _ns_per_op(fn, min_time: float = 0.1, repeat: int = 3):
+    """Waktu per panggilan (ns), minimum dari beberapa ulangan; jumlah iterasi dilipatgandakan hingga min_time."""
+    n = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= min_time:
+            break
+        n *= 2
+    best = dt / n
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, (time.perf_counter() - t0) / n)
+    return round(best * 1e9, 1)
 
+def micro_bench():
+    """Microbenchmark jalur panas tool sendiri (ns/op) pada data sintetis berukuran tetap."""
+    swaps_text = "Filename\tType\tSize\tUsed\tPriority\n" + "".join(
+        f"/swap/file{i}\tfile\t{1 << 20}\t{i * 1024}\t{-2 - i}\n" for i in range(64))
+    fstab_text = "".join(f"UUID={i:08x}-0000-0000-0000-000000000000 /mnt/d{i} ext4 defaults 0 2\n"
+                         for i in range(200)) + "/swapfile none swap sw,pri=-2 0 0\n"
+    sizes = ("8G", "512M", "4096", "1.5g", "64k", "bogus")
 
-def add_swap():
-    path = (input("Path swapfile (default: /swapfile): ").strip() or "/swapfile")
-    size_str = input("Ukuran (contoh 8G atau 4096M): ").strip()
-    mib = parse_size_to_mib(size_str)
-    if not mib:
-        print("❌ Ukuran tidak valid. Contoh benar: 8G, 4096M")
+    def fstab_edit():
+        fs = Fstab(fstab_text, path="/nonexistent")
+        fs.set_swap("/swapfile", 10)
+        fs.set_swap("/swapfile2", -1)
+        fs.remove("/swapfile2")
+        return fs.render()
+
+    cases = {
+        "get_swaps_from_proc": get_swaps_from_proc,
+        "parse_proc_swaps (64 entri)": lambda: parse_proc_swaps(swaps_text),
+        "parse_size_to_bytes (6 input)": lambda: [parse_size_to_bytes(s) for s in sizes],
+        "fstab edit (201 baris, 3 edit + render)": fstab_edit,
+        "system_snapshot() (cache)": system_snapshot,
+    }
+    return {name: _ns_per_op(fn) for name, fn in cases.items()}
+
+def bench_meta():
+    snap = system_snapshot()
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "kernel": os.uname().release,
+            "page_size": PAGE_SIZE, "cpus": os.cpu_count(),
+            "swaps": [dict(s) for s in snap.swaps],
+            "zram": {d: z.get("algorithm") for d, z in snap.zram.items() if z.get("disksize")},
+            "zswap": zswap_params() if zswap_supported() else None, "sysctl": snap.sysctl}
+
+def bench(patterns=BENCH_PATTERNS, size=None, limit=None, accesses: int = 100000, write_ratio: float = 0.25,
+          seed: int = 1, micro: bool = True, output=None, quiet: bool = False):
+    """Jalankan workload per pola (+ microbenchmark) -> dict hasil; opsional tulis JSON ke output."""
+    import json
+    mem = parse_meminfo(_read_sysfs("/proc/meminfo") or "")
+    limit = limit or min(256 << 20, mem.get("MemAvailable", 0) * 1024 // 4)
+    size = size or limit * 2
+    need = (size - limit) // 1024
+    if mem.get("SwapFree", 0) < need:
+        print(f"⚠ SwapFree {_fmt_mib(mem.get('SwapFree', 0) * 1024)} < {_fmt_mib(need * 1024)} yang akan "
+              f"ter-swap; workload bisa kena OOM.")
+    result = {"meta": bench_meta(), "runs": []}
+    for pat in patterns:
+        if not quiet:
+            print(f"▶ {pat}: region {_fmt_mib(size)}, limit {_fmt_mib(limit)}, {accesses} akses ...", flush=True)
+        run = bench_run(pat, size, limit, accesses, write_ratio, seed)
+        result["runs"].append(run)
+        if not quiet:
+            print_bench_run(run)
+    if micro:
+        result["micro_ns_per_op"] = micro_bench()
+        if not quiet:
+            for name, ns in result["micro_ns_per_op"].items():
+                print(f"  {name:42} {ns:>12,.0f} ns/op")
+    if output:
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+        if not quiet:
+            print(f"✅ Hasil ditulis ke {output}")
+    return result
+
+def print_bench_run(run):
+    if "error" in run:
+        print(f"  ❌ {run['error']}")
         return
+    lat, acc, pop = run["latency"], run["access"], run["populate"]
+    print(f"  latensi akses p50 {lat['p50_ns'] / 1000:.1f}µs  p99 {lat['p99_ns'] / 1000:.1f}µs  "
+          f"p99.9 {lat['p999_ns'] / 1000:.1f}µs  max {lat['max_ns'] / 1000:.0f}µs  "
+          f"(overhead timer {run['timer_overhead_ns']}ns)")
+    print(f"  swap-out {pop['swapout_mib_s']} MiB/s saat populate, swap-in {acc['swapin_mib_s']} MiB/s, "
+          f"majflt {acc['majflt']}, CPU proses {acc['proc_cpu_s']['user']}s usr + {acc['proc_cpu_s']['sys']}s sys, "
+          f"CPU sistem {acc['system_cpu_s']}s")
 
-    print(f"\n[Membuat] {path} sebesar {size_str} ...")
-    code, _, _ = run(f"{SUDO} fallocate -l {size_str} {path}")
-    if code != 0:
-        print("fallocate gagal, fallback ke dd (lebih lama)...")
-        code, _, err = run(f"{SUDO} dd if=/dev/zero of={path} bs=1M count={mib} status=progress")
-        if code != 0:
-            print("❌ Gagal membuat swapfile:", err)
-            return
+BENCH_COMPARE_KEYS = (("latency", "p50_ns", -1), ("latency", "p99_ns", -1), ("access", "swapin_mib_s", 1),
+                      ("populate", "swapout_mib_s", 1), ("access", "system_cpu_s", -1))
 
-    run(f"{SUDO} chmod 600 {path}")
-    run(f"{SUDO} mkswap {path}")
+def bench_compare(old, new, threshold: float = 10.0):
+    """Bandingkan dua hasil JSON per pola & microbenchmark; True bila tidak ada regresi > threshold %."""
+    ok = True
 
-    swapon = find_cmd("swapon")
-    if swapon:
-        run(f"{SUDO} {swapon} {path}")
-        print("✅ Swapfile diaktifkan.")
-    else:
-        print("⚠ 'swapon' tidak ditemukan. Swap akan aktif setelah reboot jika ditambahkan ke fstab.")
+    def row(label, a, b, better):
+        nonlocal ok
+        if not a or b is None:
+            return
+        change = (b - a) / a * 100
+        worse = change * better < -threshold
+        ok = ok and not worse
+        print(f"{'❌' if worse else ' '} {label:48} {a:>12,.1f} {b:>12,.1f} {change:+7.1f}%")
 
-    ans = input("Tambahkan ke /etc/fstab agar permanen? (y/n): ").strip().lower()
-    if ans == "y":
-        pri = input("Set priority? (mis. -1, kosong = tanpa pri): ").strip()
-        opts = "defaults" + (f",pri={pri}" if pri else "")
-        run(f"echo '{path} none swap {opts} 0 0' | {SUDO} tee -a /etc/fstab > /dev/null")
-        print("✅ Ditambahkan ke /etc/fstab.")
+    print(f"  {'metrik':48} {'lama':>12} {'baru':>12}  ubah")
+    old_runs = {r["pattern"]: r for r in old.get("runs", []) if "error" not in r}
+    for r in new.get("runs", []):
+        o = old_runs.get(r["pattern"])
+        if o is None or "error" in r:
+            continue
+        for sec, key, better in BENCH_COMPARE_KEYS:
+            row(f"{r['pattern']}: {sec}.{key}", o[sec][key], r[sec][key], better)
+    for name, ns in new.get("micro_ns_per_op", {}).items():
+        row(f"micro: {name}", old.get("micro_ns_per_op", {}).get(name), ns, -1)
+    return ok
 
 
-def remove_swap():
-    path = (input("Path swapfile yang dihapus (default: /swapfile): ").strip() or "/swapfile")
-    print(f"\n[Hapus] {path} ...")
-    swapoff = find_cmd("swapoff")
-    if swapoff:
-        run(f"{SUDO} {swapoff} {path}")
-    else:
-        run(f"{SUDO} swapoff {path}")  # best effort
+# -------------------- Reconciler (desired state) --------------------
+# Spec JSON:
+# {"zram": [{"size": "2G", "algorithm": "zstd", "priority": 100, "topology": "cpu"}],
+#  "swapfiles": [{"path": "/swapfile", "size": "8G", "priority": -1}],
+#  "swappiness": 60, "prune": false}
+# Daftar zram bersifat otoritatif (device zram di luar spec dilepas); swapfile di luar spec
+# hanya dihapus bila "prune": true.
+ZRAM_SIZE_TOLERANCE = 0.10
 
-    run(f"{SUDO} sed -i '#{path}#d' /etc/fstab")
-    run(f"{SUDO} rm -f {path}")
-    print("✅ Swapfile dihapus & fstab dibersihkan.")
+def load_spec(path: str):
+    import json
+    with open(path) as f:
+        return json.load(f)
 
+def validate_spec(spec):
+    """Kembalikan list pesan error (kosong = valid); ukuran dinormalkan ke byte di spec['_bytes']."""
+    errors = []
+    if not isinstance(spec, dict):
+        return ["spec harus object JSON"]
+    for kind in ("zram", "swapfiles"):
+        for i, ent in enumerate(spec.get(kind) or []):
+            if not isinstance(ent, dict) or not parse_size_to_bytes(str(ent.get("size", ""))):
+                errors.append(f"{kind}[{i}]: size tidak valid")
+            elif kind == "swapfiles" and not str(ent.get("path", "")).startswith("/"):
+                errors.append(f"{kind}[{i}]: path harus absolut")
+            elif not isinstance(ent.get("priority", -1), int):
+                errors.append(f"{kind}[{i}]: priority harus integer")
+            elif kind == "zram":
+                try:
+                    zram_topology_count(ent.get("topology"))
+                except ValueError as e:
+                    errors.append(f"{kind}[{i}]: {e}")
+    sw = spec.get("swappiness")
+    if sw is not None and not (isinstance(sw, int) and 0 <= sw <= swappiness_max()):
+        errors.append(f"swappiness harus integer 0-{swappiness_max()}")
+    return errors
 
-def set_swap_priority():
-    swaps = get_swaps_from_proc()
-    if not swaps:
-        print("❌ Tidak ada swap aktif.")
+def _plan_swapfile(path, size, pri, ent, snap, plan, changes):
+    live = snap.get(path)
+    # prioritas negatif/tanpa prioritas = otomatis: kernel memberi -2, -3, ... yang tidak bisa di-set,
+    # jadi prioritas runtime & pri= fstab tidak dibandingkan (kalau dibandingkan, selalu drift)
+    auto = pri is None or pri < 0
+    size = size // PAGE_SIZE * PAGE_SIZE  # allocate membulatkan ke page
+    try:
+        cur_size = os.stat(path).st_size
+    except OSError:
+        cur_size = None
+    if cur_size is None:
+        changes.append(f"swapfile {path}: buat {_fmt_mib(size)} pri={pri}")
+        create_swapfile(path, str(ent["size"]), str(pri), plan=plan)
         return
+    if cur_size != size:
+        changes.append(f"swapfile {path}: resize {_fmt_mib(cur_size)} -> {_fmt_mib(size)}")
+        resize_swapfile_path(path, str(ent["size"]), plan=plan, pri=pri)
+        return
+    if live is None:
+        # file sudah ada & ukurannya cocok: cukup tulis ulang header lalu aktifkan
+        changes.append(f"swapfile {path}: aktifkan (pri={pri})")
+        plan.chmod(path).mkswap(path, keep_ids=True).verify_swap(path).swapon(path, pri)
+    elif not auto and live["prio"] != pri:
+        changes.append(f"swapfile {path}: prioritas {live['prio']} -> {pri}")
+        plan.swapoff(path).swapon(path, pri)
+    if snap.fstab is None or not snap.fstab.find_swap(path) or (not auto and snap.fstab.get_pri(path) != pri):
+        changes.append(f"fstab {path}: pri={'otomatis' if auto else pri}")
+        fstab_set_swap(plan, path, None if auto else pri)
 
-    print("\nSwap aktif:")
-    for i, s in enumerate(swaps, 1):
-        size_gib = s['size_kib'] / 1024 / 1024
-        used_gib = s['used_kib'] / 1024 / 1024
-        print(f"{i}. {s['name']} ({s['type']})  size≈{size_gib:.2f}GiB  used≈{used_gib:.2f}GiB  prio={s['prio']}")
+def _plan_swapfiles(spec, snap, plan, changes):
+    # satu lane per disk: swapfile di disk berbeda dialokasikan & diaktifkan paralel
+    wanted = set()
+    for ent in spec.get("swapfiles") or []:
+        path, size = ent["path"], parse_size_to_bytes(str(ent["size"]))
+        pri = ent.get("priority", -1)
+        path = resolve_swapfile(path)
+        wanted.add(os.path.realpath(path))
+        with plan.lane(swap_lane(path)):
+            _plan_swapfile(path, size, pri, ent, snap, plan, changes)
+    if spec.get("prune"):
+        for s in snap.swaps:
+            if s["type"].lower() == "file" and s["realpath"] not in wanted and not is_dynamic_swapfile(s["name"]):
+                changes.append(f"swapfile {s['name']}: hapus (tidak ada di spec)")
+                remove_swapfile_by_path(s["name"], plan=plan)
 
-    sel = input("Pilih nomor target: ").strip()
-    if not sel.isdigit() or not (1 <= int(sel) <= len(swaps)):
-        print("❌ Pilihan tidak valid.")
+def _plan_zram(spec, snap, plan, changes):
+    if "zram" not in spec:
         return
+    live = [{"dev": s["name"], "prio": s["prio"], "disksize": snap.zram.get(s["name"], {}).get("disksize", 0),
+             "algorithm": snap.zram.get(s["name"], {}).get("algorithm")}
+            for s in snap.swaps if "zram" in s["name"]]
+    live.sort(key=lambda z: z["dev"])
+    entries = [dict(ent, bytes=parse_size_to_bytes(str(ent["size"])), priority=ent.get("priority", 100))
+               for ent in spec["zram"] or []]
+    pools = []
+    # 1) klaim device yang algoritma & prioritasnya sudah cocok
+    for ent in entries:
+        pool = [z for z in live if z["prio"] == ent["priority"]
+                and (not ent.get("algorithm") or z["algorithm"] == ent["algorithm"])]
+        for z in pool:
+            live.remove(z)
+        pools.append(pool)
+    # 2) entri tanpa device: adopsi device sisa yang algoritmanya cocok (cukup ganti prioritas)
+    for ent, pool in zip(entries, pools):
+        if pool:
+            continue
+        for z in list(live):
+            if not ent.get("algorithm") or z["algorithm"] == ent["algorithm"]:
+                changes.append(f"zram {z['dev']}: prioritas {z['prio']} -> {ent['priority']}")
+                plan.swapoff(z["dev"]).swapon(z["dev"], ent["priority"])
+                live.remove(z)
+                pool.append(z)
+                break
+    # 3) device zram di luar spec dilepas
+    for z in live:
+        changes.append(f"zram {z['dev']}: lepas (tidak ada di spec)")
+        zram_remove_ops(plan, z["dev"])
+    # 4) samakan total ukuran per entri: tumbuh lewat device tambahan, susut lewat lepas/reset.
+    # runtime: device milik tiap entri setelah plan (template "/dev/${var}" untuk device baru)
+    n_new, runtime = 0, []
+    for ent, pool in zip(entries, pools):
+        devs = [z["dev"] for z in pool]
+        runtime.append(devs)
+        target, total = ent["bytes"], sum(z["disksize"] for z in pool)
+        lo, hi = target * (1 - ZRAM_SIZE_TOLERANCE), target * (1 + ZRAM_SIZE_TOLERANCE)
+        if total < lo:
+            # belum ada device: buat set sesuai topologi; sudah ada: tumbuh lewat satu device tambahan
+            count = 1 if pool else zram_topology_count(ent.get("topology"), target - total)
+            for size in split_zram_size((target - total) // PAGE_SIZE * PAGE_SIZE, count):
+                n_new += 1
+                changes.append(f"zram: tambah device {_fmt_mib(size)} pri={ent['priority']}"
+                               + (f" ({ent['algorithm']})" if ent.get("algorithm") else ""))
+                devs.append(zram_add_ops(plan, size, ent["priority"], ent.get("algorithm"),
+                                         var=f"zram_new{n_new}"))
+        elif total > hi:
+            pool = sorted(pool, key=lambda z: z["disksize"])
+            while len(pool) > 1 and total - pool[0]["disksize"] >= lo:
+                z = pool.pop(0)
+                total -= z["disksize"]
+                changes.append(f"zram {z['dev']}: lepas (susut)")
+                zram_remove_ops(plan, z["dev"])
+                devs.remove(z["dev"])
+            if total > hi:
+                z = pool[-1]
+                new = (target - (total - z["disksize"])) // PAGE_SIZE * PAGE_SIZE
+                changes.append(f"zram {z['dev']}: resize {_fmt_mib(z['disksize'])} -> {_fmt_mib(new)}")
+                # zram.service dipersist di bawah (device pengganti bila resize bertahap)
+                dev = resize_zram(z["dev"], f"{new // 1024}K", plan=plan, update_service=False)
+                if dev:
+                    devs[devs.index(z["dev"])] = dev
 
-    target = swaps[int(sel) - 1]['name']
-    new_pri = input("Masukkan prioritas baru (mis. -1..100): ").strip()
-    if new_pri == "":
-        print("❌ Prioritas kosong.")
+    # persist: zram.service mengikuti entri pertama spec, dengan device yang benar-benar dipakai plan
+    # (ExecStop hanya me-reset device miliknya); mem_limit/backing_dev/rekompresi unit lama dipertahankan
+    if entries:
+        ent, devs = entries[0], runtime[0]
+        svc = read_zram_service()
+        stale = bool(devs) and (not svc or (svc["bytes_size"], svc["priority"], svc["algorithm"],
+                                            sorted(svc["devices"])) !=
+                                (ent["bytes"], ent["priority"], ent.get("algorithm"), sorted(devs)))
+        if stale:
+            changes.append("zram.service: " + ("perbarui" if svc else "buat"))
+            svc = svc or {}
+            plan.write_file(ZRAM_SERVICE, render_zram_service(devs, ent["bytes"], ent["priority"],
+                                                              svc.get("mem_limit"), ent.get("algorithm"),
+                                                              svc.get("recomp"),
+                                                              backing_dev=svc.get("backing_dev")),
+                            mode=0o644)
+            plan.exec(["systemctl", "daemon-reload"], check=False)
+        # unit yang tidak di-enable tidak aktif saat boot
+        if stale or (devs and not os.path.lexists(ZRAM_SERVICE_WANTS)):
+            if not stale:
+                changes.append("zram.service: enable")
+            plan.exec(["systemctl", "enable", "zram.service"], check=False)
+    elif os.path.exists(ZRAM_SERVICE):
+        changes.append("zram.service: hapus (spec tanpa zram)")
+        plan.exec(["systemctl", "disable", "zram.service"], check=False)
+        plan.unlink(ZRAM_SERVICE)
+
+def _plan_swappiness(spec, snap, plan, changes):
+    want = spec.get("swappiness")
+    if want is None:
         return
+    if snap.sysctl.get("swappiness") != want or read_sysctl_conf().get("vm.swappiness") != str(want):
+        changes.append(f"vm.swappiness: {snap.sysctl.get('swappiness')} -> {want}")
+        set_swappiness(want, plan=plan)
 
-    swapoff = find_cmd("swapoff")
-    swapon = find_cmd("swapon")
+def plan_reconcile(spec, snap=None):
+    """Bandingkan spec dengan state live -> (Plan, daftar perubahan). Daftar kosong = sudah sesuai."""
+    snap = snap or system_snapshot()
+    plan, changes = Plan(), []
+    with plan.lane("zram"):
+        _plan_zram(spec, snap, plan, changes)
+    _plan_swapfiles(spec, snap, plan, changes)
+    with plan.lane("sysctl"):
+        _plan_swappiness(spec, snap, plan, changes)
+    return plan, changes
 
-    if swapon and swapoff:
-        run(f"{SUDO} {swapoff} {target}")
-        code, _, err = run(f"{SUDO} {swapon} --priority {new_pri} {target}")
-        if code != 0:
-            code2, _, err2 = run(f"{SUDO} {swapon} -p {new_pri} {target}")
-            if code2 != 0:
-                print("❌ Gagal mengaktifkan dengan prioritas baru:", (err or err2))
-                return
-        print("✅ Prioritas runtime diubah.")
-    else:
-        print("⚠ 'swapon/swapoff' tidak ditemukan. Akan memperbarui konfigurasi permanen saja.")
+def reconcile(spec, apply: bool = True):
+    """Terapkan hanya perubahan minimal menuju spec. Kembalikan (ok, changes); idempoten."""
+    errors = validate_spec(spec)
+    if errors:
+        for e in errors:
+            print(f"❌ Spec: {e}")
+        return False, []
+    plan, changes = plan_reconcile(spec)
+    if not changes:
+        print("✅ State sudah sesuai spec (tidak ada perubahan).")
+        return True, []
+    print("Perubahan yang diperlukan:")
+    for c in changes:
+        print(f"  • {c}")
+    if not apply:
+        return True, changes
+    return plan.execute(), changes
 
-    if "/zram" in target:
-        print("ℹ ZRAM tidak dikonfigurasi via /etc/fstab. Untuk persist, atur di zram-generator (override.conf).")
+
+# -------------------- Library API & CLI --------------------
+STARTUP_BUDGET_MS = 150  # batas median cold start `status --json` (lihat subcommand startup-bench)
+EXIT_OK, EXIT_FAIL, EXIT_USAGE, EXIT_DRIFT = 0, 1, 2, 3
+
+def swap_status():
+    """State swap lengkap sebagai dict (dasar `status --json` & SwapManager.status())."""
+    snap = system_snapshot()
+    try:
+        with open("/proc/meminfo") as f:
+            mem = parse_meminfo(f.read())
+    except OSError:
+        mem = {}
+    fstab = []
+    for item in snap.fstab.lines if snap.fstab else []:
+        e = item["entry"]
+        if e and e["vfstype"] == "swap":
+            fstab.append({"spec": e["spec"], "options": e["options"], "pri": fstab_entry_pri(e)})
+    return {
+        "swaps": [dict(s) for s in snap.swaps],
+        "fstab": fstab,
+        "zram": snap.zram,
+        "sysctl": snap.sysctl,
+        "zswap": zswap_params(),
+        "memory_kib": mem,
+    }
+
+def print_status(st):
+    swaps = st["swaps"]
+    if not swaps:
+        print("Tidak ada swap aktif.")
     else:
-        run(f"{SUDO} sed -i '#{re.escape(target)}#d' /etc/fstab")
-        run(f"echo '{target} none swap defaults,pri={new_pri} 0 0' | {SUDO} tee -a /etc/fstab > /dev/null")
-        print("✅ /etc/fstab diperbarui.")
+        print(f"{'NAME':<28}{'TYPE':<11}{'SIZE':>12}{'USED':>12}{'PRIO':>6}")
+        for s in swaps:
+            print(f"{s['name']:<28}{s['type']:<11}{_fmt_mib(s['size_kib'] * 1024):>12}"
+                  f"{_fmt_mib(s['used_kib'] * 1024):>12}{s['prio']:>6}")
+    for e in st["fstab"]:
+        print(f"fstab: {e['spec']} ({','.join(e['options'])})")
+    for dev, z in st["zram"].items():
+        if z["disksize"]:
+            print(f"zram : {dev} {_fmt_mib(z['disksize'])} {z['algorithm'] or ''}")
+    if "swappiness" in st["sysctl"]:
+        print(f"vm.swappiness = {st['sysctl']['swappiness']}")
+    zs = st.get("zswap") or {}
+    if zs.get("enabled") in ("Y", "1"):
+        print(f"zswap: aktif ({zs.get('compressor')}, max_pool {zs.get('max_pool_percent')}%)")
 
 
-# -------------------- Resize swapfile --------------------
-def resize_swapfile():
-    path = (input("Path swapfile yang ingin di-resize (default: /swapfile): ").strip() or "/swapfile")
-    if not os.path.exists(path):
-        print("❌ Swapfile tidak ditemukan.")
-        return
+class SwapManager:
+    """API Python untuk operasi swap tanpa prompt.
 
-    new_size = input("Ukuran baru (contoh 12G atau 6144M): ").strip()
-    mib = parse_size_to_mib(new_size)
-    if not mib:
-        print("❌ Ukuran tidak valid.")
-        return
+    Semua mutasi lewat Plan (satu helper privileged per aksi) dan mengembalikan bool.
+    dry_run=True hanya mencetak rencana operasi.
+    """
 
-    # simpan prioritas lama (runtime/fstab)
-    old_pri = get_priority_for(path)
+    def __init__(self, dry_run: bool = False):
+        self.dry_run = dry_run
 
-    print(f"\n[Resize] {path} -> {new_size}")
-    swapoff = find_cmd("swapoff")
-    if swapoff:
-        run(f"{SUDO} {swapoff} {path}")
-    else:
-        run(f"{SUDO} swapoff {path}")
-
-    # Resize menggunakan fallocate; bila gagal fallback dd (overwrite)
-    code, _, _ = run(f"{SUDO} fallocate -l {new_size} {path}")
-    if code != 0:
-        print("fallocate gagal, fallback ke dd ...")
-        code, _, err = run(f"{SUDO} dd if=/dev/zero of={path} bs=1M count={mib} status=progress")
-        if code != 0:
-            print("❌ Gagal resize:", err)
-            return
+    def _run(self, fn, *args, **kwargs):
+        global DRY_RUN
+        prev = DRY_RUN
+        DRY_RUN = prev or self.dry_run
+        try:
+            return bool(fn(*args, **kwargs))
+        finally:
+            DRY_RUN = prev
 
-    run(f"{SUDO} chmod 600 {path}")
-    run(f"{SUDO} mkswap {path}")
+    def status(self):
+        return swap_status()
 
-    swapon = find_cmd("swapon")
-    if swapon:
-        if old_pri is not None:
-            # pertahankan prioritas lama
-            code, _, err = run(f"{SUDO} {swapon} --priority {old_pri} {path}")
-            if code != 0:
-                run(f"{SUDO} {swapon} -p {old_pri} {path}")
-        else:
-            run(f"{SUDO} {swapon} {path}")
-        print("✅ Resize selesai & swapfile aktif kembali.")
-    else:
-        print("⚠ 'swapon' tidak ditemukan. Swap akan aktif setelah reboot.")
+    def add(self, path: str, size: str, pri=None, fstab: bool = True):
+        return self._run(create_swapfile, path, size, "" if pri is None else str(pri), fstab)
 
-    # Update fstab: hapus baris lama & tulis ulang dengan pri lama jika ada
-    run(f"{SUDO} sed -i '#{re.escape(path)}#d' /etc/fstab")
-    opts = "defaults" + (f",pri={old_pri}" if old_pri is not None else "")
-    run(f"echo '{path} none swap {opts} 0 0' | {SUDO} tee -a /etc/fstab > /dev/null")
-    print("✅ /etc/fstab diperbarui.")
-    
+    def remove(self, path: str):
+        return self._run(remove_swapfile_by_path, path)
 
-def resize_zram(dev="/dev/zram0", new_size_str=None):
-    """Resize zram device (default /dev/zram0) sambil pertahankan prioritas."""
-    if new_size_str is None:
-        new_size_str = input(f"Ukuran ZRAM baru untuk {dev} (mis. 4G): ").strip()
-    bytes_ = parse_size_to_bytes(new_size_str)
-    if not bytes_:
-        print("❌ Ukuran tidak valid.")
-        return
+    def resize(self, target: str, size: str, mode: str = "auto"):
+        """mode: auto/staged/inplace (lihat resize_swapfile_path)."""
+        if "/zram" in target:
+            return self._run(resize_zram, target, size, mode=mode)
+        return self._run(resize_swapfile_path, resolve_swapfile(target), size, mode=mode)
 
-    old_pri = get_priority_for(dev)
+    def set_priority(self, target: str, pri: int):
+        return self._run(set_priority, target, pri)
 
-    # Matikan swap ZRAM
-    swapoff = find_cmd("swapoff")
-    if swapoff:
-        run(f"{SUDO} {swapoff} {dev}")
-    else:
-        run(f"{SUDO} swapoff {dev}")
-
-    # Resize via zramctl kalau ada; kalau tidak, via sysfs
-    zramctl = find_cmd("zramctl")
-    if zramctl:
-        # reset dulu kalau perlu
-        run(f"{SUDO} {zramctl} -r {dev}")
-        # allocate ulang dengan size baru
-        code, out, err = run(f"{SUDO} {zramctl} --find --size {bytes_}")
-        if code != 0:
-            print("❌ Gagal set size zram via zramctl:", err)
-            return
-        # Cari device yang dipakai (stdout biasanya mengembalikan dev baru, fallback ke dev lama)
-        new_dev = out.strip().splitlines()[-1] if out.strip() else dev
-        dev = new_dev
-    else:
-        # sysfs fallback
-        if not os.path.exists(f"/sys/block/{os.path.basename(dev)}/disksize"):
-            print("❌ Tidak menemukan sysfs zram. Kernel mungkin tidak mendukung.")
-            return
-        run(f"echo {bytes_} | {SUDO} tee /sys/block/{os.path.basename(dev)}/disksize > /dev/null")
+    def hybrid(self, swapfile: str, swapfile_size: str, zram_size=None, zram_pri: int = 100,
+               swapfile_pri: int = -1, algorithm=None, replace: bool = False, topology: str = "single",
+               backing_dev=None, backend: str = "zram", zswap_opts=None):
+        """Setup ZRAM/zswap + swapfile; replace=True membersihkan swap/zram lama dalam plan yang sama."""
+        plan = Plan()
+        existing = classify_existing_swaps()
+        if replace:
+            clear_existing_swaps(existing, plan)
+        if backend == "zram" and zram_size and zswap_enabled():
+            print(DOUBLE_COMPRESSION_WARNING)
+        elif backend == "zswap" and existing["zram"] and not replace:
+            print(DOUBLE_COMPRESSION_WARNING)
+        return self._run(create_hybrid, zram_size or "", swapfile, swapfile_size, str(zram_pri),
+                         str(swapfile_pri), algorithm, plan=plan, topology=topology, backing_dev=backing_dev,
+                         backend=backend, zswap_opts=zswap_opts)
 
-    # format & aktifkan lagi
-    run(f"{SUDO} mkswap {dev}")
-    swapon = find_cmd("swapon")
-    if swapon:
-        if old_pri is not None:
-            code, _, err = run(f"{SUDO} {swapon} --priority {old_pri} {dev}")
-            if code != 0:
-                run(f"{SUDO} {swapon} -p {old_pri} {dev}")
-        else:
-            run(f"{SUDO} {swapon} {dev}")
-        print("✅ ZRAM di-resize & aktif kembali.")
-    else:
-        print("⚠ 'swapon' tidak ditemukan. ZRAM akan aktif setelah reboot.")
+    def zram_create(self, size: str, priority: int = 100, topology: str = "single", algorithm=None,
+                    mem_limit=None, backing_dev=None, backing_size=None):
+        """ZRAM permanen; topology single/cpu/numa/angka membuat N device berprioritas sama.
 
-    # Persist pakai zram-generator kalau ada
-    zr_gen = find_cmd("zram-generator") or ("/usr/lib/systemd/zram-generator"
-                                            if os.path.exists("/usr/lib/systemd/zram-generator") else None)
-    if zr_gen:
-        mib = int(bytes_ / 1024 / 1024)
-        pri = old_pri if old_pri is not None else 100
-        run(f"{SUDO} mkdir -p /etc/systemd/zram-generator.conf.d")
-        conf = f"[{os.path.basename(dev)}]\nzram-size = {mib}\npriorities = {pri}\n"
-        run(f"echo '{conf}' | {SUDO} tee /etc/systemd/zram-generator.conf.d/override.conf > /dev/null")
-        run(f"{SUDO} systemctl daemon-reexec")
-        print("✅ Persist zram-generator diperbarui.")
-    else:
-        print("ℹ zram-generator tidak ada; perubahan ZRAM hanya runtime.")
+        backing_dev (partisi atau file yang di-loop-kan) mengaktifkan writeback page idle/huge.
+        """
+        if zswap_enabled():
+            print(DOUBLE_COMPRESSION_WARNING)
+        return self._run(create_zram_permanent, size, str(priority), mem_limit, algorithm, topology=topology,
+                         backing_dev=backing_dev, backing_size=backing_size)
 
+    def zswap_status(self):
+        """{'params': parameter zswap, 'stats': statistik pool/reject, 'double_compression': bool}."""
+        if not zswap_supported():
+            return None
+        return {"params": zswap_params(), "stats": zswap_stats(), "double_compression": zswap_zram_conflict()}
 
-def create_zram_permanent(size_gb, priority):
-    # Pastikan modul zram tersedia
-    subprocess.run(["modprobe", "zram"], check=False)
+    def zswap_enable(self, persist: bool = True, **params):
+        """Aktifkan/ubah zswap (compressor, zpool, max_pool_percent, accept_threshold_percent)."""
+        return self._run(configure_zswap, True, persist=persist, **params)
 
-    # Hilangkan suffix seperti G, M dari input size_gb jika ada
-    size_gb_clean = size_gb.strip().upper().replace("G", "").replace("M", "")
-    try:
-        size_gb_int = int(size_gb_clean)
-    except ValueError:
-        print(f"❌ Ukuran ZRAM '{size_gb}' tidak valid. Gunakan format seperti 1G atau 512M.")
-        return
+    def zswap_disable(self, persist: bool = True):
+        return self._run(configure_zswap, False, persist=persist)
 
-    # Hitung bytes
-    bytes_size = size_gb_int * 1024 * 1024 * 1024
+    def zram_writeback(self, devs=None, idle_age=None, budget=None, period: float = 86400, huge: bool = True):
+        """Satu siklus writeback untuk zram ber-backing_dev (budget dalam byte per period)."""
+        return self._run(zram_writeback_run, devs, idle_age=idle_age, huge=huge, budget=budget,
+                         period=period, once=True)
 
-    # Cari device zram kosong
-    device = subprocess.getoutput("zramctl --find").strip()
-    if not device:
-        print("❌ Tidak ada device zram yang tersedia.")
-        return
+    def zram_remove(self):
+        return self._run(remove_zram_permanent)
 
-    # Set ukuran & aktifkan
-    subprocess.run(["zramctl", "--size", str(bytes_size), device], check=True)
-    subprocess.run(["mkswap", device], check=True)
-    subprocess.run(["swapon", "-p", str(priority), device], check=True)
+    def set_swappiness(self, value: int):
+        return self._run(set_swappiness, value)
 
-    # Buat systemd service permanen
-    zram_service = f"""[Unit]
-Description=ZRAM swap
-After=multi-user.target
+    def cgroup_swaps(self, target=None, limited_only: bool = False):
+        """Record swap cgroup v2 (model sama dengan entri /proc/swaps); target = unit/path tertentu."""
+        if target:
+            path = resolve_cgroup(target)
+            return [cgroup_swap_record(path)] if path else []
+        return get_cgroup_swaps(limited_only=limited_only)
 
-[Service]
-Type=oneshot
-ExecStart=/sbin/modprobe zram
-ExecStart=/sbin/zramctl --size {bytes_size} {device}
-ExecStart=/sbin/mkswap {device}
-ExecStart=/sbin/swapon -p {priority} {device}
-RemainAfterExit=yes
+    def set_cgroup_limits(self, target: str, persist: bool = True, **limits):
+        """Set swap_max/swap_high/zswap_max/zswap_writeback/high untuk unit systemd atau path cgroup."""
+        return self._run(set_cgroup_limits, target, limits, persist)
 
-[Install]
-WantedBy=multi-user.target
-"""
-    with open("/etc/systemd/system/zram.service", "w") as f:
-        f.write(zram_service)
-    subprocess.run(["systemctl", "enable", "zram.service"], check=False)
+    def reset_cgroup_limits(self, target: str):
+        return self._run(reset_cgroup_limits, target)
 
-    print(f"✅ ZRAM permanent {size_gb} dibuat dengan prioritas {priority}")
+    def bench(self, patterns=BENCH_PATTERNS, size=None, limit=None, accesses: int = 100000, **kw):
+        """Benchmark workload swap (+ microbenchmark) -> dict hasil yang sama dengan JSON `bench run`."""
+        return bench(patterns, size, limit, accesses, quiet=True, **kw)
 
+    def history(self, tier: str = "1m", window: float = 3600, directory=None):
+        """Persentil & tren metrik swap di jendela terakhir dari ring buffer history (None = belum ada data)."""
+        return history_query(tier, window, directory)
 
+    def forecast(self, window: float = 900, directory=None):
+        """Perkiraan menit hingga swap habis ({'minutes': None} bila tidak naik)."""
+        return forecast_exhaustion("1s", window, directory)
 
-def remove_zram_permanent():
-    # try disable service first
-    run(f"{SUDO} systemctl disable --now zram.service")
-    # try to turn off runtime zram
-    run(f"{SUDO} swapoff /dev/zram0")
-    run(f"{SUDO} modprobe -r zram || true")
-    # remove files
-    run(f"{SUDO} rm -f /etc/systemd/system/zram.service /usr/local/bin/zram-start.sh")
-    run(f"{SUDO} systemctl daemon-reload")
-    print("✅ ZRAM permanen berhasil dihapus (service & runtime).")
+    def top(self, n: int = 20, key: str = "swap", interval: float = 1.0):
+        """Konsumen swap teratas -> {'processes': [...], 'cgroups': [...]} (dua scan berjarak interval)."""
+        st = SwapTop().refresh()
+        time.sleep(interval)
+        st.refresh()
+        return {"processes": st.top(n, key), "cgroups": st.top_cgroups(n, key)}
 
+    def tune(self, profile: str = "auto"):
+        """Terapkan profil sysctl VM ('auto' = dipilih dari layout swap)."""
+        return self._run(apply_profile, profile)
 
+    def tune_diff(self, profile: str = "auto"):
+        """Baris diff profil vs runtime/persist, atau None bila profil tidak bisa dipilih."""
+        if profile == "auto":
+            profile = detect_swap_profile()[0]
+        return profile_diff(profile) if profile in SYSCTL_PROFILES else None
 
-def create_swapfile(path: str, size_str: str, pri: str = "-1", add_to_fstab: bool = True):
-    """Buat swapfile non-interaktif, aktifkan, dan (opsional) tambahkan ke fstab."""
-    mib = parse_size_to_mib(size_str)
-    if mib is None:
-        print("❌ Ukuran tidak valid untuk swapfile.")
-        return False
+    def tune_rollback(self):
+        return self._run(rollback_profile)
 
-    print(f"[Membuat swapfile] {path} = {size_str} ...")
-    code, _, _ = run(f"{SUDO} fallocate -l {size_str} {path}")
-    if code != 0:
-        print("fallocate gagal, fallback ke dd ...")
-        code, _, err = run(f"{SUDO} dd if=/dev/zero of={path} bs=1M count={mib} status=progress")
-        if code != 0:
-            print("❌ Gagal membuat swapfile:", err)
-            return False
+    def swappiness_auto(self, lo: int = 10, hi: int = 100, install: bool = False, **kw):
+        """Controller adaptif vm.swappiness; install=True memasang service systemd."""
+        if install:
+            return self._run(install_swappiness_service, lo, hi, **kw)
+        return self._run(swappiness_controller, lo, hi, **kw)
 
-    run(f"{SUDO} chmod 600 {path}")
-    run(f"{SUDO} mkswap {path}")
+    def dynamic_swap(self, directory=DYNSWAP_DIR, install: bool = False, **kw):
+        """Daemon swapfile tambahan on-demand; install=True memasang service systemd."""
+        if install:
+            return self._run(install_dynamic_swap_service, directory, **kw)
+        return self._run(dynamic_swap, directory, **kw)
 
-    swapon = find_cmd("swapon")
-    if swapon:
-        code, _, err = run(f"{SUDO} {swapon} --priority {pri} {path}")
-        if code != 0:
-            # fallback opsi -p
-            run(f"{SUDO} {swapon} -p {pri} {path}")
-    else:
-        print("⚠ 'swapon' tidak ditemukan. Swapfile akan aktif setelah reboot jika ditambahkan ke fstab.")
+    def reconcile(self, spec, apply: bool = True):
+        """Samakan state dengan spec (dict); kembalikan (ok, daftar perubahan)."""
+        global DRY_RUN
+        prev = DRY_RUN
+        DRY_RUN = prev or self.dry_run
+        try:
+            return reconcile(spec, apply)
+        finally:
+            DRY_RUN = prev
 
-    if add_to_fstab:
-        run(f"{SUDO} sed -i '\\#{re.escape(path)}#d' /etc/fstab")
-        run(f"echo '{path} none swap defaults,pri={pri} 0 0' | {SUDO} tee -a /etc/fstab > /dev/null")
+    def zram_stats(self):
+        return {dev: st for dev in list_zram_devices() if (st := read_zram_stats(dev))}
 
-    print(f"✅ Swapfile {path} siap (pri={pri}).")
-    return True
+    def zram_autosize(self, dev: str, budget: str, apply: bool = True):
+        return self._run(zram_auto_size, dev, budget, apply)
 
+    def advise_placement(self, paths=(), critical=None):
+        """Saran prioritas bertingkat (zram > nvme > ssd > hdd) untuk area aktif + kandidat."""
+        return advise_placement(paths, critical)
 
-def remove_swapfile_by_path(path: str):
-    """Non-interactive: swapoff + hapus fstab entry + rm file"""
-    print(f"[Hapus swapfile] {path} ...")
-    swapoff = find_cmd("swapoff") or "swapoff"
-    run(f"{SUDO} {swapoff} {path}")
-    run(f"{SUDO} sed -i '\\#{re.escape(path)}#d' /etc/fstab")
-    run(f"{SUDO} rm -f {path}")
-    print(f"✅ {path} dihapus.")
+    def apply_placement(self, paths=(), critical=None):
+        return self._run(apply_placement, advise_placement(paths, critical))
 
+    def advise_zram(self, from_swap=None, corpus=None, mode: str = "auto", objective: str = "balanced",
+                    candidates=None, pages: int = 2048):
+        """Benchmark algoritma zram -> {'recommended', 'recomp', 'results'}.
 
-def resize_swapfile_path(path: str, new_size_str: str):
-    """Resize swapfile yang spesifik tanpa prompt ulang path."""
-    if not os.path.exists(path):
-        print("❌ Swapfile tidak ditemukan.")
-        return False
-    mib = parse_size_to_mib(new_size_str)
-    if not mib:
-        print("❌ Ukuran tidak valid.")
-        return False
+        Korpus: page dari area swap aktif (from_swap), file korpus (corpus), atau sintetis.
+        OSError/ValueError bila korpus tidak bisa dibaca atau kosong.
+        """
+        data = load_zram_corpus(from_swap, corpus, pages)
+        return zram_advice(advise_zram(data, mode, candidates, objective))
 
-    old_pri = get_priority_for(path)
-    print(f"[Resize] {path} -> {new_size_str}")
-    swapoff = find_cmd("swapoff") or "swapoff"
-    run(f"{SUDO} {swapoff} {path}")
-
-    code, _, _ = run(f"{SUDO} fallocate -l {new_size_str} {path}")
-    if code != 0:
-        print("fallocate gagal, fallback ke dd ...")
-        code, _, err = run(f"{SUDO} dd if=/dev/zero of={path} bs=1M count={mib} status=progress")
-        if code != 0:
-            print("❌ Gagal resize:", err)
-            return False
+    def apply_zram_advice(self, advice):
+        return self._run(apply_zram_advice, advice["recommended"], advice["recomp"])
 
-    run(f"{SUDO} chmod 600 {path}")
-    run(f"{SUDO} mkswap {path}")
+    def inspect(self, path: str):
+        """Laporan FIEMAP swapfile (dict) atau None; dibaca lewat executor karena file 0600 root."""
+        plan = Plan(readonly=True).add("inspect", path=path, check=False)
+        plan.execute()
+        res = plan.results[0] if plan.results else {}
+        return res.get("out") if res.get("ok") else None
 
-    swapon = find_cmd("swapon")
-    if swapon:
-        if old_pri is not None:
-            code, _, err = run(f"{SUDO} {swapon} --priority {old_pri} {path}")
-            if code != 0:
-                run(f"{SUDO} {swapon} -p {old_pri} {path}")
-        else:
-            run(f"{SUDO} {swapon} {path}")
-        print("✅ Resize selesai & swapfile aktif kembali.")
-    else:
-        print("⚠ 'swapon' tidak ditemukan. Swap akan aktif setelah reboot.")
+    def reallocate(self, path: str):
+        return self._run(lambda: Plan().add("reallocate", path=path).execute())
 
-    # update fstab
-    run(f"{SUDO} sed -i '\\#{re.escape(path)}#d' /etc/fstab")
-    opts = "defaults" + (f",pri={old_pri}" if old_pri is not None else "")
-    run(f"echo '{path} none swap {opts} 0 0' | {SUDO} tee -a /etc/fstab > /dev/null")
-    print("✅ /etc/fstab diperbarui.")
-    return True
 
+def startup_bench(runs: int = 10, budget_ms: float = STARTUP_BUDGET_MS):
+    """Ukur cold start (proses baru) untuk import modul & `status --json`; False bila median > budget."""
+    import importlib.util
+    script = os.path.abspath(__file__)
+    cases = {
+        "python -c pass": [sys.executable, "-c", "pass"],  # baseline interpreter, tidak dinilai
+        "import": [sys.executable, "-c", f"import sys; sys.path.insert(0, {os.path.dirname(script)!r}); "
+                                         "import swap_manager"],
+        # jalur yang dipakai launcher swap-manager.sh & helper: modul di-import dari bytecode cache
+        "status --json": SELF_ARGV + ["status", "--json"],
+    }
+    cache = importlib.util.cache_from_source(script)
+    if not os.path.exists(cache) or os.path.getmtime(cache) < os.path.getmtime(script):
+        print(f"ℹ Bytecode belum di-cache ({cache}); jalankan `python3 -m compileall {script}` "
+              "bila PYTHONDONTWRITEBYTECODE aktif atau direktori tidak bisa ditulis.")
+    ok = True
+    for name, argv in cases.items():
+        times = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            times.append((time.perf_counter() - t0) * 1000)
+        times.sort()
+        med = times[len(times) // 2]
+        flag = "ℹ" if name == "python -c pass" else "✅" if med <= budget_ms else "❌"
+        print(f"{flag} {name:<14} median {med:6.1f} ms  min {times[0]:6.1f} ms  max {times[-1]:6.1f} ms"
+              f"  (budget {budget_ms:.0f} ms)")
+        ok = ok and (flag != "❌")
+    return ok
 
 
+def build_cli_parser():
+    import argparse
+    p = argparse.ArgumentParser(prog="swap_manager.py",
+                                description="Kelola swapfile, ZRAM & hybrid. Tanpa subcommand: menu interaktif.")
+    p.add_argument("--dry-run", action="store_true", help="cetak rencana operasi tanpa mengeksekusi")
+    p.add_argument("--trace", metavar="FILE",
+                   help="rekam span tiap operasi (wall/CPU/byte/status) ke FILE format Chrome trace + ringkasan")
+    sub = p.add_subparsers(dest="cmd", metavar="COMMAND")
 
-# -------------------- Setup Hybrid (zram + swapfile) --------------------
-def setup_hybrid():
-    print("\n=== Setup Hybrid (ZRAM + Swapfile) — dengan pre-check anti double ===")
+    s = sub.add_parser("status", help="tampilkan swap aktif, fstab, zram & sysctl")
+    s.add_argument("--json", action="store_true", help="output JSON")
 
-    existing = classify_existing_swaps()
-    has_zr = bool(existing['zram'])
-    has_sf = bool(existing['files'])
+    s = sub.add_parser("add", help="buat & aktifkan swapfile")
+    s.add_argument("path")
+    s.add_argument("size", help="mis. 8G, 4096M")
+    s.add_argument("--pri", type=int)
+    s.add_argument("--no-fstab", action="store_true", help="jangan tambahkan ke /etc/fstab")
 
-    if has_zr or has_sf:
-        print("\nDitemukan swap aktif:")
-        if has_zr:
-            print(f"- ZRAM : {', '.join(existing['zram'])}")
-        if has_sf:
-            print(f"- Files: {', '.join(existing['files'])}")
+    s = sub.add_parser("remove", help="swapoff + hapus swapfile & entri fstab")
+    s.add_argument("path")
 
-        print("\nApa yang ingin kamu lakukan?")
-        print("1) Buat baru (double) — tetap pertahankan yang lama")
-        print("2) Hapus yang lama, lalu buat baru")
-        print("3) Edit/Resize yang ada")
-        print("4) Batal")
-        choice = input("Pilih: ").strip()
+    s = sub.add_parser("resize", help="resize swapfile atau device zram")
+    s.add_argument("target")
+    s.add_argument("size")
+    s.add_argument("--mode", choices=("auto", "staged", "inplace"), default="auto",
+                   help="staged = area pengganti aktif dulu, baru yang lama di-drain")
 
-        if choice == "4":
-            return
+    s = sub.add_parser("priority", help="ubah prioritas swap (runtime + fstab)")
+    s.add_argument("target")
+    s.add_argument("pri", type=int)
 
-        if choice == "3":
-            # Pilih apa yang ingin di-resize
-            opts = []
-            if has_zr: opts.append("zram")
-            if has_sf: opts.append("swapfile")
-            print("\nPilih target resize:")
-            for i, o in enumerate(opts, 1):
-                print(f"{i}) {o}")
-            print("0) Batal")
-            sel = input("Pilih: ").strip()
-            if sel == "0":
-                return
-            if not sel.isdigit() or not (1 <= int(sel) <= len(opts)):
-                print("❌ Pilihan tidak valid.")
-                return
-            target = opts[int(sel) - 1]
+    s = sub.add_parser("hybrid", help="setup ZRAM + swapfile")
+    s.add_argument("--swapfile", default="/swapfile")
+    s.add_argument("--swapfile-size", required=True)
+    s.add_argument("--zram-size", help="kosong = tanpa ZRAM")
+    s.add_argument("--zram-pri", type=int, default=100)
+    s.add_argument("--swapfile-pri", type=int, default=-1)
+    s.add_argument("--algorithm", help="algoritma kompresi ZRAM")
+    s.add_argument("--zram-topology", default="single", help="single, cpu, numa, atau jumlah device")
+    s.add_argument("--zram-backing-dev", help="partisi atau file untuk writeback zram")
+    s.add_argument("--backend", choices=("zram", "zswap"), default="zram",
+                   help="tier kompresi di depan swapfile")
+    s.add_argument("--zswap-compressor")
+    s.add_argument("--zswap-max-pool", type=int, help="max_pool_percent zswap")
+    s.add_argument("--replace", action="store_true", help="hapus swap/zram lama lebih dulu")
 
-            if target == "zram":
-                dev = pick_from_list("Pilih device ZRAM:", existing['zram'])
-                if dev:
-                    resize_zram(dev)
-            else:
-                path = pick_from_list("Pilih swapfile:", existing['files'])
-                if path:
-                    new_size = input(f"Ukuran baru untuk {path} (mis. 12G): ").strip()
-                    resize_swapfile_path(path, new_size)
-            return
+    s = sub.add_parser("zram-create", help="buat ZRAM permanen (bisa multi-device)")
+    s.add_argument("size", help="total ukuran, mis. 8G")
+    s.add_argument("--priority", type=int, default=100)
+    s.add_argument("--topology", default="single", help="single, cpu, numa, atau jumlah device")
+    s.add_argument("--algorithm")
+    s.add_argument("--mem-limit", help="total mem_limit, mis. 2G")
+    s.add_argument("--backing-dev", help="partisi (/dev/...) atau file (di-loop-kan) untuk writeback")
+    s.add_argument("--backing-size", help="ukuran file backing bila belum ada (default setengah ukuran zram)")
 
-        if choice == "2":
-            # Hapus semua zram
-            if has_zr:
-                for dev in existing['zram']:
-                    run(f"{SUDO} swapoff {dev}")
-                    run(f"{SUDO} modprobe -r zram || true")
-                # also try disabling persistent zram service if exists
-                run(f"{SUDO} systemctl disable --now zram.service || true")
-                run(f"{SUDO} rm -f /etc/systemd/system/zram.service /usr/local/bin/zram-start.sh || true")
+    s = sub.add_parser("zram-writeback", help="scheduler writeback page idle/huge ke backing_dev")
+    s.add_argument("--device", action="append", help="device zram (default: semua yang punya backing_dev)")
+    s.add_argument("--interval", type=float, default=300, help="detik antar siklus")
+    s.add_argument("--idle-age", type=int, help="umur idle minimal (detik, butuh CONFIG_ZRAM_TRACK_ENTRY_TIME)")
+    s.add_argument("--budget", help="batas byte writeback per period, mis. 2G")
+    s.add_argument("--period", type=float, default=86400, help="periode budget (detik)")
+    s.add_argument("--no-huge", action="store_true", help="jangan tulis page huge (tak terkompresi)")
+    s.add_argument("--once", action="store_true", help="satu siklus lalu keluar")
+    s.add_argument("--install-timer", action="store_true", help="pasang systemd timer untuk siklus berkala")
 
-            # Hapus semua swapfile
-            if has_sf:
-                for path in existing['files']:
-                    remove_swapfile_by_path(path)
+    s = sub.add_parser("zswap", help="backend zswap: status, aktifkan/ubah parameter, nonaktifkan")
+    s.add_argument("action", choices=("status", "enable", "disable"))
+    s.add_argument("--compressor")
+    s.add_argument("--zpool")
+    s.add_argument("--max-pool", type=int, help="max_pool_percent")
+    s.add_argument("--accept-threshold", type=int, help="accept_threshold_percent")
+    s.add_argument("--no-persist", action="store_true", help="hanya runtime (tanpa kernel cmdline)")
+    s.add_argument("--json", action="store_true")
 
-            print("✅ Swap/ZRAM lama dibersihkan. Lanjut buat hybrid baru...")
+    sub.add_parser("zram-remove", help="lepas semua device zram & hapus zram.service")
 
+    s = sub.add_parser("swappiness", help="set vm.swappiness (runtime + persist)")
+    s.add_argument("value", type=int)
 
-    # Jika tidak ada swap atau user memilih buat baru / sudah dihapus, lanjut pembuatan hybrid
-    print("\n== Konfigurasi Hybrid ==")
-    zr_size = input("Ukuran ZRAM (mis. 2G, kosong=skip ZRAM): ").strip()
-    sf_path_default = "/swapfile2" if os.path.exists("/swapfile") else "/swapfile"
-    sf_path = (input(f"Path swapfile (default: {sf_path_default}): ").strip() or sf_path_default)
-    sf_size = input("Ukuran swapfile (mis. 8G): ").strip()
-    pri_zr = input("Prioritas ZRAM (default 100): ").strip() or "100"
-    pri_sf = input("Prioritas swapfile (default -1): ").strip() or "-1"
+    s = sub.add_parser("swappiness-auto", help="controller adaptif vm.swappiness (PSI + refault)")
+    s.add_argument("--min", type=int, default=10, dest="lo")
+    s.add_argument("--max", type=int, default=100, dest="hi")
+    s.add_argument("--interval", type=float, default=2.0, help="detik antar sampel")
+    s.add_argument("--step", type=int, default=10, help="perubahan maksimal per langkah")
+    s.add_argument("--cooldown", type=float, default=30.0, help="detik minimal antar perubahan")
+    s.add_argument("--confirm", type=int, default=3, help="sampel berturut-turut sebelum bertindak")
+    s.add_argument("--psi-high", type=float, default=0.05, help="fraksi stall 'some' = tertekan")
+    s.add_argument("--psi-low", type=float, default=0.01, help="fraksi stall 'some' = tenang")
+    s.add_argument("--baseline", type=int, help="default: nilai di " + SWAPPINESS_CONF)
+    s.add_argument("--log", default=SWAPPINESS_LOG)
+    s.add_argument("--duration", type=float)
+    s.add_argument("--quiet", action="store_true")
+    s.add_argument("--install-service", action="store_true", help="pasang service systemd")
 
-    # buat ZRAM permanen jika diminta
-    if zr_size:
-        # create permanent zram service
-        create_zram_permanent(zr_size, pri_zr)
-    else:
-        print("ℹ Lewatkan ZRAM.")
+    s = sub.add_parser("dynswap", help="swapfile tambahan on-demand: tumbuh saat swap hampir habis, lepas saat idle")
+    s.add_argument("action", choices=("run", "status", "cleanup", "install"))
+    s.add_argument("--dir", default=DYNSWAP_DIR, help="direktori swapfile tambahan (tidak masuk fstab)")
+    s.add_argument("--chunk", default="1G", help="ukuran tiap file tambahan")
+    s.add_argument("--max-files", type=int, default=4)
+    s.add_argument("--grow-at", type=float, default=80.0, help="persen swap terpakai untuk menambah file")
+    s.add_argument("--mem-low", type=float, default=20.0, help="persen MemAvailable maksimal untuk menambah file")
+    s.add_argument("--shrink-at", type=float, default=50.0, help="persen swap terpakai maksimal setelah melepas file")
+    s.add_argument("--idle", type=float, default=600.0, help="detik file harus kosong sebelum dilepas")
+    s.add_argument("--cooldown", type=float, default=60.0, help="detik minimal antar aksi")
+    s.add_argument("--interval", type=float, default=5.0, help="detik antar sampel")
+    s.add_argument("--pri", type=int, default=-1, help="prioritas file tambahan (default: otomatis kernel)")
+    s.add_argument("--log", default=DYNSWAP_LOG)
+    s.add_argument("--duration", type=float)
+    s.add_argument("--quiet", action="store_true")
+    s.add_argument("--json", action="store_true", help="status: output JSON")
 
-    # buat swapfile (wajib untuk hybrid)
-    ok = create_swapfile(sf_path, sf_size, pri_sf, add_to_fstab=True)
-    if not ok:
-        print("❌ Gagal membuat swapfile. Batalkan.")
-        return
+    s = sub.add_parser("history", help="history swap (ring buffer mmap), query & forecast habisnya swap")
+    s.add_argument("action", choices=("record", "show", "forecast", "install"))
+    s.add_argument("--dir", help=f"direktori file ring (default {HISTORY_DIR})")
+    s.add_argument("--interval", type=float, default=1.0, help="record: detik antar sampel")
+    s.add_argument("--tier", choices=[t[0] for t in HISTORY_TIERS], default="1m", help="show: resolusi")
+    s.add_argument("--window", default="1h", help="jendela query, mis. 15m, 6h, 7d")
+    s.add_argument("--hook", help="record: perintah yang dijalankan bila swap diperkirakan habis")
+    s.add_argument("--threshold", type=float, default=30.0, help="menit; ambang peringatan/hook")
+    s.add_argument("--duration", type=float)
+    s.add_argument("--quiet", action="store_true")
+    s.add_argument("--json", action="store_true")
 
-    print("\n✨ Hybrid selesai. ZRAM (jika dibuat) dan swapfile sudah aktif dan persist sesuai konfigurasi.")
+    s = sub.add_parser("cgroup", help="limit swap/zswap per slice/service (cgroup v2 + drop-in systemd)")
+    s.add_argument("action", choices=("show", "set", "reset"))
+    s.add_argument("target", nargs="?", help="unit (batch.slice, app.service) atau path cgroup")
+    for key, (fname, _) in CGROUP_LIMITS.items():
+        s.add_argument(f"--{key.replace('_', '-')}", dest=key, help=f"{fname} (ukuran, 0, atau max)")
+    s.add_argument("--no-persist", action="store_true", help="hanya runtime, tanpa drop-in")
+    s.add_argument("--all", action="store_true", help="show: semua cgroup, bukan hanya yang dibatasi/berisi swap")
+    s.add_argument("--json", action="store_true")
 
+    s = sub.add_parser("top", help="proses & cgroup teratas pemakai swap")
+    s.add_argument("-n", type=int, default=20, help="jumlah baris")
+    s.add_argument("--sort", choices=("swap", "rate"), default="swap", help="rate = laju swap-in")
+    s.add_argument("--interval", type=float, default=1.0, help="detik antar scan")
+    s.add_argument("--watch", action="store_true", help="refresh terus (hanya pid yang berubah dibaca ulang)")
+    s.add_argument("--workers", type=int, help="thread scan paralel")
+    s.add_argument("--json", action="store_true")
 
-# ----------------- Persentase penggunaan swap -------------------
-def set_swappiness(percent):
-    """Set vm.swappiness secara runtime dan permanent."""
-    try:
-        percent = int(percent)
-        if not (0 <= percent <= 100):
-            print("❌ Nilai swappiness harus antara 0 dan 100.")
-            return
-        run(f"{SUDO} sysctl -w vm.swappiness={percent} > /dev")
-        with open("/etc/sysctl.d/99-swap-tuning.conf", "w") as f:
-            f.write(f"vm.swappiness={percent}\n")
-        print(f"✅ Swap akan mulai digunakan setelah RAM terpakai ±{percent}% (vm.swappiness={percent})")
-    except ValueError:
-        print("❌ Masukkan angka valid.")
+    s = sub.add_parser("tune", help="profil sysctl VM (page-cluster, watermark, cache pressure, swappiness)")
+    s.add_argument("action", choices=("list", "diff", "apply", "rollback"))
+    s.add_argument("profile", nargs="?", default="auto",
+                   help="auto (dari layout swap) atau: " + ", ".join(SYSCTL_PROFILES))
+    s.add_argument("--json", action="store_true")
 
-def setup_swappiness_prompt():
-    """Prompt user untuk set swappiness."""
-    swap_percent = input("Gunakan swap setelah RAM terpakai berapa persen? (0-100, default=60): ").strip()
-    if not swap_percent:
-        swap_percent = "60"
-    set_swappiness(swap_percent)
+    s = sub.add_parser("reconcile", help="samakan state dengan spec JSON (idempoten)")
+    s.add_argument("spec", help="file spec JSON")
+    s.add_argument("--check", action="store_true",
+                   help="hanya cek; exit 3 bila ada perubahan yang diperlukan")
+
+    s = sub.add_parser("monitor", help="monitor swap + exporter Prometheus")
+    s.add_argument("--interval", type=float, default=0.25, help="detik")
+    s.add_argument("--port", type=int)
+    s.add_argument("--textfile-dir")
+    s.add_argument("--duration", type=float)
+    s.add_argument("--quiet", action="store_true")
+
+    s = sub.add_parser("zram-stats", help="statistik device zram")
+    s.add_argument("--json", action="store_true")
+
+    s = sub.add_parser("zram-autosize", help="set disksize & mem_limit zram dari rasio kompresi")
+    s.add_argument("device")
+    s.add_argument("budget", help="budget RAM, mis. 2G")
+    s.add_argument("--no-apply", action="store_true", help="hanya hitung")
+
+    s = sub.add_parser("advise-placement", help="saran penempatan & prioritas swap dari topologi storage")
+    s.add_argument("paths", nargs="*", help="kandidat path swapfile/partisi (area aktif selalu ikut dinilai)")
+    s.add_argument("--critical", action="append", metavar="PATH",
+                   help="mount latency-critical (bisa berulang; default direktori data database umum)")
+    s.add_argument("--apply", action="store_true", help="terapkan prioritas saran ke area aktif")
+    s.add_argument("--json", action="store_true")
+
+    s = sub.add_parser("advise-zram", help="benchmark algoritma kompresi zram & rekomendasi")
+    src = s.add_mutually_exclusive_group()
+    src.add_argument("--from-swap", metavar="AREA", help="sampel page dari area swap aktif")
+    src.add_argument("--corpus", metavar="FILE", help="file korpus (default: korpus sintetis)")
+    s.add_argument("--pages", type=int, default=2048, help="jumlah page korpus sintetis / sampel")
+    s.add_argument("--mode", choices=("auto", "kernel", "python"), default="auto",
+                   help="kernel = device zram sementara (root), python = codec in-process")
+    s.add_argument("--objective", choices=("balanced", "ratio", "speed"), default="balanced")
+    s.add_argument("--algorithms", help="kandidat dipisah koma (default: yang didukung kernel)")
+    s.add_argument("--apply", action="store_true",
+                   help="tulis algoritma & rekompresi saran ke zram.service (berlaku saat boot berikutnya)")
+    s.add_argument("--json", action="store_true")
+
+    s = sub.add_parser("inspect", help="inspeksi extent swapfile (FIEMAP)")
+    s.add_argument("path")
+    s.add_argument("--json", action="store_true")
+    s.add_argument("--reallocate", action="store_true", help="alokasi ulang bila terfragmentasi")
+
+    s = sub.add_parser("bench", help="benchmark swap (workload mmap di cgroup ber-limit) & jalur panas tool")
+    s.add_argument("action", choices=("run", "micro", "compare"))
+    s.add_argument("files", nargs="*", help="compare: hasil lama & baru (JSON)")
+    s.add_argument("--patterns", default=",".join(BENCH_PATTERNS), help="seq,random,zipf")
+    s.add_argument("--size", help="ukuran region workload (default 2x limit)")
+    s.add_argument("--limit", help="limit memori cgroup (default min(256M, MemAvailable/4))")
+    s.add_argument("--accesses", type=int, default=100000)
+    s.add_argument("--write-ratio", type=float, default=0.25)
+    s.add_argument("--seed", type=int, default=1)
+    s.add_argument("--no-micro", action="store_true")
+    s.add_argument("--threshold", type=float, default=10.0, help="compare: regresi (%%) yang dianggap gagal")
+    s.add_argument("--output", "-o", help="tulis hasil JSON")
+
+    s = sub.add_parser("startup-bench", help="ukur cold start terhadap budget")
+    s.add_argument("--runs", type=int, default=10)
+    s.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    return p
 
-def menu_change_swappiness():
-    """Menu ubah swappiness."""
-    print("\n=== Ubah Persentase Penggunaan Swap ===")
-    swap_percent = input("Masukkan nilai baru (0-100): ").strip()
-    set_swappiness(swap_percent)
 
+def _print_json(obj):
+    import json
+    print(json.dumps(obj, indent=2, default=str))
+
+def cli_main(argv=None):
+    """Entry point non-interaktif. Exit code: 0 sukses, 1 operasi gagal, 2 argumen salah, 3 drift (--check)."""
+    args = build_cli_parser().parse_args(argv)
+    if not args.trace:
+        return _cli_dispatch(args)
+    start_trace()
+    try:
+        with span(f"swap_manager {args.cmd or 'menu'}", "cli", argv=list(sys.argv[1:] if argv is None else argv)) as sp:
+            rc = _cli_dispatch(args)
+            sp["status"] = rc
+        return rc
+    finally:
+        spans = stop_trace()
+        if write_trace(args.trace, spans):
+            print_trace_summary(spans)
+            print(f"ℹ Trace ({len(spans)} span) ditulis ke {args.trace} — buka di chrome://tracing atau Perfetto.",
+                  file=sys.stderr)
+
+def _cli_dispatch(args):
+    mgr = SwapManager(dry_run=args.dry_run)
+    cmd = args.cmd
+    if cmd is None:
+        if sys.stdout.isatty():
+            print("\033[H\033[2J", end="")  # bersihkan terminal tanpa fork shell
+        mgr._run(main)
+        return EXIT_OK
+    if cmd == "status":
+        st = mgr.status()
+        _print_json(st) if args.json else print_status(st)
+        return EXIT_OK
+    if cmd == "add":
+        ok = mgr.add(args.path, args.size, args.pri, fstab=not args.no_fstab)
+    elif cmd == "remove":
+        ok = mgr.remove(args.path)
+    elif cmd == "resize":
+        ok = mgr.resize(args.target, args.size, args.mode)
+    elif cmd == "priority":
+        ok = mgr.set_priority(args.target, args.pri)
+    elif cmd == "hybrid":
+        zswap_opts = {"compressor": args.zswap_compressor, "max_pool_percent": args.zswap_max_pool}
+        ok = mgr.hybrid(args.swapfile, args.swapfile_size, args.zram_size, args.zram_pri,
+                        args.swapfile_pri, args.algorithm, args.replace, args.zram_topology,
+                        args.zram_backing_dev, args.backend, zswap_opts)
+    elif cmd == "zram-create":
+        limit = parse_size_to_bytes(args.mem_limit) if args.mem_limit else None
+        bsize = parse_size_to_bytes(args.backing_size) if args.backing_size else None
+        ok = mgr.zram_create(args.size, args.priority, args.topology, args.algorithm, limit,
+                             args.backing_dev, bsize)
+    elif cmd == "zram-writeback":
+        budget = parse_size_to_bytes(args.budget) if args.budget else None
+        if args.install_timer:
+            ok = mgr._run(install_writeback_timer, args.interval, args.idle_age, budget, args.period)
+        else:
+            ok = mgr._run(zram_writeback_run, args.device, args.interval, args.idle_age, not args.no_huge,
+                          budget, args.period, args.once)
+    elif cmd == "zswap":
+        if args.action == "status":
+            st = mgr.zswap_status()
+            if st is None:
+                print("ℹ Kernel tanpa zswap.", file=sys.stderr)
+                return EXIT_FAIL
+            _print_json(st) if args.json else show_zswap_status()
+            return EXIT_OK
+        if args.action == "disable":
+            ok = mgr.zswap_disable(persist=not args.no_persist)
+        else:
+            ok = mgr.zswap_enable(persist=not args.no_persist, compressor=args.compressor, zpool=args.zpool,
+                                  max_pool_percent=args.max_pool, accept_threshold_percent=args.accept_threshold)
+    elif cmd == "zram-remove":
+        ok = mgr.zram_remove()
+    elif cmd == "swappiness":
+        ok = mgr.set_swappiness(args.value)
+    elif cmd == "swappiness-auto":
+        if args.install_service:
+            ok = mgr.swappiness_auto(args.lo, args.hi, install=True, interval=args.interval,
+                                     step=args.step, cooldown=args.cooldown)
+        else:
+            ok = mgr.swappiness_auto(args.lo, args.hi, interval=args.interval, step=args.step,
+                                     cooldown=args.cooldown, confirm=args.confirm, psi_high=args.psi_high,
+                                     psi_low=args.psi_low, baseline=args.baseline, log_path=args.log,
+                                     duration=args.duration, quiet=args.quiet)
+    elif cmd == "dynswap":
+        opts = dict(chunk=args.chunk, max_files=args.max_files, grow_at=args.grow_at, mem_low=args.mem_low,
+                    shrink_at=args.shrink_at, idle=args.idle, cooldown=args.cooldown, interval=args.interval)
+        if args.action == "status":
+            _print_json(dynamic_swapfiles(args.dir)) if args.json else print_dynamic_swap(args.dir)
+            return EXIT_OK
+        if args.action == "cleanup":
+            ok = mgr._run(dynamic_swap_cleanup, args.dir)
+        elif args.action == "install":
+            ok = mgr.dynamic_swap(args.dir, install=True, **opts)
+        else:
+            ok = mgr.dynamic_swap(args.dir, pri=args.pri, log_path=args.log, duration=args.duration,
+                                  quiet=args.quiet, **opts)
+    elif cmd == "history":
+        window = parse_duration(args.window)
+        if window is None:
+            print(f"❌ Jendela tidak valid: {args.window}", file=sys.stderr)
+            return EXIT_USAGE
+        if args.action == "record":
+            ok = history_record(args.interval, args.dir, args.hook, args.threshold, duration=args.duration,
+                                quiet=args.quiet)
+        elif args.action == "install":
+            ok = mgr._run(install_history_service, args.interval, args.hook, args.threshold)
+        else:
+            fc = mgr.forecast(min(window, 900) if args.action == "show" else window, args.dir)
+            q = mgr.history(args.tier, window, args.dir) if args.action == "show" else None
+            if args.json:
+                _print_json({"summary": q, "forecast": fc} if args.action == "show" else fc)
+            elif args.action == "show":
+                print_history(q, fc)
+            else:
+                print(f"⚠ Swap habis dalam ±{fc['minutes']} menit ({fc['reason']})." if fc["minutes"] is not None
+                      else f"✅ Tidak diperkirakan habis ({fc['reason']}).")
+            if args.action == "forecast" and fc["minutes"] is not None and fc["minutes"] <= args.threshold:
+                return EXIT_DRIFT
+            ok = True
+    elif cmd == "cgroup":
+        if args.action == "show":
+            recs = mgr.cgroup_swaps(args.target, limited_only=not args.all)
+            if args.target and not recs:
+                print(f"❌ cgroup untuk {args.target} tidak ditemukan.", file=sys.stderr)
+                return EXIT_FAIL
+            _print_json(recs) if args.json else print_cgroup_swaps(recs)
+            return EXIT_OK
+        if not args.target:
+            print("❌ target wajib untuk set/reset.", file=sys.stderr)
+            return EXIT_USAGE
+        if args.action == "reset":
+            ok = mgr.reset_cgroup_limits(args.target)
+        else:
+            limits = {k: getattr(args, k) for k in CGROUP_LIMITS if getattr(args, k) is not None}
+            if not limits:
+                print("❌ Tidak ada limit yang diberikan.", file=sys.stderr)
+                return EXIT_USAGE
+            ok = mgr.set_cgroup_limits(args.target, persist=not args.no_persist, **limits)
+    elif cmd == "top":
+        ok = swap_top(args.n, args.sort, args.interval, args.watch, args.workers, args.json)
+    elif cmd == "tune":
+        if args.action == "list":
+            auto, why = detect_swap_profile()
+            if args.json:
+                _print_json({"auto": auto, "reason": why,
+                             "profiles": {n: resolve_profile(n) for n in SYSCTL_PROFILES}})
+            else:
+                for n, prof in SYSCTL_PROFILES.items():
+                    print(f"{'*' if n == auto else ' '} {n:11} {prof['desc']}")
+                print(f"(otomatis: {auto or '-'} — {why})")
+            return EXIT_OK
+        if args.action == "diff":
+            rows = mgr.tune_diff(args.profile)
+            if rows is None:
+                print(f"❌ Profil tidak bisa dipilih: {args.profile}", file=sys.stderr)
+                return EXIT_USAGE
+            name = args.profile if args.profile != "auto" else detect_swap_profile()[0]
+            _print_json(rows) if args.json else print_profile_diff(name, rows)
+            return EXIT_DRIFT if any(r["changed"] for r in rows) else EXIT_OK
+        ok = mgr.tune(args.profile) if args.action == "apply" else mgr.tune_rollback()
+    elif cmd == "reconcile":
+        try:
+            spec = load_spec(args.spec)
+        except (OSError, ValueError) as e:
+            print(f"❌ Gagal membaca spec: {e}", file=sys.stderr)
+            return EXIT_USAGE
+        ok, changes = mgr.reconcile(spec, apply=not args.check)
+        if ok and changes and args.check:
+            return EXIT_DRIFT
+    elif cmd == "monitor":
+        monitor(args.interval, port=args.port, textfile_dir=args.textfile_dir,
+                duration=args.duration, quiet=args.quiet)
+        ok = True
+    elif cmd == "zram-stats":
+        if args.json:
+            _print_json(mgr.zram_stats())
+        else:
+            show_zram_stats()
+        ok = True
+    elif cmd == "zram-autosize":
+        ok = mgr.zram_autosize(args.device, args.budget, apply=not args.no_apply)
+    elif cmd == "advise-placement":
+        if args.apply:
+            ok = mgr.apply_placement(args.paths, args.critical)
+        else:
+            rep = mgr.advise_placement(args.paths, args.critical)
+            _print_json(rep) if args.json else print_placement(rep)
+            return EXIT_DRIFT if any(r["issues"] for r in rep["areas"]) else EXIT_OK
+    elif cmd == "advise-zram":
+        import contextlib
+        cands = [a for a in args.algorithms.split(",") if a] if args.algorithms else None
+        try:
+            # catatan benchmark (⚠/ℹ) ke stderr supaya stdout tetap JSON murni
+            with contextlib.redirect_stdout(sys.stderr if args.json else sys.stdout):
+                adv = mgr.advise_zram(args.from_swap, args.corpus, args.mode, args.objective, cands, args.pages)
+        except (OSError, ValueError) as e:
+            print(f"❌ Gagal membaca korpus: {e}", file=sys.stderr)
+            return EXIT_FAIL
+        if not adv["results"]:
+            print("❌ Tidak ada algoritma yang bisa di-benchmark.", file=sys.stderr)
+            return EXIT_FAIL
+        _print_json(adv) if args.json else print_zram_advice(adv["results"])
+        ok = mgr.apply_zram_advice(adv) if args.apply else True
+    elif cmd == "inspect":
+        rep = mgr.inspect(args.path)
+        if rep is None:
+            print(f"❌ Gagal menginspeksi {args.path}.", file=sys.stderr)
+            return EXIT_FAIL
+        _print_json(rep) if args.json else print_inspect(rep)
+        ok = True
+        if args.reallocate and (rep["fragmented"] or not rep["swap_safe"]):
+            ok = mgr.reallocate(args.path)
+    elif cmd == "bench":
+        import json
+        if args.action == "compare":
+            if len(args.files) != 2:
+                print("❌ compare butuh dua file JSON.", file=sys.stderr)
+                return EXIT_USAGE
+            try:
+                old, new = (json.load(open(f)) for f in args.files)
+            except (OSError, ValueError) as e:
+                print(f"❌ Gagal membaca hasil: {e}", file=sys.stderr)
+                return EXIT_USAGE
+            ok = bench_compare(old, new, args.threshold)
+        elif args.action == "micro":
+            res = {"meta": bench_meta(), "runs": [], "micro_ns_per_op": micro_bench()}
+            for name, ns in res["micro_ns_per_op"].items():
+                print(f"  {name:42} {ns:>12,.0f} ns/op")
+            if args.output:
+                with open(args.output, "w") as f:
+                    json.dump(res, f, indent=2)
+            ok = True
+        else:
+            patterns = [p for p in args.patterns.split(",") if p]
+            if not set(patterns) <= set(BENCH_PATTERNS):
+                print(f"❌ Pola tidak dikenal: {args.patterns}", file=sys.stderr)
+                return EXIT_USAGE
+            size = parse_size_to_bytes(args.size) if args.size else None
+            limit = parse_size_to_bytes(args.limit) if args.limit else None
+            res = bench(patterns, size, limit, args.accesses, args.write_ratio, args.seed,
+                        micro=not args.no_micro, output=args.output)
+            ok = not any("error" in r for r in res["runs"])
+    elif cmd == "startup-bench":
+        ok = startup_bench(args.runs, args.budget_ms)
+    else:
+        return EXIT_USAGE
+    return EXIT_OK if ok else EXIT_FAIL
 
 
 # -------------------- Menu --------------------
@@ -653,8 +6397,16 @@ def main():
 4. Ubah prioritas swap
 5. Resize swapfile
 6. Setup hybrid otomatis (zram + swapfile)
-7. Ubah persentase penggunaan swap
-8. Keluar
+7. Atur vm.swappiness (statis / adaptif)
+8. Monitor swap (live + exporter Prometheus)
+9. Statistik & auto-size ZRAM
+10. Advisor algoritma kompresi ZRAM
+11. Inspeksi swapfile (extent/fragmentasi)
+12. Writeback ZRAM ke backing device
+13. Profil tuning sysctl VM
+14. Limit swap per slice/service (cgroup v2)
+15. zswap (status & konfigurasi)
+16. Keluar
 """)
         choice = input("Pilih menu: ").strip()
         if choice == "1":
@@ -672,9 +6424,31 @@ def main():
         elif choice == "7":
             setup_swappiness_prompt()
         elif choice == "8":
+            monitor_prompt()
+        elif choice == "9":
+            zram_stats_prompt()
+        elif choice == "10":
+            advise_zram_prompt()
+        elif choice == "11":
+            inspect_prompt()
+        elif choice == "12":
+            zram_writeback_prompt()
+        elif choice == "13":
+            tune_profile_prompt()
+        elif choice == "14":
+            cgroup_limits_prompt()
+        elif choice == "15":
+            zswap_prompt()
+        elif choice == "16":
             break
         else:
             print("❌ Pilihan tidak valid.")
 
+def run_main():
+    """Entry point proses: helper privileged (--exec-plan) atau CLI."""
+    if sys.argv[1:2] == ["--exec-plan"]:
+        return plan_helper_main()
+    return cli_main()
+
 if __name__ == "__main__":
-    main()
+    sys.exit(run_main())